@@ -5,6 +5,9 @@ from core import (
     sidebar,
     data_variables,
     dashboard_plot,
+    sketches,
+    hotspots,
+    figure_cache,
 )
 
 # ==========================================================================================================    
@@ -18,6 +21,16 @@ st.set_page_config(
 
 st.logo("assets/logo2.png", size="large")
 
+@st.cache_resource(show_spinner=False)
+def load_sketch_store(df):
+    # Monthly quantile sketches, reused by every year filter below
+    return sketches.build_sketch_store(df, numeric_cols=['Fine_Amount'])
+
+@st.cache_resource(show_spinner=False)
+def load_daily_sketch_store(df):
+    # Daily top-N sketches, so any "last N days" window is a merge of N small sketches
+    return sketches.build_sketch_store(df, numeric_cols=[], freq='D', heavy_hitter_cols=['Location'])
+
 def dashboard() -> None:
 # ==========================================================================================================    
     # HEADER SECTION
@@ -57,7 +70,8 @@ def dashboard() -> None:
 # ==========================================================================================================    
         no_of_days_for_summary  = st.expander("Days Filter", expanded=False).slider("Select Number of Days for Summary Calculations", min_value=7, max_value=365, value=30, step=1, key="days_slider")
         df_last_n_days = utils.get_last_n_days_data(df, no_of_days_for_summary)
-        
+        daily_sketch_store = load_daily_sketch_store(df)
+
         col1, col2 = st.columns(2)
         with col1:
             st.info(f"### Total Violations (Last {no_of_days_for_summary} Days)")
@@ -67,7 +81,7 @@ def dashboard() -> None:
             # with st.expander("View Violation Types Distribution Chart"):
             with st.container():    
                 st.markdown("<h3 style='text-align: center;'>Violation Types Distribution</h3>", unsafe_allow_html=True)
-                st.pyplot(summary.get('fig'), width='stretch')
+                figure_cache.show_figure(summary.get('fig'), 'violation_types', df_last_n_days, context='column')
             # Metrics
             sub_col1, sub_col2, sub_col3 = st.columns(3, border=True)
             with sub_col1:
@@ -86,7 +100,7 @@ def dashboard() -> None:
             
             with st.container():
                 st.markdown("<h3 style='text-align: center;'>License Validity</h3>", unsafe_allow_html=True)
-                st.pyplot(license_insights.get('validity_fig'), width='stretch')
+                figure_cache.show_figure(license_insights.get('validity_fig'), 'license_validity', df_last_n_days, context='column')
             
             sub_col_l1, sub_col_l2 = st.columns(2, border=True)
             with sub_col_l1:
@@ -105,7 +119,7 @@ def dashboard() -> None:
             # with st.expander("View Fines Distribution Chart"):
             with st.container():    
                 st.markdown("<h3 style='text-align: center;'>Fines Distribution</h3>", unsafe_allow_html=True)
-                st.pyplot(fine_summary.get('fig'), width='stretch')
+                figure_cache.show_figure(fine_summary.get('fig'), 'fines_distribution', df_last_n_days, context='column')
             # Metrics
             sub_col1, sub_col2 = st.columns(2, border=True)
             with sub_col1:
@@ -116,11 +130,11 @@ def dashboard() -> None:
 
     # ==========================================================================================================
             st.info(f"### Location Insights (Last {no_of_days_for_summary} Days)")
-            location_based_summary = dashboard_summary.get_violations_by_location(df_last_n_days)
+            location_based_summary = dashboard_summary.get_violations_by_location(df_last_n_days, sketch_store=daily_sketch_store)
             # with st.expander("View Violations by Location Chart"):
             with st.container():    
                 st.markdown("<h3 style='text-align: center;'>Violations by Location</h3>", unsafe_allow_html=True)
-                st.pyplot(location_based_summary.get('fig'), width='stretch')
+                figure_cache.show_figure(location_based_summary.get('fig'), 'violations_by_location', df_last_n_days, context='column')
             # Metrics
             sub_col2, sub_col3 = st.columns(2, border=True)
             
@@ -206,9 +220,10 @@ def dashboard() -> None:
         df_behavior = df[mask_behavior]
 
         with st.expander(f"Advanced Risk Indicators ({selected_years_behavior[0]} - {selected_years_behavior[1]})", expanded=True):
-             behavior_metrics = dashboard_summary.get_behavioral_analysis(df_behavior)
+             behavior_metrics = dashboard_summary.get_behavioral_analysis(df_behavior, sketch_store=load_sketch_store(df))
              
              over_speeding_count, over_speeding_pct = behavior_metrics['over_speeding_stats']
+             high_fine_count, high_fine_pct, high_fine_threshold = behavior_metrics['high_fine_stats']
              court_count, court_pct = behavior_metrics['court_appearance_stats']
              repeat_offender_count, repeat_offender_pct = behavior_metrics['repeat_offender_stats']
              bad_weather_count, bad_weather_pct = behavior_metrics['bad_weather_stats']
@@ -245,7 +260,7 @@ def dashboard() -> None:
              st.markdown("---")
              
              # Row 2 (3 Columns)
-             col4, col5 = st.columns(2)
+             col4, col5, col6 = st.columns(3)
              
              with col4:
                  st.metric(
@@ -263,6 +278,14 @@ def dashboard() -> None:
                      delta_color="off",
                      help=f"The weather condition under which the most violations ({top_weather_count}) occurred."
                  )
+             with col6:
+                  st.metric(
+                     label="High-Fine Violations",
+                     value=f"{high_fine_count}",
+                     delta=f"Prob: {high_fine_pct:.1f}%",
+                     delta_color="inverse",
+                     help=f"Violations fined above the 90th percentile (Rs. {high_fine_threshold:,.0f})."
+                 )
         st.markdown('---')
 # ==========================================================================================================
     # Full Page Graphical Plots and Analysis
@@ -285,7 +308,7 @@ def dashboard() -> None:
             mask_vehicle = (df['Date'].dt.year >= years_vehicle[0]) & (df['Date'].dt.year <= years_vehicle[1])
             df_vehicle = df[mask_vehicle]
             
-            st.pyplot(dashboard_plot.plot_vehicle_type_vs_violation_type(df_vehicle), width='stretch')
+            figure_cache.show_plot(dashboard_plot.plot_vehicle_type_vs_violation_type, df_vehicle)
             
         st.markdown('---')
         
@@ -307,8 +330,38 @@ def dashboard() -> None:
             mask_heatmap = (df['Date'].dt.year >= years_heatmap[0]) & (df['Date'].dt.year <= years_heatmap[1])
             df_heatmap = df[mask_heatmap]
 
-            st.pyplot(dashboard_plot.plot_severity_heatmap_by_location(df_heatmap), width='stretch')
+            figure_cache.show_plot(dashboard_plot.plot_severity_heatmap_by_location, df_heatmap)
         st.markdown('---')        
+
+        # 3. Hotspot Alerts
+        with st.container():
+            st.markdown("<h3 style='text-align: center;'>Hotspot Alerts</h3>", unsafe_allow_html=True)
+
+            hotspot_freq = st.selectbox(
+                "Detection Period (Hotspot Alerts)",
+                options=list(hotspots.HOTSPOT_FREQ_OPTIONS),
+                index=1,
+                format_func=hotspots.HOTSPOT_FREQ_OPTIONS.get,
+                key="hotspot_freq_dashboard"
+            )
+            hotspot_results = dashboard_summary.get_hotspot_alerts(df, freq=hotspot_freq)
+
+            h1, h2 = st.columns(2, border=True)
+            with h1:
+                st.metric(
+                    label="Hotspot Alerts",
+                    value=hotspot_results['total_alerts'],
+                    help=f"Location/violation-type counts more than {hotspots.HOTSPOT_Z_THRESHOLD:.0f} standard deviations above their exponentially weighted history."
+                )
+            with h2:
+                st.metric(label="Most Frequent Hotspot", value=hotspot_results['top_hotspot_location'])
+
+            if hotspot_results['latest_alerts'].empty:
+                st.info("No anomalous spikes detected for the selected period.")
+            else:
+                st.markdown("##### Latest Alerts")
+                st.dataframe(hotspot_results['latest_alerts'].round(2), width='stretch', hide_index=True)
+        st.markdown('---')
     # ------------------------------
     # INFO SECTION
     # ------------------------------
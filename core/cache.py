@@ -0,0 +1,256 @@
+import os
+import sys
+import weakref
+import functools
+import threading
+import hashlib
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# This module memoizes pure functions of (dataset, filter spec).
+# DataFrame arguments are keyed by a fingerprint. A dataset loader tags the
+# frame it loads with a token (file path, size and modification time) in
+# DataFrame.attrs; pandas carries attrs over to copies and slices, so a slice
+# of a tagged dataset is fingerprinted from that token, its layout, its row
+# labels and a hash of a fixed sample of rows (a guard against columns
+# rewritten in place). That costs milliseconds, where hashing every row of a
+# large frame on each rerun would cost more than most of the work it saves.
+# Untagged frames (aggregates, ad-hoc uploads) fall back to hashing every row.
+# The fingerprint of a frame object is remembered while its shape and columns
+# are unchanged; frames edited cell by cell in place must be copied first.
+
+# ---------------------------------------------------------
+# CACHE CONFIGURATION
+# ---------------------------------------------------------
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024   # Per-function result budget
+FIGURE_SIZE_ESTIMATE = 1024 * 1024       # Matplotlib figures are not sized exactly
+DATASET_TOKEN_ATTR = 'dataset_token'     # DataFrame.attrs key set by the dataset loaders
+FINGERPRINT_GUARD_ROWS = 1024            # Rows hashed next to the token of a tagged frame
+
+_REGISTRY = {}
+
+
+# ==================================================================================
+# Block 1: Dataset Fingerprint
+# ==================================================================================
+_FINGERPRINTS = {}   # id(frame) -> (weak reference, layout, fingerprint)
+_FINGERPRINT_LOCK = threading.Lock()
+
+
+def _layout(df: pd.DataFrame) -> tuple:
+    return (df.shape, tuple((str(col), str(dtype)) for col, dtype in df.dtypes.items()))
+
+
+def _content_fingerprint(df: pd.DataFrame, layout: tuple) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(layout).encode())
+    if len(df) > 0:
+        try:
+            row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+        except TypeError:
+            # Unhashable cells (lists, dicts): fall back to their string form
+            row_hashes = pd.util.hash_pandas_object(df.astype(str), index=True).to_numpy()
+        digest.update(row_hashes.tobytes())
+    return digest.hexdigest()
+
+
+def _index_digest(index: pd.Index) -> bytes:
+    if isinstance(index, pd.RangeIndex):
+        return repr((index.start, index.stop, index.step)).encode()
+    if index.dtype.kind in 'iuMm':
+        # Integer labels: a mixed checksum, ordered by position, instead of hashing every byte
+        with np.errstate(over='ignore'):
+            mixed = index.to_numpy().view(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+            mixed ^= mixed >> np.uint64(31)
+            weights = np.arange(1, len(mixed) + 1, dtype=np.uint64)
+            return repr((len(mixed), int(mixed.sum()), int((mixed * weights).sum()))).encode()
+    return pd.util.hash_pandas_object(index).to_numpy().tobytes()
+
+
+def _token_fingerprint(df: pd.DataFrame, layout: tuple, token: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((token, layout)).encode())
+    digest.update(_index_digest(df.index))
+    if len(df) > 0:
+        positions = np.unique(np.linspace(0, len(df) - 1, min(len(df), FINGERPRINT_GUARD_ROWS)).astype(np.int64))
+        digest.update(_content_fingerprint(df.iloc[positions], layout).encode())
+    return digest.hexdigest()
+
+
+def file_token(path: str) -> str:
+    """
+    A token for a dataset file that changes whenever the file does.
+    """
+    info = os.stat(path)
+    return f"{os.path.abspath(path)}:{info.st_size}:{info.st_mtime_ns}"
+
+
+def tag_dataset(df: pd.DataFrame, token: str) -> pd.DataFrame:
+    """
+    Marks a freshly loaded dataset (in place) so it and its slices are fingerprinted
+    from `token` instead of by hashing every row. Returns df.
+    """
+    df.attrs[DATASET_TOKEN_ATTR] = str(token)
+    return df
+
+
+def dataset_token(df):
+    """
+    The loader token of df (or of the dataset it was sliced from), or None.
+    """
+    return getattr(df, 'attrs', {}).get(DATASET_TOKEN_ATTR)
+
+
+def dataset_fingerprint(df) -> str:
+    """
+    Returns the fingerprint of a DataFrame or Series: its shape, column names and
+    dtypes, plus either its loader token, row labels and sampled rows (tagged
+    frames) or the hash of every row (untagged frames).
+
+    The result is remembered per frame object and recomputed only when the
+    frame's shape or columns change.
+    """
+    if isinstance(df, pd.Series):
+        frame = df.to_frame()
+    else:
+        frame = df
+    layout = _layout(frame)
+    key = id(df)
+    with _FINGERPRINT_LOCK:
+        cached = _FINGERPRINTS.get(key)
+        if cached is not None and cached[0]() is df and cached[1] == layout:
+            return cached[2]
+
+    token = dataset_token(df)
+    fingerprint = _content_fingerprint(frame, layout) if token is None else _token_fingerprint(frame, layout, token)
+    try:
+        ref = weakref.ref(df, lambda _, key=key: _FINGERPRINTS.pop(key, None))
+    except TypeError:
+        return fingerprint
+    with _FINGERPRINT_LOCK:
+        _FINGERPRINTS[key] = (ref, layout, fingerprint)
+    return fingerprint
+
+
+# ==================================================================================
+# Block 2: Key Normalization & Result Sizing
+# ==================================================================================
+def normalize_key(value):
+    """
+    Converts a call argument into a hashable cache key component.
+    DataFrames/Series become fingerprints; containers are normalized recursively.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return ('__frame__', dataset_fingerprint(value))
+    if isinstance(value, np.ndarray):
+        return ('__array__', value.dtype.str, value.shape, hashlib.blake2b(np.ascontiguousarray(value).tobytes(), digest_size=16).hexdigest())
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize_key(v) for v in value)
+    if isinstance(value, dict):
+        return ('__dict__',) + tuple(sorted(((repr(k), normalize_key(v)) for k, v in value.items()), key=lambda item: item[0]))
+    if isinstance(value, (set, frozenset)):
+        return ('__set__',) + tuple(sorted(repr(v) for v in value))
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return ('__repr__', repr(value))
+
+
+def estimate_size(value) -> int:
+    """
+    Estimates the memory held by a cached result (bytes).
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if hasattr(value, 'savefig'):
+        return FIGURE_SIZE_ESTIMATE
+    return sys.getsizeof(value)
+
+
+def _copy_result(value):
+    # Callers are free to mutate what they get back (e.g. add a column),
+    # so frames are handed out as copies and the cached original stays intact.
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    if isinstance(value, dict):
+        return {k: _copy_result(v) for k, v in value.items()}
+    return value
+
+
+# ==================================================================================
+# Block 3: Memoization Decorator
+# ==================================================================================
+def memoize(max_bytes: int = DEFAULT_CACHE_BYTES):
+    """
+    Decorator: caches results of a pure function keyed on the fingerprint of its
+    DataFrame arguments plus the normalized remaining arguments.
+
+    Entries are evicted least-recently-used once the summed size of the cached
+    results exceeds `max_bytes`. The wrapped function exposes `cache_info()` and
+    `cache_clear()`.
+    """
+    def decorator(func):
+        entries = OrderedDict()  # key -> (result, size)
+        lock = threading.Lock()
+        stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'bytes': 0}
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (normalize_key(args), normalize_key(kwargs))
+            with lock:
+                if key in entries:
+                    entries.move_to_end(key)
+                    stats['hits'] += 1
+                    return _copy_result(entries[key][0])
+                stats['misses'] += 1
+
+            result = func(*args, **kwargs)
+            size = estimate_size(result)
+
+            with lock:
+                if size <= max_bytes and key not in entries:
+                    entries[key] = (result, size)
+                    stats['bytes'] += size
+                    while stats['bytes'] > max_bytes:
+                        _, (_, evicted_size) = entries.popitem(last=False)
+                        stats['bytes'] -= evicted_size
+                        stats['evictions'] += 1
+            return _copy_result(result)
+
+        def cache_info() -> dict:
+            with lock:
+                return dict(stats, entries=len(entries), max_bytes=max_bytes)
+
+        def cache_clear():
+            with lock:
+                entries.clear()
+                stats.update(hits=0, misses=0, evictions=0, bytes=0)
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        _REGISTRY[f"{func.__module__}.{func.__qualname__}"] = wrapper
+        return wrapper
+    return decorator
+
+
+def cache_stats() -> pd.DataFrame:
+    """
+    Returns hit/miss counters for every memoized function.
+    """
+    rows = [{'Function': name, **wrapper.cache_info()} for name, wrapper in _REGISTRY.items()]
+    return pd.DataFrame(rows)
+
+
+def clear_all_caches():
+    for wrapper in _REGISTRY.values():
+        wrapper.cache_clear()
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+from core.cache import memoize
+
+# This module finds the days where a daily violation series shifts to a new level
+# (e.g. after an enforcement drive). Binary segmentation on the mean is run for
+# every column of a daily rollup at once: segment sums come from one cumulative
+# sum matrix, so each round scores all candidate days of all series in a single
+# vectorized pass and splits every series at its best day if that beats the penalty.
+
+# ---------------------------------------------------------
+# CHANGE-POINT CONFIGURATION
+# ---------------------------------------------------------
+CHANGEPOINT_MIN_SEGMENT = 30   # Days on each side of a break
+CHANGEPOINT_MAX_BREAKS = 5     # Per series
+CHANGEPOINT_PENALTY = 3.0      # Gain must exceed PENALTY * noise variance * log(days)
+
+
+# ==================================================================================
+# Block 1: Vectorized Binary Segmentation
+# ==================================================================================
+def _noise_variance(values: np.ndarray) -> np.ndarray:
+    """
+    Per-series noise variance from first differences (robust to level shifts).
+    Uses the MAD when it is informative and the plain variance otherwise
+    (sparse count series have a MAD of 0).
+    """
+    diffs = np.diff(values, axis=0)
+    mad = np.median(np.abs(diffs - np.median(diffs, axis=0)), axis=0) / 0.6745
+    sigma2 = mad ** 2 / 2
+    sigma2 = np.where(sigma2 > 0, sigma2, diffs.var(axis=0) / 2)
+    return np.maximum(sigma2, 1e-12)
+
+
+def binary_segmentation(values: np.ndarray, min_size: int = CHANGEPOINT_MIN_SEGMENT,
+                        max_breaks: int = CHANGEPOINT_MAX_BREAKS, penalty: float = CHANGEPOINT_PENALTY) -> np.ndarray:
+    """
+    Mean-shift binary segmentation of every column of `values` (days x series).
+
+    Returns:
+        np.ndarray: Boolean (days + 1) x series matrix; True at row t means a new
+        segment starts on day t. Rows 0 and `days` are always True (the series bounds).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n_days, n_series = values.shape
+    cumulative = np.zeros((n_days + 1, n_series))
+    np.cumsum(values, axis=0, out=cumulative[1:])
+
+    is_break = np.zeros((n_days + 1, n_series), dtype=bool)
+    is_break[0] = is_break[n_days] = True
+    if n_days < 2 * min_size:
+        return is_break
+
+    threshold = penalty * _noise_variance(values) * np.log(n_days)
+    positions = np.arange(n_days + 1)[:, None]
+    series = np.arange(n_series)
+
+    for _ in range(max_breaks):
+        # Bounds of the segment around every candidate day, per series
+        starts = np.maximum.accumulate(np.where(is_break, positions, 0), axis=0)
+        ends = np.minimum.accumulate(np.where(is_break, positions, n_days)[::-1], axis=0)[::-1]
+        left_n = positions - starts
+        right_n = ends - positions
+        valid = (left_n >= min_size) & (right_n >= min_size)
+
+        start_sums = np.take_along_axis(cumulative, starts, axis=0)
+        end_sums = np.take_along_axis(cumulative, ends, axis=0)
+        left = cumulative - start_sums
+        right = end_sums - cumulative
+        whole = end_sums - start_sums
+
+        # Reduction of the squared error when the segment is split at the candidate day
+        with np.errstate(invalid='ignore', divide='ignore'):
+            gain = left ** 2 / left_n + right ** 2 / right_n - whole ** 2 / (ends - starts)
+        gain = np.where(valid, gain, -np.inf)
+
+        best_day = np.argmax(gain, axis=0)
+        accept = gain[best_day, series] > threshold
+        if not accept.any():
+            break
+        is_break[best_day[accept], series[accept]] = True
+    return is_break
+
+
+# ==================================================================================
+# Block 2: Change Points of a Daily Rollup
+# ==================================================================================
+@memoize()
+def detect_change_points(daily: pd.DataFrame, min_size: int = CHANGEPOINT_MIN_SEGMENT,
+                         max_breaks: int = CHANGEPOINT_MAX_BREAKS, penalty: float = CHANGEPOINT_PENALTY) -> pd.DataFrame:
+    """
+    Detects level shifts in every column of a daily rollup (see rolling.daily_rollup).
+
+    Returns:
+        pd.DataFrame: ['Series', 'Date', 'Mean_Before', 'Mean_After', 'Change_Pct'], one row per break.
+        'Series' is the column label ((Location, Violation_Type) tuples are joined with ' | ').
+    """
+    columns = ['Series', 'Date', 'Mean_Before', 'Mean_After', 'Change_Pct']
+    if daily.empty:
+        return pd.DataFrame(columns=columns)
+
+    values = daily.to_numpy(dtype=np.float64)
+    is_break = binary_segmentation(values, min_size, max_breaks, penalty)
+    cumulative = np.vstack([np.zeros((1, values.shape[1])), np.cumsum(values, axis=0)])
+
+    rows = []
+    for s, label in enumerate(daily.columns):
+        bounds = np.flatnonzero(is_break[:, s])
+        for i in range(1, len(bounds) - 1):
+            before_start, day, after_end = bounds[i - 1], bounds[i], bounds[i + 1]
+            mean_before = (cumulative[day, s] - cumulative[before_start, s]) / (day - before_start)
+            mean_after = (cumulative[after_end, s] - cumulative[day, s]) / (after_end - day)
+            change_pct = (mean_after - mean_before) / mean_before * 100 if mean_before else np.nan
+            rows.append((' | '.join(map(str, label)) if isinstance(label, tuple) else label,
+                         daily.index[day], mean_before, mean_after, change_pct))
+    return pd.DataFrame(rows, columns=columns)
+
+
+def change_point_dates(change_points: pd.DataFrame) -> dict:
+    """
+    {series label: [break dates]} for plot_trend_analysis_line.
+    """
+    return change_points.groupby('Series')['Date'].apply(list).to_dict() if not change_points.empty else {}
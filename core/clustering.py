@@ -0,0 +1,186 @@
+import numpy as np
+import pandas as pd
+from core.cache import memoize
+from core.crosstab import crosstab
+
+# This module groups locations (or registration states) with a similar violation
+# profile. Each location becomes one vector of shares - violation types, vehicle
+# types and time of day - taken from the aggregated location x attribute tables,
+# so k-means runs on a handful of rows instead of the raw data. Lloyd iterations
+# are fully vectorized.
+
+# ---------------------------------------------------------
+# CLUSTERING CONFIGURATION
+# ---------------------------------------------------------
+PROFILE_DIMENSIONS = ['Violation_Type', 'Vehicle_Type', 'Time_Of_Day']
+TIME_OF_DAY_BINS = [0, 6, 12, 18, 24]
+TIME_OF_DAY_LABELS = ['Night', 'Morning', 'Afternoon', 'Evening']
+DEFAULT_CLUSTERS = 3
+KMEANS_MAX_ITER = 100
+KMEANS_N_INIT = 10              # Restarts; the lowest inertia wins
+KMEANS_TOL = 1e-6
+
+
+# ==================================================================================
+# Block 1: Profile Vectors
+# ==================================================================================
+def _time_of_day(df: pd.DataFrame) -> pd.Series:
+    hours = pd.to_datetime(df['Time'], format='mixed', errors='coerce').dt.hour
+    return pd.cut(hours, bins=TIME_OF_DAY_BINS, labels=TIME_OF_DAY_LABELS, right=False)
+
+
+def available_dimensions(df: pd.DataFrame) -> list:
+    """
+    Profile dimensions that can be built from the columns of df.
+    """
+    return [dim for dim in PROFILE_DIMENSIONS if dim in df.columns or (dim == 'Time_Of_Day' and 'Time' in df.columns)]
+
+
+@memoize()
+def build_profiles(df: pd.DataFrame, location_col: str = 'Location', dimensions: list = None) -> pd.DataFrame:
+    """
+    One row per location: the share of its violations in every value of every dimension.
+
+    Returns:
+        pd.DataFrame: Indexed by location, MultiIndex columns (dimension, value).
+        Each dimension's shares sum to 1 per location.
+    """
+    dimensions = available_dimensions(df) if dimensions is None else list(dimensions)
+    blocks = {}
+    for dim in dimensions:
+        keys = _time_of_day(df) if dim == 'Time_Of_Day' else df[dim]
+        counts = crosstab(df[location_col], keys, observed=True)
+        totals = counts.sum(axis=1).replace(0, np.nan)
+        blocks[dim] = counts.div(totals, axis=0).fillna(0.0)
+    if not blocks:
+        return pd.DataFrame()
+    return pd.concat(blocks, axis=1, names=['Dimension', 'Value']).fillna(0.0)
+
+
+# ==================================================================================
+# Block 2: Vectorized k-means
+# ==================================================================================
+def _squared_distances(points: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2 for every point/center pair at once
+    distances = (points ** 2).sum(axis=1)[:, None] - 2 * points @ centers.T + (centers ** 2).sum(axis=1)[None, :]
+    return np.maximum(distances, 0.0)
+
+
+def _kmeans_plus_plus(points: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    k-means++ seeding: each new center is drawn with probability proportional
+    to the squared distance from the nearest center chosen so far.
+    """
+    centers = [points[rng.integers(len(points))]]
+    closest = _squared_distances(points, centers[0][None, :])[:, 0]
+    for _ in range(1, k):
+        total = closest.sum()
+        index = rng.choice(len(points), p=closest / total) if total > 0 else rng.integers(len(points))
+        centers.append(points[index])
+        closest = np.minimum(closest, _squared_distances(points, points[index][None, :])[:, 0])
+    return np.array(centers)
+
+
+def _lloyd(points: np.ndarray, centers: np.ndarray, max_iter: int, tol: float) -> np.ndarray:
+    k = len(centers)
+    for _ in range(max_iter):
+        labels = _squared_distances(points, centers).argmin(axis=1)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, points)
+        # An emptied cluster keeps its previous center
+        new_centers = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centers)
+        shift = ((new_centers - centers) ** 2).sum()
+        centers = new_centers
+        if shift <= tol:
+            break
+    return centers
+
+
+def kmeans(points: np.ndarray, k: int, n_init: int = KMEANS_N_INIT, max_iter: int = KMEANS_MAX_ITER,
+           tol: float = KMEANS_TOL, seed: int = 0):
+    """
+    Clusters the rows of `points` into k groups.
+
+    Args:
+        points (np.ndarray): n x d matrix.
+        k (int): Number of clusters (capped at n).
+
+    Returns:
+        (labels, centers, inertia)
+    """
+    points = np.asarray(points, dtype=np.float64)
+    k = max(1, min(int(k), len(points)))
+    rng = np.random.default_rng(seed)
+
+    best = None
+    for _ in range(n_init):
+        centers = _kmeans_plus_plus(points, k, rng)
+        centers = _lloyd(points, centers, max_iter, tol)
+        distances = _squared_distances(points, centers)
+        labels = distances.argmin(axis=1)
+        inertia = float(distances[np.arange(len(points)), labels].sum())
+        if best is None or inertia < best[2]:
+            best = (labels, centers, inertia)
+    return best
+
+
+# ==================================================================================
+# Block 3: Location Clusters
+# ==================================================================================
+@memoize()
+def cluster_locations(df: pd.DataFrame, location_col: str = 'Location', k: int = DEFAULT_CLUSTERS,
+                      dimensions: list = None, seed: int = 0) -> dict:
+    """
+    Clusters locations by their violation profile.
+
+    Profiles are standardized per feature before clustering so that rare but
+    distinctive categories weigh as much as common ones.
+
+    Returns:
+        dict: {
+            'assignments': DataFrame [location_col, 'Cluster', 'Violations'] (clusters numbered 1..k by size),
+            'centers': DataFrame of mean profile shares per cluster (Cluster x (dimension, value)),
+            'inertia': float
+        }
+    """
+    profiles = build_profiles(df, location_col, dimensions)
+    if profiles.empty:
+        return {'assignments': pd.DataFrame(columns=[location_col, 'Cluster', 'Violations']),
+                'centers': pd.DataFrame(), 'inertia': 0.0}
+
+    values = profiles.to_numpy(dtype=np.float64)
+    std = values.std(axis=0)
+    scaled = (values - values.mean(axis=0)) / np.where(std > 0, std, 1.0)
+    labels, _, inertia = kmeans(scaled, k, seed=seed)
+
+    # Number clusters 1..k from largest to smallest so colours are stable across reruns
+    sizes = np.bincount(labels)
+    order = np.argsort(-sizes, kind='mergesort')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    clusters = rank[labels] + 1
+
+    violations = df[location_col].value_counts().reindex(profiles.index).fillna(0).astype(np.int64)
+    assignments = pd.DataFrame({
+        location_col: profiles.index,
+        'Cluster': clusters,
+        'Violations': violations.to_numpy(),
+    }).sort_values(['Cluster', location_col], ignore_index=True)
+    centers = profiles.groupby(clusters).mean()
+    centers.index.name = 'Cluster'
+    return {'assignments': assignments, 'centers': centers, 'inertia': inertia}
+
+
+def describe_clusters(centers: pd.DataFrame, top_n: int = 3) -> pd.DataFrame:
+    """
+    For every cluster, the profile values most over-represented relative to the average location.
+    """
+    if centers.empty:
+        return pd.DataFrame(columns=['Cluster', 'Distinctive_Traits'])
+    lift = centers / centers.mean(axis=0).replace(0, np.nan)
+    rows = []
+    for cluster, row in lift.iterrows():
+        traits = row.dropna().nlargest(top_n)
+        rows.append((cluster, ', '.join(f"{value} ({share:.2f}x)" for (_, value), share in traits.items())))
+    return pd.DataFrame(rows, columns=['Cluster', 'Distinctive_Traits'])
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+# This module provides a two-way crosstab built directly on integer codes.
+# Both keys are factorized (or their categorical codes reused), combined into
+# a single key `code_a * n_b + code_b` and counted/summed with np.bincount,
+# avoiding the generic groupby machinery behind pd.crosstab / pivot_table.
+
+
+def _codes_and_labels(values: pd.Series):
+    """
+    Returns (int64 codes with -1 for nulls, label Index).
+    Categorical inputs keep every category, like pivot_table(observed=False).
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(dtype=np.int64), values.cat.categories
+    codes, labels = pd.factorize(values, sort=True)
+    return codes.astype(np.int64), labels
+
+
+def crosstab(index: pd.Series, columns: pd.Series, values: pd.Series = None, aggfunc: str = 'count',
+             observed: bool = False) -> pd.DataFrame:
+    """
+    Two-way table of `index` x `columns`.
+
+    Args:
+        index (pd.Series): Row keys.
+        columns (pd.Series): Column keys (same length as `index`).
+        values (pd.Series): Optional values. With aggfunc='count' only non-null values are counted.
+        aggfunc (str): 'count', 'sum' or 'mean'.
+        observed (bool): Drop categories that never occur (pd.crosstab behaviour).
+            By default every category of a categorical key is kept.
+
+    Returns:
+        pd.DataFrame: Labelled table. Counts and sums are 0 for empty cells, means are NaN.
+    """
+    if aggfunc not in ('count', 'sum', 'mean'):
+        raise ValueError(f"Unsupported aggfunc: {aggfunc}")
+    if aggfunc != 'count' and values is None:
+        raise ValueError(f"aggfunc='{aggfunc}' requires values.")
+
+    row_codes, row_labels = _codes_and_labels(pd.Series(index))
+    col_codes, col_labels = _codes_and_labels(pd.Series(columns))
+    n_rows, n_cols = len(row_labels), len(col_labels)
+
+    valid = (row_codes >= 0) & (col_codes >= 0)
+    weights = None
+    if values is not None:
+        weights = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=np.float64) if aggfunc != 'count' else None
+        valid &= pd.Series(values).notna().to_numpy()
+
+    key = row_codes[valid] * n_cols + col_codes[valid]
+    size = n_rows * n_cols
+    counts = np.bincount(key, minlength=size).reshape(n_rows, n_cols)
+
+    if aggfunc == 'count':
+        table = counts
+    else:
+        sums = np.bincount(key, weights=weights[valid], minlength=size).reshape(n_rows, n_cols)
+        if aggfunc == 'sum':
+            table = sums
+        else:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                table = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+    result = pd.DataFrame(
+        table,
+        index=pd.Index(row_labels, name=getattr(index, 'name', None)),
+        columns=pd.Index(col_labels, name=getattr(columns, 'name', None)),
+    )
+    if observed:
+        result = result.loc[counts.sum(axis=1) > 0, counts.sum(axis=0) > 0]
+    if aggfunc == 'mean' and not isinstance(pd.Series(index).dtype, pd.CategoricalDtype):
+        # Matches pivot_table(dropna=True): labels with no values at all are dropped
+        result = result.dropna(how='all').dropna(axis=1, how='all')
+    return result
@@ -1,7 +1,12 @@
 import pandas as pd 
-import matplotlib.pyplot as plt
+import matplotlib as mpl
+from matplotlib.artist import setp
 import seaborn as sns
 import matplotlib.ticker as mtick
+from core.crosstab import crosstab
+from core.severity import compute_severity_score
+from core import plot_style
+from core import plot_data
 
 # This module handles plots for the Dashboard (Home Page)
 
@@ -22,11 +27,12 @@ UNI_PALETTE = "deep"
 
 def apply_plot_style():
     """
-    Applies the uniform style settings to matplotlib and seaborn.
-    Call this at the start of plot functions or globally.
+    Applies the uniform style settings to matplotlib and seaborn (globally).
+    Plot functions do not call it: it is compiled once by core/plot_style.py
+    and applied per figure with @plot_style.styled('dashboard').
     """
     sns.set_theme(style="whitegrid", context="talk", palette=UNI_PALETTE)
-    plt.rcParams.update({
+    mpl.rcParams.update({
         'font.family': 'sans-serif',
         'font.size': TICK_SIZE,
         'axes.titlesize': TITLE_SIZE,
@@ -43,17 +49,18 @@ def apply_plot_style():
 
 # Apply global style on module load
 apply_plot_style()
+plot_style.register_style('dashboard', lambda theme: apply_plot_style())
 
 # =============================== Dashboard Overview Plots =============================================
 # ----- Amit's Plots -----
+@plot_style.styled('dashboard')
 def plot_violation_type_percentage_pie(df):
     """
     Plots the percentage of traffic violation types as a pie chart.
     """
-    apply_plot_style()
-    violation_counts = df['Violation_Type'].value_counts()
+    violation_counts = plot_data.group_stat(df, 'Violation_Type', order='value')
     
-    fig, ax = plt.subplots(figsize=FIG_SIZE)
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
     wedges, texts, autotexts = ax.pie(
         violation_counts,
         autopct='%1.1f%%',
@@ -61,7 +68,7 @@ def plot_violation_type_percentage_pie(df):
         wedgeprops={'edgecolor': 'black'},
         pctdistance=0.85,
     )
-    plt.setp(autotexts, size=TICK_SIZE, weight="bold") # standard size
+    setp(autotexts, size=TICK_SIZE, weight="bold") # standard size
     ax.legend(
         wedges, 
         violation_counts.index,
@@ -73,16 +80,16 @@ def plot_violation_type_percentage_pie(df):
     )
     ax.set_title("Percentage of Traffic Violation Types", fontsize=TITLE_SIZE)
     ax.axis('equal')
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 # =================================================================================
+@plot_style.styled('dashboard')
 def plot_fines_based_on_violation_type(summary):
     """
     Plots the fines based on violation type (Paid vs Unpaid).
     """
-    apply_plot_style()
-    fig, ax = plt.subplots(figsize=FIG_SIZE)
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
     summary.plot(
         kind='bar',
         stacked=True,
@@ -95,8 +102,8 @@ def plot_fines_based_on_violation_type(summary):
     ax.set_title('Fines Based on Violation Type', fontsize=TITLE_SIZE)
     ax.set_xlabel('Violation Type', fontsize=LABEL_SIZE)
     ax.set_ylabel('Total Fine Amount (₹)', fontsize=LABEL_SIZE)
-    plt.xticks(rotation=25, fontweight=TICK_WEIGHT)
-    plt.yticks(rotation=25, fontweight=TICK_WEIGHT)
+    setp(ax.get_xticklabels(), rotation=25, fontweight=TICK_WEIGHT)
+    setp(ax.get_yticklabels(), rotation=25, fontweight=TICK_WEIGHT)
 
     # Format Color Bar values, Y-axis values
     ax.yaxis.set_major_formatter(mtick.StrMethodFormatter('{x:,.0f}'))
@@ -128,7 +135,7 @@ def plot_fines_based_on_violation_type(summary):
             ha='center', va='bottom', fontsize=12, fontweight='bold', color='black'
         )
     
-    plt.tight_layout()
+    fig.tight_layout()
 
     ax.legend(
         title="Status", 
@@ -141,11 +148,11 @@ def plot_fines_based_on_violation_type(summary):
     return fig
 
 # =================================================================================
+@plot_style.styled('dashboard')
 def plot_violations_by_location(location_based_violations):
-    apply_plot_style()
     
     # 1. Create subplots to have better control over the object
-    fig, ax = plt.subplots(figsize=FIG_SIZE)
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
     
     # 2. Plot the pie
     wedges, texts, autotexts = ax.pie(
@@ -157,7 +164,7 @@ def plot_violations_by_location(location_based_violations):
     )
     
     # 3. Handle Text Styling
-    plt.setp(autotexts, size=TICK_SIZE, weight="bold")
+    setp(autotexts, size=TICK_SIZE, weight="bold")
     
     # 4. Create a legend on the side to utilize the 16:9 width
     ax.legend(
@@ -176,20 +183,20 @@ def plot_violations_by_location(location_based_violations):
     ax.axis('equal')
     
     # 6. Adjust layout to make room for the legend
-    plt.tight_layout()
+    fig.tight_layout()
     
     return fig
 # =================================================================================
 # ---- Anshu's Plots ----
+@plot_style.styled('dashboard')
 def plot_license_validity_by_gender(df):
 
     """
     Anshu: License Validity by Gender.
     """
-    apply_plot_style()
-    validity_gender = df.groupby(['License_Validity', 'Driver_Gender']).size().unstack(fill_value=0)
+    validity_gender = plot_data.cross_table(df, 'License_Validity', 'Driver_Gender', observed=True)
     
-    fig, ax = plt.subplots(figsize=FIG_SIZE)
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
     validity_gender.plot(
         kind='bar', 
         ax=ax,
@@ -202,21 +209,21 @@ def plot_license_validity_by_gender(df):
     ax.set_xlabel("License Status", fontsize=LABEL_SIZE)
     ax.set_ylabel("Count", fontsize=LABEL_SIZE)
     ax.legend(title="Driver Gender", fontsize=TICK_SIZE)
-    plt.xticks(rotation=25, fontweight=TICK_WEIGHT)
-    plt.yticks(rotation=25, fontweight=TICK_WEIGHT)
-    plt.tight_layout()
+    setp(ax.get_xticklabels(), rotation=25, fontweight=TICK_WEIGHT)
+    setp(ax.get_yticklabels(), rotation=25, fontweight=TICK_WEIGHT)
+    fig.tight_layout()
     return fig
 
 
 
 # ============================== Additional Plots ===================================================
 # 1. Gender Distribution
+@plot_style.styled('dashboard')
 def plot_gender_distribution(gender_distribution):
     """
     Plots the gender distribution of drivers.
     """
-    apply_plot_style()
-    fig, ax = plt.subplots(figsize=FIG_SIZE)
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
     sns.barplot(
         x=gender_distribution.index, 
         y=gender_distribution.values, 
@@ -225,76 +232,59 @@ def plot_gender_distribution(gender_distribution):
         palette='viridis', 
         edgecolor='black', 
         linewidth=1.5,
+        errorbar=None,
         ax=ax
     )
     ax.set_title('Gender Distribution', fontsize=TITLE_SIZE)
     ax.set_xlabel('Gender', fontsize=LABEL_SIZE)
     ax.set_ylabel('Count', fontsize=LABEL_SIZE)
    
-    plt.xticks(rotation=25, fontweight=TICK_WEIGHT)
-    plt.yticks(rotation=25, fontweight=TICK_WEIGHT)
+    setp(ax.get_xticklabels(), rotation=25, fontweight=TICK_WEIGHT)
+    setp(ax.get_yticklabels(), rotation=25, fontweight=TICK_WEIGHT)
     return fig
 
 # 2. Vehicle Type vs Violation Type (Monika's Contribution)
+@plot_style.styled('dashboard')
 def plot_vehicle_type_vs_violation_type(df):
     """
     Monika: Vehicle type vs Violation Type.
     """
-    apply_plot_style()
-    fig, ax = plt.subplots(figsize=FIG_SIZE)
-    sns.countplot(
-        data=df, 
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
+    sns.barplot(
+        data=plot_data.count_table(df, 'Violation_Type', 'Vehicle_Type'),
         x='Violation_Type',
+        y='Count',
         hue='Vehicle_Type',
         ax=ax,
         palette='Set1',
-        edgecolor='black'
+        edgecolor='black',
+        errorbar=None
     )
     ax.set_title('Vehicle Type vs Violation Type', fontsize=TITLE_SIZE)
     ax.set_xlabel('Violation Type', fontsize=LABEL_SIZE)
     ax.set_ylabel('Number of Violations', fontsize=LABEL_SIZE)
     ax.legend(title='Vehicle Type', fontsize=TICK_SIZE, title_fontsize=LABEL_SIZE, bbox_to_anchor=(1, 1), loc='upper left')
-    plt.xticks(rotation=25, fontweight=TICK_WEIGHT)
-    plt.tight_layout()
+    setp(ax.get_xticklabels(), rotation=25, fontweight=TICK_WEIGHT)
+    fig.tight_layout()
     return fig
 
 # 3. Severity Heatmap by Location (Mrunalini's Contribution)
+@plot_style.styled('dashboard')
 def plot_severity_heatmap_by_location(df):
     """
     Mrunalini: Average Severity Score by Location and Violation Type.
     """
-    apply_plot_style()
-    # Helper to calculate severity (Internal logic kept same)
-    def calc_severity_score(row):
-        severity = 0
-        if pd.notnull(row.get('Fine_Amount')): severity += row['Fine_Amount'] / 1000
-        if pd.notnull(row.get('Penalty_Points')): severity += row['Penalty_Points'] 
-        if pd.notnull(row.get('Recorded_Speed')) and pd.notnull(row.get('Speed_Limit')):
-            if row['Recorded_Speed'] > row['Speed_Limit']:
-                severity += (row['Recorded_Speed'] - row['Speed_Limit']) / 10
-        if pd.notnull(row.get('Alcohol_Level')): severity += row['Alcohol_Level'] * 10
-        if row.get('Helmet_Worn') == 'No': severity += 10
-        if row.get('Seatbelt_Worn') == 'No': severity += 10
-        if row.get('Traffic_Light_Status') == 'Red': severity += 15
-        if pd.notnull(row.get('Previous_Violations')): severity += row['Previous_Violations'] * 1.5
-        return severity
-
-    # We need a copy to avoid SettingWithCopyWarning on the original df if modifying
-    # But for dashboard summary df is passed, better to just apply
-    # Optimizing: Calculate on the fly might be slow for full df, but for dashboard summary (last n days) should be fine.
-    
-    # We'll use a local copy to be safe
-    local_df = df.copy()
-    local_df['Violation_Severity_Score'] = local_df.apply(calc_severity_score, axis=1)
+    # Score is computed column-wise and cached per dataset (see core/severity.py)
+    severity_score = compute_severity_score(df)
     
-    location_heatmap = local_df.pivot_table(
-        values='Violation_Severity_Score',
-        index='Location',
-        columns='Violation_Type',
+    location_heatmap = crosstab(
+        df['Location'],
+        df['Violation_Type'],
+        values=severity_score,
         aggfunc='mean'
     )
 
-    fig, ax = plt.subplots(figsize=FIG_SIZE)
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
     sns.heatmap(
         location_heatmap, 
         cmap='magma_r', 
@@ -308,6 +298,6 @@ def plot_severity_heatmap_by_location(df):
     ax.set_title("Average Severity Score by Location and Violation Type", fontsize=TITLE_SIZE)
     ax.set_xlabel('Violation Type', fontsize=LABEL_SIZE)
     ax.set_ylabel('Location', fontsize=LABEL_SIZE)
-    plt.xticks(rotation=25, fontweight=TICK_WEIGHT)
-    plt.tight_layout()
+    setp(ax.get_xticklabels(), rotation=25, fontweight=TICK_WEIGHT)
+    fig.tight_layout()
     return fig
\ No newline at end of file
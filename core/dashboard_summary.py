@@ -1,7 +1,11 @@
 import pandas as pd
 import core.dashboard_plot as dashboard_plot
+from core import sketches
+from core import hotspots
+from core.cache import memoize
 
 # =================================================================================
+@memoize()
 def get_violations_summary_of_last_n_days(df_last_n_days: pd.DataFrame) -> dict:
     # 1. calculate the no of violations in last n days
     total_no_of_violations = df_last_n_days.shape[0]
@@ -15,15 +19,17 @@ def get_violations_summary_of_last_n_days(df_last_n_days: pd.DataFrame) -> dict:
     }
 
 # =================================================================================
+@memoize()
 def get_total_fines_generated(df_last_n_days: pd.DataFrame) -> dict:
     # 1. calculate total fines in last n days
     total_fines = df_last_n_days['Fine_Amount'].sum()
     avg_fine_per_violation = total_fines / df_last_n_days.shape[0] if df_last_n_days.shape[0] > 0 else 0
     # ==============================================================================
     # 2. Prepare data for fines based on violation type
-    df_last_n_days['Fine_Amount'] = pd.to_numeric(df_last_n_days['Fine_Amount'], errors='coerce').fillna(0)
-    df_last_n_days['Fine_Paid'] = df_last_n_days['Fine_Paid'].astype(str).str.upper().str.strip()
-    summary = (df_last_n_days.groupby(['Violation_Type', 'Fine_Paid'])['Fine_Amount'].sum().unstack(fill_value=0))
+    # (normalized on local series so the caller's frame, and its cache fingerprint, stay untouched)
+    fine_amount = pd.to_numeric(df_last_n_days['Fine_Amount'], errors='coerce').fillna(0)
+    fine_paid = df_last_n_days['Fine_Paid'].astype(str).str.upper().str.strip()
+    summary = (fine_amount.groupby([df_last_n_days['Violation_Type'], fine_paid]).sum().unstack(fill_value=0))
     summary = summary.rename(columns={'YES': 'Paid', 'NO': 'Unpaid'})
     
     # 3. Generate a figure of fines based on violation type
@@ -36,9 +42,19 @@ def get_total_fines_generated(df_last_n_days: pd.DataFrame) -> dict:
     }
 
 # =================================================================================
-def get_violations_by_location(df_last_n_days: pd.DataFrame) -> dict:
+@memoize()
+def get_violations_by_location(df_last_n_days: pd.DataFrame, sketch_store: dict = None) -> dict:
+    """
+    With a `sketch_store` holding daily 'Location' heavy-hitter sketches, the counts
+    come from merging the sketches of the days covered by `df_last_n_days`
+    instead of scanning its rows.
+    """
     # 1. No Of Violations for the location
-    location_based_violations = df_last_n_days['Location'].value_counts().reset_index()
+    if sketch_store is not None and not df_last_n_days.empty:
+        top_locations = sketches.approx_top_n(sketch_store, 'Location', start=df_last_n_days['Date'].min(), end=df_last_n_days['Date'].max())
+        location_based_violations = top_locations[['Location', 'Count']]
+    else:
+        location_based_violations = df_last_n_days['Location'].value_counts().reset_index()
     location_based_violations.columns = ['Location', 'No of Violations']
 
     # 2. Total No Of Violations
@@ -66,6 +82,7 @@ def get_violations_by_location(df_last_n_days: pd.DataFrame) -> dict:
     }
 
 # =================================================================================
+@memoize()
 def get_license_insights(df_last_n_days: pd.DataFrame) -> dict:
     """
     Calculates insights related to License validity and type.
@@ -101,6 +118,7 @@ def get_license_insights(df_last_n_days: pd.DataFrame) -> dict:
 # =======================================================================================================================
 # =======================================================================================================================
 # =======================================================================================================================
+@memoize()
 def get_global_overview_metrics(df: pd.DataFrame) -> dict:
     """
     Generates summary statistics for the Global Data Overview.
@@ -141,18 +159,23 @@ def get_global_overview_metrics(df: pd.DataFrame) -> dict:
 
 
 # =======================================================================================================================
-def get_behavioral_analysis(df: pd.DataFrame) -> dict:
+@memoize()
+def get_behavioral_analysis(df: pd.DataFrame, sketch_store: dict = None) -> dict:
     """
     Computes flags and returns aggregate counts/percentages for:
     - Over Speeding
     - High Fine (>90th percentile)
     - Repeat Offenders (>2 violations)
     - Bad Weather Risk
+
+    The 90th percentile fine is read from the merged Fine_Amount sketches of
+    `sketch_store` over the date range of `df` when a store is given.
     """
     total_records = len(df)
     analysis_results = {
         'total_count': total_records,
         'over_speeding_stats': (0, 0.0),
+        'high_fine_stats': (0, 0.0, 0.0),
         'court_appearance_stats': (0, 0.0),
         'repeat_offender_stats': (0, 0.0),
         'bad_weather_stats': (0, 0.0),
@@ -171,17 +194,23 @@ def get_behavioral_analysis(df: pd.DataFrame) -> dict:
     # 1. Over Speeding
     analysis_results['over_speeding_stats'] = calculate_stats(df['Recorded_Speed'] > df['Speed_Limit'])
 
+    # 1b. High Fine (> 90th percentile)
+    if 'Fine_Amount' in df.columns:
+        fines = pd.to_numeric(df['Fine_Amount'], errors='coerce')
+        if sketch_store is not None and 'Date' in df.columns:
+            fine_p90 = sketches.approx_quantiles(sketch_store, 'Fine_Amount', 0.9, df['Date'].min(), df['Date'].max())
+        else:
+            fine_p90 = sketches.KLLSketch().update(fines).quantile(0.9)
+        high_fine_count, high_fine_pct = calculate_stats(fines > fine_p90)
+        analysis_results['high_fine_stats'] = (high_fine_count, high_fine_pct, fine_p90)
+
     # 2. Court Appearance Required
     if 'Court_Appearance_Required' in df.columns:
         analysis_results['court_appearance_stats'] = calculate_stats(df['Court_Appearance_Required'] == 'Yes')
 
-    # 3. Repeat Offenders (Based on Comments == 'Repeat Offender')
+    # 3. Repeat Offenders (Based on Comments == 'Repeat Offender'; the dataset has no driver identifier)
     if 'Comments' in df.columns:
-        repeat_offender_counts = df[df['Comments'] == 'Repeat Offender'].value_counts().sum()
-        if len(df) > 0:
-            repeat_offender_pct = (repeat_offender_counts / len(df)) * 100
-
-        analysis_results['repeat_offender_stats'] = (repeat_offender_counts, repeat_offender_pct)
+        analysis_results['repeat_offender_stats'] = calculate_stats(df['Comments'] == 'Repeat Offender')
 
     if 'Weather_Condition' in df.columns:
         adverse_weather_conditions = {'fog', 'rain', 'snow', 'thunderstorm', 'hail', 'mist'}
@@ -199,4 +228,33 @@ def get_behavioral_analysis(df: pd.DataFrame) -> dict:
     return analysis_results
 
 
-# =======================================================================================================================
\ No newline at end of file
+# =======================================================================================================================
+@memoize()
+def get_hotspot_alerts(df: pd.DataFrame, freq: str = hotspots.HOTSPOT_FREQ, top_n: int = 10) -> dict:
+    """
+    Runs the EWMA hotspot detector (core/hotspots.py) and returns:
+    - total number of alerts
+    - location with the most alerts
+    - the latest `top_n` alerts
+    - per-location alert summary
+    """
+    results = {
+        'total_alerts': 0,
+        'top_hotspot_location': "N/A",
+        'latest_alerts': pd.DataFrame(),
+        'location_summary': pd.DataFrame(),
+    }
+    if not hotspots.can_detect(df) or df.empty:
+        return results
+
+    alerts = hotspots.detect_hotspots(df, freq=freq)
+    summary = hotspots.hotspot_summary(alerts)
+    results['total_alerts'] = len(alerts)
+    results['latest_alerts'] = alerts.head(top_n)
+    results['location_summary'] = summary
+    if not summary.empty:
+        results['top_hotspot_location'] = summary['Location'].iloc[0]
+    return results
+
+
+# =======================================================================================================================
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+from core.cache import memoize
+
+# This module thins long time series before they are drawn.
+# A plot a thousand pixels wide cannot show more than about a thousand points
+# per line, so each series is reduced to that many with Largest-Triangle-Three-
+# Buckets (keeps the points that shape the line, peaks included) or min-max
+# bucketing (keeps every bucket's extremes). Series shorter than the target
+# are returned untouched. Used by trend_plot and vega_plot for trend lines.
+
+# ---------------------------------------------------------
+# DOWNSAMPLING CONFIGURATION
+# ---------------------------------------------------------
+PLOT_WIDTH_PX = 1200                  # Approximate drawn width of a trend plot
+DEFAULT_POINTS = PLOT_WIDTH_PX        # Points kept per series (about one per pixel column)
+DOWNSAMPLE_METHODS = ('lttb', 'minmax')
+
+
+# ==================================================================================
+# Block 1: Index Selection
+# ==================================================================================
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: positions of the `n_out` points of (x, y) to keep.
+
+    The first and last points are always kept. The rest is split into n_out - 2
+    buckets; from each, the point forming the largest triangle with the point
+    kept from the previous bucket and the mean of the next bucket is chosen.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    bounds = np.append(edges, n)
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = bounds[i], bounds[i + 1]
+        next_end = bounds[i + 2]
+        avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        area = np.abs((x[previous] - avg_x) * (y[start:end] - y[previous])
+                      - (x[previous] - x[start:end]) * (avg_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Min-max bucketing: the lowest and highest point of each of n_out / 2 buckets,
+    plus the first and last point.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    buckets = np.repeat(np.arange(n_out // 2), np.diff(np.linspace(0, n, n_out // 2 + 1).astype(np.int64)))
+    grouped = pd.Series(np.asarray(y, dtype=np.float64)).groupby(buckets)
+    return np.unique(np.concatenate([[0, n - 1], grouped.idxmin().to_numpy(), grouped.idxmax().to_numpy()]))
+
+
+def _positions(index: pd.Index) -> np.ndarray:
+    # Numeric x for the triangle areas: timestamps / numbers as they are, labels by position
+    if isinstance(index, pd.DatetimeIndex):
+        return index.asi8.astype(np.float64)
+    if pd.api.types.is_numeric_dtype(index):
+        return index.to_numpy(dtype=np.float64)
+    return np.arange(len(index), dtype=np.float64)
+
+
+def select_indices(series: pd.Series, n_out: int = DEFAULT_POINTS, method: str = 'lttb') -> np.ndarray:
+    """
+    Positions of the points of `series` to draw (its non-null points, reduced to about n_out).
+    """
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"Unsupported downsampling method: {method}")
+    valid = np.flatnonzero(series.notna().to_numpy())
+    values = series.to_numpy(dtype=np.float64)[valid]
+    if method == 'lttb':
+        keep = lttb_indices(_positions(series.index)[valid], values, n_out)
+    else:
+        keep = minmax_indices(values, n_out)
+    return valid[keep]
+
+
+# ==================================================================================
+# Block 2: Downsampling Plot Data
+# ==================================================================================
+@memoize()
+def downsample_columns(wide: pd.DataFrame, n_out: int = DEFAULT_POINTS, method: str = 'lttb') -> dict:
+    """
+    Reduces every column of a wide (x index, one column per line) table to about n_out points.
+
+    Columns of a datetime or numeric index are thinned independently (null points
+    dropped). With label (e.g. month name) indices every column keeps the union of
+    the selected rows, so all lines share the same categorical x positions.
+    Tables with at most n_out rows are returned as they are.
+
+    Returns:
+        dict: {column: pd.Series} in column order.
+    """
+    if len(wide) <= n_out:
+        return {col: wide[col] for col in wide.columns}
+    selections = {col: select_indices(wide[col], n_out, method) for col in wide.columns}
+    if not (isinstance(wide.index, pd.DatetimeIndex) or pd.api.types.is_numeric_dtype(wide.index)):
+        shared = np.unique(np.concatenate(list(selections.values()))) if selections else np.array([], dtype=np.int64)
+        return {col: wide[col].iloc[shared] for col in wide.columns}
+    return {col: wide[col].iloc[keep] for col, keep in selections.items()}
@@ -0,0 +1,180 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from core.cache import dataset_token
+
+# This module materializes the derived columns used across the plots.
+# Each feature is declared once in FEATURE_REGISTRY (inputs + compute function)
+# and stored with a compact dtype. The loaded dataset stays raw, so the derived
+# columns never show up in the pages' column lists and selectors. Instead the
+# loader calls prepare_features, which computes every feature once for the
+# whole dataset into a separate frame kept under the dataset's loader token.
+# The plot and aggregate helpers call ensure_features: for any slice of that
+# dataset it takes the features by row label and attaches them to a shallow
+# copy. Frames from elsewhere get their features computed directly.
+
+# ---------------------------------------------------------
+# FEATURE BINS
+# ---------------------------------------------------------
+AGE_BINS = [0, 25, 35, 45, 60, 100]
+AGE_LABELS = ["18-25", "26-35", "36-45", "46-60", "60+"]
+ALCOHOL_BINS = [0, 0.03, 0.08, 0.15, 0.25]   # Upper edge is extended to the dataset maximum
+ALCOHOL_LABELS = ['Safe', 'Mild', 'Risky', 'High Risk', 'Dangerous']
+FEATURE_FRAME_SLOTS = 4      # Loaded datasets whose feature frames are kept
+FEATURE_CHECK_ROWS = 64      # Rows recomputed to confirm a slice still lines up with its dataset
+
+
+# ==================================================================================
+# Block 1: Feature Definitions
+# ==================================================================================
+def _compact_numeric(values: pd.Series) -> pd.Series:
+    """
+    Downcasts to the smallest integer dtype (or float32 when there are nulls/fractions).
+    """
+    values = pd.to_numeric(values, errors='coerce')
+    if values.notna().all() and np.array_equal(values, np.round(values)):
+        return pd.to_numeric(values.astype(np.int64), downcast='integer')
+    return values.astype(np.float32)
+
+
+def _speed_exceeded(df: pd.DataFrame) -> pd.Series:
+    # Negative values mean the driver was under the limit
+    return _compact_numeric(pd.to_numeric(df['Recorded_Speed'], errors='coerce') - pd.to_numeric(df['Speed_Limit'], errors='coerce'))
+
+
+def _age_group(df: pd.DataFrame) -> pd.Series:
+    return pd.cut(pd.to_numeric(df['Driver_Age'], errors='coerce'), bins=AGE_BINS, labels=AGE_LABELS, include_lowest=True)
+
+
+def _alcohol_range(df: pd.DataFrame) -> pd.Series:
+    alcohol = pd.to_numeric(df['Alcohol_Level'], errors='coerce')
+    upper = max(0.251, alcohol.max()) if alcohol.notna().any() else 0.251
+    return pd.cut(alcohol, bins=ALCOHOL_BINS + [upper], labels=ALCOHOL_LABELS, include_lowest=True)
+
+
+def _alcohol_flag(df: pd.DataFrame) -> pd.Series:
+    return (df['Breathalyzer_Result'] == "Positive").astype(np.int8)
+
+
+def _risk_level(df: pd.DataFrame) -> pd.Series:
+    return _compact_numeric(pd.to_numeric(df['Previous_Violations'], errors='coerce') + df['Alcohol_Flag'])
+
+
+# Order matters: a feature may require a feature declared above it
+FEATURE_REGISTRY = {
+    'Speed_Exceeded': {'requires': ['Recorded_Speed', 'Speed_Limit'], 'compute': _speed_exceeded},
+    'Age_Group': {'requires': ['Driver_Age'], 'compute': _age_group},
+    'Alcohol_Range': {'requires': ['Alcohol_Level'], 'compute': _alcohol_range},
+    'Alcohol_Flag': {'requires': ['Breathalyzer_Result'], 'compute': _alcohol_flag},
+    'Risk_Level': {'requires': ['Previous_Violations', 'Alcohol_Flag'], 'compute': _risk_level},
+}
+FEATURE_COLUMNS = list(FEATURE_REGISTRY)
+
+
+# ==================================================================================
+# Block 2: Materialization
+# ==================================================================================
+def _resolve(names) -> list:
+    """
+    Returns the requested features plus the features they depend on, in registry order.
+    """
+    wanted = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name in wanted:
+            continue
+        if name not in FEATURE_REGISTRY:
+            raise KeyError(f"Unknown feature: {name}")
+        wanted.add(name)
+        pending.extend(req for req in FEATURE_REGISTRY[name]['requires'] if req in FEATURE_REGISTRY)
+    return [name for name in FEATURE_COLUMNS if name in wanted]
+
+
+def _materialize(df: pd.DataFrame, names=None) -> pd.DataFrame:
+    """
+    Adds the registered features to df (in place) and returns it.
+    Features whose input columns are missing are skipped; existing columns are kept.
+    """
+    for name in _resolve(FEATURE_COLUMNS if names is None else names):
+        if name in df.columns:
+            continue
+        spec = FEATURE_REGISTRY[name]
+        if all(col in df.columns for col in spec['requires']):
+            df[name] = spec['compute'](df)
+    return df
+
+
+def _computed(df: pd.DataFrame, names) -> pd.DataFrame:
+    derived = _materialize(df.copy(deep=False), names)
+    return derived[[name for name in names if name in derived.columns]]
+
+
+# ==================================================================================
+# Block 3: Per-Dataset Feature Frames
+# ==================================================================================
+_FEATURE_FRAMES = OrderedDict()   # loader token -> features of the whole loaded dataset
+_FEATURE_LOCK = threading.Lock()
+
+
+def prepare_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Computes every feature once for a freshly loaded dataset tagged by its loader
+    (core.cache.tag_dataset). Cheap when the dataset was already prepared. Returns df.
+    """
+    token = dataset_token(df)
+    if token is None:
+        return df
+    with _FEATURE_LOCK:
+        if token in _FEATURE_FRAMES:
+            _FEATURE_FRAMES.move_to_end(token)
+            return df
+    frame = _computed(df, FEATURE_COLUMNS)
+    with _FEATURE_LOCK:
+        _FEATURE_FRAMES[token] = frame
+        while len(_FEATURE_FRAMES) > FEATURE_FRAME_SLOTS:
+            _FEATURE_FRAMES.popitem(last=False)
+    return df
+
+
+def _prepared(df: pd.DataFrame, names):
+    """
+    The prepared features of df's rows, or None when df is not a slice of a prepared dataset.
+    """
+    token = dataset_token(df)
+    with _FEATURE_LOCK:
+        frame = _FEATURE_FRAMES.get(token) if token is not None else None
+    if frame is None or not all(name in frame.columns for name in names):
+        return None
+    try:
+        derived = frame.loc[df.index, list(names)]
+    except (KeyError, TypeError):
+        return None
+    # Guard against re-indexed slices or rewritten input columns: recompute a few rows and compare
+    positions = np.unique(np.linspace(0, len(df) - 1, min(len(df), FEATURE_CHECK_ROWS)).astype(np.int64))
+    if len(positions):
+        expected = _computed(df.iloc[positions], names)
+        if list(expected.columns) != list(names):
+            return None
+        for name in names:
+            if not np.array_equal(expected[name].astype(str).to_numpy(), derived[name].iloc[positions].astype(str).to_numpy()):
+                return None
+    return derived
+
+
+def ensure_features(df: pd.DataFrame, names) -> pd.DataFrame:
+    """
+    Returns df unchanged when every requested feature is present; otherwise a
+    shallow copy with the missing features added (the caller's frame is not modified).
+    """
+    missing = [name for name in names if name not in df.columns]
+    if not missing:
+        return df
+    derived = _prepared(df, missing)
+    if derived is None:
+        derived = _computed(df, missing)
+    df = df.copy(deep=False)
+    for name in derived.columns:
+        df[name] = derived[name].values
+    return df
@@ -0,0 +1,264 @@
+import os
+import types
+import hashlib
+import inspect
+import functools
+import threading
+from collections import OrderedDict
+import streamlit as st
+from core.cache import normalize_key
+from core import plot_style
+from core import image_pipeline
+from core import vega_plot
+
+# This module caches rendered figures as image bytes.
+# A figure is addressed by (plot function + its code, dataset fingerprint,
+# remaining arguments, Streamlit theme, image profile). On a hit the plot
+# function is not called and nothing is rasterized: the stored bytes go
+# straight to st.image. Figures are encoded by core/image_pipeline.py with the
+# profile of the context they are shown in ('page', 'column', ...). Entries live in a byte-bounded in-memory LRU and,
+# optionally, in a directory on disk that survives server restarts.
+
+# ---------------------------------------------------------
+# FIGURE CACHE CONFIGURATION
+# ---------------------------------------------------------
+FIGURE_CACHE_BYTES = 128 * 1024 * 1024                   # In-memory budget for image bytes
+FIGURE_CACHE_DIR = os.environ.get('FIGURE_CACHE_DIR')     # Set to persist rendered figures on disk
+FIGURE_CACHE_DISK_BYTES = 512 * 1024 * 1024
+
+
+# ==================================================================================
+# Block 1: Figure Keys
+# ==================================================================================
+def _function_token(func) -> tuple:
+    """
+    Identifies a plot function by name and code, so an edited function never
+    serves images rendered by its previous version.
+    """
+    if isinstance(func, functools.partial):
+        return ('__partial__', _function_token(func.func), normalize_key(func.args), normalize_key(func.keywords))
+    # Decorators such as plot_style.styled share one wrapper; the wrapped function's code is what changes
+    code = getattr(inspect.unwrap(func), '__code__', None)
+    digest = None
+    if code is not None:
+        hasher = hashlib.blake2b(digest_size=8)
+        _hash_code(code, hasher)
+        digest = hasher.hexdigest()
+    return (getattr(func, '__module__', None), getattr(func, '__qualname__', repr(func)), digest)
+
+
+def _hash_code(code, hasher):
+    # Nested functions, lambdas and comprehensions are code constants; hash them recursively
+    # (their repr holds a memory address, which would change the key on every restart)
+    hasher.update(code.co_code)
+    hasher.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _hash_code(const, hasher)
+        else:
+            hasher.update(repr(const).encode())
+
+
+def figure_key(func, args=(), kwargs=None, theme: str = None, context: str = image_pipeline.DEFAULT_CONTEXT) -> str:
+    """
+    Content address of a rendered figure.
+    """
+    parts = (_function_token(func), normalize_key(tuple(args)), normalize_key(kwargs or {}),
+             theme if theme is not None else plot_style.current_theme(), image_pipeline.profile_token(context))
+    return hashlib.blake2b(repr(parts).encode(), digest_size=20).hexdigest()
+
+
+def render_figure(fig, context: str = image_pipeline.DEFAULT_CONTEXT) -> bytes:
+    """
+    Encodes a figure with the image profile of `context`. The figure is left intact.
+    """
+    return image_pipeline.encode(fig, context)
+
+
+# ==================================================================================
+# Block 2: Byte-Bounded LRU with Optional Disk Store
+# ==================================================================================
+class FigureCache:
+    """
+    Thread-safe LRU of image bytes, bounded by their total size.
+    With a `disk_dir`, entries are also written there (one file per key) and
+    read back on a memory miss; the oldest files are pruned past `disk_bytes`.
+    """
+
+    def __init__(self, max_bytes: int = FIGURE_CACHE_BYTES, disk_dir: str = FIGURE_CACHE_DIR,
+                 disk_bytes: int = FIGURE_CACHE_DISK_BYTES):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_bytes = disk_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0, 'bytes': 0}
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _path(self, key: str, fmt: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.{fmt}")
+
+    def get(self, key: str, fmt: str = 'png'):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return self._entries[key]
+        if self.disk_dir:
+            try:
+                with open(self._path(key, fmt), 'rb') as f:
+                    data = f.read()
+            except OSError:
+                data = None
+            if data is not None:
+                self._remember(key, data)
+                with self._lock:
+                    self.stats['disk_hits'] += 1
+                return data
+        with self._lock:
+            self.stats['misses'] += 1
+        return None
+
+    def put(self, key: str, data: bytes, fmt: str = 'png'):
+        self._remember(key, data)
+        if self.disk_dir:
+            path = self._path(key, fmt)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            try:
+                with open(temp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(temp_path, path)
+                self._prune_disk()
+            except OSError:
+                pass
+
+    def _remember(self, key: str, data: bytes):
+        with self._lock:
+            if key in self._entries or len(data) > self.max_bytes:
+                return
+            self._entries[key] = data
+            self.stats['bytes'] += len(data)
+            while self.stats['bytes'] > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.stats['bytes'] -= len(evicted)
+                self.stats['evictions'] += 1
+
+    def _prune_disk(self):
+        files = []
+        for name in os.listdir(self.disk_dir):
+            path = os.path.join(self.disk_dir, name)
+            if name.endswith('.tmp') or not os.path.isfile(path):
+                continue
+            info = os.stat(path)
+            files.append((info.st_mtime, info.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.stats.update(hits=0, disk_hits=0, misses=0, evictions=0, bytes=0)
+
+    def info(self) -> dict:
+        with self._lock:
+            return dict(self.stats, entries=len(self._entries), max_bytes=self.max_bytes, disk_dir=self.disk_dir)
+
+
+_CACHE = FigureCache()
+
+
+def get_cache() -> FigureCache:
+    return _CACHE
+
+
+# ==================================================================================
+# Block 3: Cached Rendering for Streamlit
+# ==================================================================================
+def figure_bytes(plot_func, *args, context: str = image_pipeline.DEFAULT_CONTEXT, **kwargs):
+    """
+    Returns the rendered image of plot_func(*args, **kwargs), calling it only on a cache miss.
+
+    Returns:
+        bytes | None: None when the plot function returned no figure.
+    """
+    fmt = image_pipeline.image_format(context)
+    key = figure_key(plot_func, args, kwargs, context=context)
+    data = _CACHE.get(key, fmt)
+    if data is None:
+        fig = plot_func(*args, **kwargs)
+        if fig is None:
+            return None
+        try:
+            data = render_figure(fig, context)
+        finally:
+            plot_style.release_figure(fig)
+        _CACHE.put(key, data, fmt)
+    return data
+
+
+def show_plot(plot_func, *args, context: str = image_pipeline.DEFAULT_CONTEXT, backend: str = None, **kwargs) -> bool:
+    """
+    st.image of the cached rendering of plot_func(*args, **kwargs). Returns False if no figure was produced.
+    With the 'vega' backend (by default the one selected in the sidebar), plots that have
+    a Vega-Lite version are sent to the browser as a chart spec instead.
+    """
+    backend = vega_plot.active_backend() if backend is None else backend
+    if backend == 'vega' and vega_plot.has_chart(plot_func):
+        chart = vega_plot.build_chart(plot_func, *args, **kwargs)
+        if chart is None:
+            return False
+        st.altair_chart(chart, width='stretch')
+        return True
+    data = figure_bytes(plot_func, *args, context=context, **kwargs)
+    if data is None:
+        return False
+    _display(data, context)
+    return True
+
+
+def show_figure(fig, *key_parts, context: str = image_pipeline.DEFAULT_CONTEXT):
+    """
+    Shows an already built figure (e.g. one returned inside a memoized summary dict),
+    rasterizing it only the first time the same `key_parts` are seen.
+    """
+    if fig is None:
+        return
+    _display(_held_figure_bytes(lambda: fig, key_parts, context), context)
+
+
+def show_pyplot(fig, context: str = image_pipeline.DEFAULT_CONTEXT):
+    """
+    Drop-in for st.pyplot(fig) that encodes with the image pipeline. Nothing is cached,
+    but an unchanged figure encodes to the same bytes and so keeps its media URL.
+    """
+    _display(render_figure(fig, context), context)
+
+
+def _held_figure_bytes(build, key_parts, context: str = image_pipeline.DEFAULT_CONTEXT):
+    # The figure belongs to whoever built it (usually a memoized result), so it is not released
+    fmt = image_pipeline.image_format(context)
+    key = figure_key(show_figure, key_parts, context=context)
+    data = _CACHE.get(key, fmt)
+    if data is None:
+        fig = build()
+        if fig is None:
+            return None
+        data = render_figure(fig, context)
+        _CACHE.put(key, data, fmt)
+    return data
+
+
+def _display(data: bytes, context: str):
+    # The Streamlit contexts are PNG, which st.image stores as a media file under a content-hash URL
+    if image_pipeline.image_format(context) != 'png':
+        raise ValueError(f"Image context '{context}' is not PNG and cannot be shown with st.image")
+    st.image(data, width='stretch')
+
@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+from core.cache import memoize
+
+# This module detects violation hotspots: (Location, Violation_Type) cells whose
+# count in a period spikes well above their recent history.
+# Every cell keeps an exponentially weighted mean and variance. Each period is
+# scored against the state built from the periods before it and then folded in,
+# so the detector can be fed new rows as they arrive and costs
+# O(locations x types) per period.
+
+# ---------------------------------------------------------
+# HOTSPOT CONFIGURATION
+# ---------------------------------------------------------
+HOTSPOT_ALPHA = 0.05          # EWMA weight of the newest period (~20 period memory)
+HOTSPOT_Z_THRESHOLD = 3.0     # Standard deviations above the expected count
+HOTSPOT_MIN_COUNT = 2         # A single violation is never a hotspot
+HOTSPOT_WARMUP_PERIODS = 8    # Periods observed before alerts are raised
+HOTSPOT_MIN_VARIANCE = 0.25   # Keeps z-scores finite for cells that were always empty
+HOTSPOT_FREQ = 'D'
+HOTSPOT_FREQ_OPTIONS = {'D': "Daily", 'W': "Weekly", 'M': "Monthly"}
+
+
+# ==================================================================================
+# Block 1: Streaming Detector
+# ==================================================================================
+class HotspotDetector:
+    """
+    Incremental EWMA spike detector over a Location x Violation_Type count grid.
+
+    Call update(df) with new rows (in any batch size); periods already processed
+    are skipped, so appending data only scores the new periods.
+    """
+
+    def __init__(self, alpha: float = HOTSPOT_ALPHA, z_threshold: float = HOTSPOT_Z_THRESHOLD,
+                 min_count: int = HOTSPOT_MIN_COUNT, warmup: int = HOTSPOT_WARMUP_PERIODS, freq: str = HOTSPOT_FREQ):
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.min_count = min_count
+        self.warmup = warmup
+        self.freq = freq
+        self.locations = pd.Index([], dtype=object)
+        self.types = pd.Index([], dtype=object)
+        self.mean = np.zeros((0, 0))
+        self.var = np.zeros((0, 0))
+        self.periods_seen = 0
+        self.last_period = None   # Ordinal of the last processed period
+
+    def _grow(self, locations, types):
+        """
+        Adds unseen labels. Existing cells keep their positions and state.
+        """
+        new_locations = pd.Index(locations).difference(self.locations)
+        new_types = pd.Index(types).difference(self.types)
+        if len(new_locations) == 0 and len(new_types) == 0:
+            return
+        self.locations = self.locations.append(new_locations)
+        self.types = self.types.append(new_types)
+        pad = ((0, len(new_locations)), (0, len(new_types)))
+        self.mean = np.pad(self.mean, pad)
+        self.var = np.pad(self.var, pad)
+
+    def step(self, counts: np.ndarray):
+        """
+        Scores one period of counts (locations x types) and folds it into the state.
+
+        Returns:
+            (expected, z_scores, flags) arrays of the same shape as counts.
+        """
+        expected = self.mean.copy()
+        # Counts are roughly Poisson: never trust a variance below the mean
+        std = np.sqrt(np.maximum(np.maximum(self.var, expected), HOTSPOT_MIN_VARIANCE))
+        z_scores = (counts - expected) / std
+        flags = (z_scores >= self.z_threshold) & (counts >= self.min_count) & (self.periods_seen >= self.warmup)
+
+        diff = counts - self.mean
+        increment = self.alpha * diff
+        self.mean += increment
+        self.var = (1 - self.alpha) * (self.var + diff * increment)
+        self.periods_seen += 1
+        return expected, z_scores, flags
+
+    def update(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Feeds new rows and returns the alerts raised for the new periods.
+
+        Rows without a valid Date/Location/Violation_Type, and rows falling in
+        periods that were already processed, are ignored. Periods without any
+        violations between the first and last new period count as zeros.
+
+        Returns:
+            pd.DataFrame: ['Date', 'Location', 'Violation_Type', 'Count', 'Expected', 'Z_Score']
+        """
+        periods = pd.to_datetime(df['Date'], errors='coerce').dt.to_period(self.freq)
+        valid = (periods.notna() & df['Location'].notna() & df['Violation_Type'].notna()).to_numpy()
+        ordinals = periods[valid].array.asi8
+        if self.last_period is not None:
+            fresh = ordinals > self.last_period
+            ordinals = ordinals[fresh]
+            valid[valid] = fresh
+        if len(ordinals) == 0:
+            return _empty_alerts()
+
+        self._grow(df.loc[valid, 'Location'].unique(), df.loc[valid, 'Violation_Type'].unique())
+        loc_codes = self.locations.get_indexer(df.loc[valid, 'Location'])
+        type_codes = self.types.get_indexer(df.loc[valid, 'Violation_Type'])
+
+        # Dense (period x location x type) cube of the new data in one bincount
+        first = ordinals.min() if self.last_period is None else self.last_period + 1
+        n_periods = int(ordinals.max() - first + 1)
+        n_locations, n_types = len(self.locations), len(self.types)
+        key = ((ordinals - first) * n_locations + loc_codes) * n_types + type_codes
+        cube = np.bincount(key, minlength=n_periods * n_locations * n_types).reshape(n_periods, n_locations, n_types)
+
+        alerts = []
+        for offset in range(n_periods):
+            counts = cube[offset].astype(np.float64)
+            expected, z_scores, flags = self.step(counts)
+            if flags.any():
+                rows, cols = np.nonzero(flags)
+                alerts.append(pd.DataFrame({
+                    'Date': pd.Period(ordinal=int(first + offset), freq=self.freq).start_time,
+                    'Location': self.locations[rows],
+                    'Violation_Type': self.types[cols],
+                    'Count': counts[rows, cols].astype(np.int64),
+                    'Expected': expected[rows, cols],
+                    'Z_Score': z_scores[rows, cols],
+                }))
+        self.last_period = int(first + n_periods - 1)
+        return pd.concat(alerts, ignore_index=True) if alerts else _empty_alerts()
+
+    def current_state(self) -> pd.DataFrame:
+        """
+        Expected count and spread per cell after the last processed period.
+        """
+        index = pd.MultiIndex.from_product([self.locations, self.types], names=['Location', 'Violation_Type'])
+        return pd.DataFrame({
+            'Expected': self.mean.ravel(),
+            'Std': np.sqrt(np.maximum(self.var, 0)).ravel(),
+        }, index=index)
+
+
+def _empty_alerts() -> pd.DataFrame:
+    return pd.DataFrame({
+        'Date': pd.Series(dtype='datetime64[ns]'),
+        'Location': pd.Series(dtype=object),
+        'Violation_Type': pd.Series(dtype=object),
+        'Count': pd.Series(dtype=np.int64),
+        'Expected': pd.Series(dtype=np.float64),
+        'Z_Score': pd.Series(dtype=np.float64),
+    })
+
+
+# ==================================================================================
+# Block 2: Dataset-Level Helpers
+# ==================================================================================
+def can_detect(df: pd.DataFrame) -> bool:
+    return all(col in df.columns for col in ['Date', 'Location', 'Violation_Type'])
+
+
+@memoize()
+def detect_hotspots(df: pd.DataFrame, freq: str = HOTSPOT_FREQ, alpha: float = HOTSPOT_ALPHA,
+                    z_threshold: float = HOTSPOT_Z_THRESHOLD, min_count: int = HOTSPOT_MIN_COUNT) -> pd.DataFrame:
+    """
+    Runs a fresh detector over the whole dataset and returns every alert, strongest first.
+    """
+    detector = HotspotDetector(alpha=alpha, z_threshold=z_threshold, min_count=min_count, freq=freq)
+    alerts = detector.update(df)
+    return alerts.sort_values(['Date', 'Z_Score'], ascending=[False, False], ignore_index=True)
+
+
+def hotspot_summary(alerts: pd.DataFrame) -> pd.DataFrame:
+    """
+    Alerts per Location with the most frequently flagged violation type.
+    """
+    if alerts.empty:
+        return pd.DataFrame(columns=['Location', 'Hotspot_Alerts', 'Top_Violation_Type', 'Max_Z_Score'])
+    summary = alerts.groupby('Location').agg(
+        Hotspot_Alerts=('Z_Score', 'size'),
+        Top_Violation_Type=('Violation_Type', lambda s: s.value_counts().index[0]),
+        Max_Z_Score=('Z_Score', 'max'),
+    ).reset_index()
+    return summary.sort_values('Hotspot_Alerts', ascending=False, ignore_index=True)
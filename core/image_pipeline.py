@@ -0,0 +1,124 @@
+import io
+import matplotlib as mpl
+from PIL import Image
+from core import plot_style
+
+# This module turns matplotlib figures into the image bytes sent to the browser.
+# Each display context (full-width page plot, plot in a column, report file)
+# has a profile: output format, resolution and the widest image worth sending.
+# The resolution is lowered so an image is never wider than its context can
+# show; the layout is unchanged (fonts and lines scale with the figure), the
+# image simply has fewer pixels. st.image itself rescales and re-encodes
+# anything wider than its content width, so staying below that width also
+# means the bytes encoded here reach the browser untouched.
+#
+# PNGs can be quantized to a palette (charts have few distinct colours).
+# Encoding is deterministic: the same figure always gives the same bytes, so
+# Streamlit registers it under the same media URL. A rerun then sends only that
+# URL again; whether the browser refetches the image depends on its HTTP cache.
+#
+# The Streamlit contexts are always PNG. st.image transcodes WebP bytes to
+# PNG/JPEG, and SVG or data: URLs are inlined into the page message and resent
+# on every rerun, so neither would save anything there. WebP and SVG are for
+# profiles whose output is written to files.
+
+# ---------------------------------------------------------
+# IMAGE PIPELINE CONFIGURATION
+# ---------------------------------------------------------
+IMAGE_FORMATS = ('png', 'webp', 'svg')
+STREAMLIT_MAX_WIDTH_PX = 1460                      # st.image rescales and re-encodes wider images
+WEBP_QUALITY = 90                                  # Used when a profile asks for lossy WebP
+SAVE_KWARGS = {'bbox_inches': 'tight'}
+SVG_HASH_SALT = 'traffic-violations'               # Fixed SVG element ids, so SVG bytes are stable too
+
+IMAGE_PROFILES = {
+    # Full-width plots on the analysis pages
+    'page': {'fmt': 'png', 'dpi': 200, 'max_width_px': STREAMLIT_MAX_WIDTH_PX,
+             'colors': 256, 'lossless': True},
+    # Plots laid out in st.columns (dashboard summaries, Know Your Data)
+    'column': {'fmt': 'png', 'dpi': 200, 'max_width_px': 900,
+               'colors': 256, 'lossless': True},
+    # Standalone report files (core/report.py): full-colour PNG
+    'report': {'fmt': 'png', 'dpi': 150, 'max_width_px': 2400, 'colors': None, 'lossless': True},
+}
+DEFAULT_CONTEXT = 'page'
+
+
+# ==================================================================================
+# Block 1: Profiles
+# ==================================================================================
+def profile(context: str = DEFAULT_CONTEXT) -> dict:
+    """
+    The encoding settings of a display context (see IMAGE_PROFILES).
+    """
+    try:
+        settings = IMAGE_PROFILES[context]
+    except KeyError:
+        raise ValueError(f"Unknown image context: {context}") from None
+    if settings['fmt'] not in IMAGE_FORMATS:
+        raise ValueError(f"Unsupported image format: {settings['fmt']}")
+    return settings
+
+
+def profile_token(context: str = DEFAULT_CONTEXT) -> tuple:
+    """
+    Everything about a context that changes its bytes, for cache keys.
+    """
+    return (context,) + tuple(sorted(profile(context).items()))
+
+
+def image_format(context: str = DEFAULT_CONTEXT) -> str:
+    return profile(context)['fmt']
+
+
+# ==================================================================================
+# Block 2: Encoding
+# ==================================================================================
+def _save(fig, fmt: str, dpi: float) -> bytes:
+    buffer = io.BytesIO()
+    # Some artists read rcParams while drawing, so no style may be swapped in meanwhile
+    with plot_style.style_lock():
+        if fmt == 'svg':
+            with mpl.rc_context({'svg.hashsalt': SVG_HASH_SALT}):
+                fig.savefig(buffer, format='svg', dpi=dpi, metadata={'Date': None}, **SAVE_KWARGS)
+        else:
+            fig.savefig(buffer, format='png', dpi=dpi, metadata={'Software': None}, **SAVE_KWARGS)
+    return buffer.getvalue()
+
+
+def _raster(fig, settings: dict) -> bytes:
+    """
+    The figure as a PNG at the profile's resolution, at most max_width_px wide.
+    """
+    max_width = settings['max_width_px']
+    dpi = settings['dpi'] if not max_width else min(settings['dpi'], max_width / fig.get_figwidth())
+    data = _save(fig, 'png', dpi)
+    width = Image.open(io.BytesIO(data)).width
+    if max_width and width > max_width:
+        # The tight bounding box grew past the figure (e.g. a legend placed outside the axes)
+        data = _save(fig, 'png', dpi * max_width / width)
+    return data
+
+
+def encode(fig, context: str = DEFAULT_CONTEXT) -> bytes:
+    """
+    Encodes a figure with the profile of `context`. The figure is left intact.
+
+    Returns:
+        bytes: PNG or WebP image data, or UTF-8 SVG markup.
+    """
+    settings = profile(context)
+    if settings['fmt'] == 'svg':
+        return _save(fig, 'svg', settings['dpi'])
+
+    data = _raster(fig, settings)
+    if settings['fmt'] == 'png' and not settings['colors']:
+        return data
+    image = Image.open(io.BytesIO(data))
+    buffer = io.BytesIO()
+    if settings['fmt'] == 'webp':
+        image.save(buffer, format='WEBP', lossless=settings['lossless'], quality=WEBP_QUALITY, method=6)
+    else:
+        # Fast octree is the quantizer that handles RGBA; it is deterministic
+        image.quantize(settings['colors'], method=Image.Quantize.FASTOCTREE).save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
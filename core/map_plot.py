@@ -1,6 +1,8 @@
 import streamlit as st
 import json
 import folium
+from matplotlib import colormaps
+from matplotlib.colors import to_hex
 
 @st.cache_data
 def load_geojson(file_path="map_data/01_INDIA_STATES.geojson"):
@@ -73,3 +75,50 @@ def plot_choropleth_map(map_data, geojson_data, location_col, value_col, state_p
     ).add_to(choropleth.geojson)
 
     return m
+
+
+def category_colors(categories, palette="Set2"):
+    """
+    One distinct colour per category, taken in order from a qualitative matplotlib palette.
+    Returns:
+        dict: {category: hex colour}
+    """
+    colors = [to_hex(c) for c in colormaps[palette].colors]
+    return {category: colors[i % len(colors)] for i, category in enumerate(categories)}
+
+
+def plot_category_map(map_data, geojson_data, location_col, category_col, state_prop_name="STNAME_SH", colors=None):
+    """
+    Generates a Folium map that fills every state with the colour of its category
+    (e.g. a cluster ID) instead of a binned continuous scale.
+    """
+    map_data[location_col] = map_data[location_col].astype(str).str.lower()
+    val_dict = map_data.set_index(location_col)[category_col].to_dict()
+    if colors is None:
+        colors = category_colors(sorted(set(val_dict.values())))
+
+    for feature in geojson_data['features']:
+        st_name_lower = feature['properties'][state_prop_name].lower()
+        feature['properties']['st_nm_lower'] = st_name_lower
+        val = val_dict.get(st_name_lower)
+        feature['properties'][category_col] = "N/A" if val is None else str(val)
+
+    def style(feature):
+        color = colors.get(val_dict.get(feature['properties']['st_nm_lower']))
+        if color is None:
+            return {'fillColor': 'gray', 'fillOpacity': 0.4, 'color': 'black', 'weight': 1, 'opacity': 0.5}
+        return {'fillColor': color, 'fillOpacity': 0.7, 'color': 'black', 'weight': 1, 'opacity': 0.5}
+
+    m = folium.Map(location=[22, 82], zoom_start=4, tiles="CartoDB positron")
+    folium.GeoJson(
+        geojson_data,
+        style_function=style,
+        tooltip=folium.features.GeoJsonTooltip(
+            fields=[state_prop_name, category_col],
+            aliases=['State:', f'{category_col}:'],
+            sticky=False,
+            labels=True,
+            max_width=800,
+        ),
+    ).add_to(m)
+    return m
@@ -0,0 +1,132 @@
+import heapq
+import numpy as np
+import pandas as pd
+from core.cache import memoize
+
+# This module provides officer and agency workload analytics.
+# A per-officer aggregate table is computed once per dataset (integer codes +
+# bincount, no per-interaction groupby); rankings are then read from it with
+# bounded top-K heaps and agency comparisons roll the officer table up further.
+
+# ---------------------------------------------------------
+# OFFICER ANALYTICS CONFIGURATION
+# ---------------------------------------------------------
+TOP_K_OFFICERS = 10
+OFFICER_METRICS = {
+    'Violations': "Total Violations",
+    'Violations_Per_Day': "Violations per Active Day",
+    'Total_Fines': "Total Fines Issued (Rs.)",
+    'Fines_Collected': "Fines Collected (Rs.)",
+    'Collection_Rate': "Fine Collection Rate (%)",
+}
+
+
+# ==================================================================================
+# Block 1: Per-Officer Aggregate Table
+# ==================================================================================
+def can_analyze(df: pd.DataFrame) -> bool:
+    return 'Officer_ID' in df.columns
+
+
+@memoize()
+def build_officer_table(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aggregates the dataset to one row per officer.
+
+    Returns:
+        pd.DataFrame: Indexed by Officer_ID with 'Issuing_Agency', 'Violations', 'Active_Days',
+        'Violations_Per_Day', 'Total_Fines', 'Fines_Collected', 'Collection_Rate' (%),
+        'First_Seen' and 'Last_Seen' (columns whose inputs are missing are left out).
+    """
+    valid = df['Officer_ID'].notna().to_numpy()
+    data = df if valid.all() else df[valid]
+    codes, officers = pd.factorize(data['Officer_ID'], sort=True)
+    n_officers = len(officers)
+
+    table = pd.DataFrame(index=pd.Index(officers, name='Officer_ID'))
+    if 'Issuing_Agency' in data.columns:
+        # An officer belongs to the agency that issued most of their violations
+        agency_codes, agencies = pd.factorize(data['Issuing_Agency'])
+        has_agency = agency_codes >= 0
+        pair_counts = np.bincount(codes[has_agency] * len(agencies) + agency_codes[has_agency],
+                                  minlength=n_officers * len(agencies)).reshape(n_officers, len(agencies))
+        main_agency = np.asarray(agencies, dtype=object)[pair_counts.argmax(axis=1)] if len(agencies) else np.full(n_officers, None)
+        table['Issuing_Agency'] = np.where(pair_counts.sum(axis=1) > 0, main_agency, None)
+
+    violations = np.bincount(codes, minlength=n_officers)
+    table['Violations'] = violations
+
+    if 'Date' in data.columns:
+        dates = pd.to_datetime(data['Date'], errors='coerce')
+        day_numbers = dates.to_numpy(dtype='datetime64[D]').astype(np.int64)
+        has_date = dates.notna().to_numpy()
+        # Distinct (officer, day) pairs -> active days per officer
+        day_offsets = day_numbers[has_date] - (day_numbers[has_date].min() if has_date.any() else 0)
+        n_day_slots = int(day_offsets.max()) + 1 if has_date.any() else 1
+        officer_days = np.unique(codes[has_date].astype(np.int64) * n_day_slots + day_offsets)
+        active_days = np.bincount(officer_days // n_day_slots, minlength=n_officers)
+        table['Active_Days'] = active_days
+        with np.errstate(invalid='ignore', divide='ignore'):
+            table['Violations_Per_Day'] = np.where(active_days > 0, violations / active_days, np.nan)
+        first_last = dates.groupby(codes).agg(['min', 'max'])
+        table['First_Seen'] = first_last['min'].reindex(range(n_officers)).to_numpy()
+        table['Last_Seen'] = first_last['max'].reindex(range(n_officers)).to_numpy()
+
+    if 'Fine_Amount' in data.columns:
+        fines = pd.to_numeric(data['Fine_Amount'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+        total_fines = np.bincount(codes, weights=fines, minlength=n_officers)
+        table['Total_Fines'] = total_fines
+        if 'Fine_Paid' in data.columns:
+            paid = (data['Fine_Paid'].astype(str).str.lower() == 'yes').to_numpy()
+            collected = np.bincount(codes, weights=fines * paid, minlength=n_officers)
+            table['Fines_Collected'] = collected
+            with np.errstate(invalid='ignore', divide='ignore'):
+                table['Collection_Rate'] = np.where(total_fines > 0, collected / total_fines * 100, np.nan)
+
+    return table
+
+
+# ==================================================================================
+# Block 2: Rankings & Agency Comparison
+# ==================================================================================
+def top_k_officers(officer_table: pd.DataFrame, metric: str = 'Violations', k: int = TOP_K_OFFICERS,
+                   largest: bool = True, min_violations: int = 1) -> pd.DataFrame:
+    """
+    Returns the k officers with the largest (or smallest) `metric`.
+
+    A bounded heap keeps only k candidates while scanning, so the cost is
+    O(officers * log k) instead of sorting the whole table.
+    """
+    if metric not in officer_table.columns:
+        raise KeyError(f"Unknown officer metric: {metric}")
+    eligible = officer_table[officer_table['Violations'] >= min_violations]
+    values = eligible[metric].to_numpy(dtype=np.float64)
+    positions = np.flatnonzero(~np.isnan(values))
+
+    select = heapq.nlargest if largest else heapq.nsmallest
+    best = select(k, positions, key=values.__getitem__)
+    return eligible.iloc[best]
+
+
+def agency_comparison(officer_table: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rolls the officer table up to one row per agency.
+    """
+    if 'Issuing_Agency' not in officer_table.columns:
+        return pd.DataFrame()
+
+    aggregations = {'Officers': ('Violations', 'size'), 'Violations': ('Violations', 'sum')}
+    if 'Active_Days' in officer_table.columns:
+        aggregations['Officer_Days'] = ('Active_Days', 'sum')
+    if 'Total_Fines' in officer_table.columns:
+        aggregations['Total_Fines'] = ('Total_Fines', 'sum')
+    if 'Fines_Collected' in officer_table.columns:
+        aggregations['Fines_Collected'] = ('Fines_Collected', 'sum')
+
+    agencies = officer_table.groupby('Issuing_Agency').agg(**aggregations)
+    agencies['Violations_Per_Officer'] = agencies['Violations'] / agencies['Officers']
+    if 'Officer_Days' in agencies.columns:
+        agencies['Violations_Per_Officer_Day'] = agencies['Violations'] / agencies['Officer_Days']
+    if 'Fines_Collected' in agencies.columns:
+        agencies['Collection_Rate'] = agencies['Fines_Collected'] / agencies['Total_Fines'] * 100
+    return agencies.sort_values('Violations', ascending=False).reset_index()
@@ -0,0 +1,301 @@
+import os
+import atexit
+import threading
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+
+# This module runs heavy group-by aggregations on a process pool.
+# The group keys are factorized once in the parent, the key codes and the
+# value columns are placed in shared memory, and every worker aggregates its
+# own slice of the rows without receiving a pickled copy of the dataset.
+#
+# - Decomposable functions (count, sum, mean, min, max, std, var, size) are
+#   computed per DATE RANGE partition and the partial results are merged.
+# - Non-decomposable functions (median, nunique, ...) are computed per GROUP
+#   shard (key code modulo the number of workers), so every group is seen
+#   whole by exactly one worker and the result is exact.
+
+# ---------------------------------------------------------
+# EXECUTOR CONFIGURATION
+# ---------------------------------------------------------
+PARALLEL_MIN_ROWS = 500_000      # Below this, plain pandas is faster than the pool start-up
+PARALLEL_MAX_WORKERS = os.cpu_count() or 1
+DECOMPOSABLE_FUNCS = {'count', 'sum', 'mean', 'min', 'max', 'std', 'var', 'size'}
+SHARDED_FUNCS = {'median', 'nunique', 'first', 'last', 'prod', 'sem'}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # 'spawn' keeps workers independent of the (multi-threaded) Streamlit server process
+            _executor = ProcessPoolExecutor(max_workers=PARALLEL_MAX_WORKERS, mp_context=mp.get_context('spawn'))
+            atexit.register(_executor.shutdown, wait=False, cancel_futures=True)
+        return _executor
+
+
+# ==================================================================================
+# Block 1: Shared Memory Helpers
+# ==================================================================================
+def _to_shared(array: np.ndarray, blocks: list) -> tuple:
+    array = np.ascontiguousarray(array)
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+    blocks.append(shm)
+    return (shm.name, array.dtype.str, array.shape)
+
+
+def _attach(spec: tuple, handles: list) -> np.ndarray:
+    name, dtype, shape = spec
+    # Spawned workers share the parent's resource tracker, so attaching here does
+    # not create a second owner; the parent unlinks every block when the job ends.
+    shm = shared_memory.SharedMemory(name=name)
+    handles.append(shm)
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+# ==================================================================================
+# Block 2: Worker
+# ==================================================================================
+def _aggregate_task(task: dict) -> pd.DataFrame:
+    """
+    Runs in a worker process. Aggregates the rows selected by the task.
+    """
+    handles = []
+    try:
+        codes = _attach(task['codes'], handles)
+        if task['mode'] == 'date':
+            mask = codes >= 0
+            if task['dates'] is not None:
+                dates = _attach(task['dates'], handles)
+                in_range = (dates >= task['lo']) & (dates < task['hi'])
+                if task['include_nat']:
+                    in_range |= dates == np.iinfo(np.int64).min
+                mask &= in_range
+            else:
+                row_mask = np.zeros(len(codes), dtype=bool)
+                row_mask[task['lo']:task['hi']] = True
+                mask &= row_mask
+        else:
+            mask = (codes >= 0) & (codes % task['n_shards'] == task['shard'])
+
+        keys = codes[mask]
+        frame = pd.DataFrame({col: _attach(spec, handles)[mask] for col, spec in task['values'].items()},
+                             index=pd.RangeIndex(len(keys)))
+
+        if task['mode'] == 'date':
+            return _partial_aggregates(frame, keys, task['agg_dict'])
+        result = frame.groupby(keys).agg(task['agg_dict']) if task['agg_dict'] else pd.DataFrame(index=np.unique(keys))
+        if task['size']:
+            result[('__size__', 'size')] = pd.Series(keys).value_counts()
+        return result
+    finally:
+        for shm in handles:
+            shm.close()
+
+
+def _partial_aggregates(frame: pd.DataFrame, keys: np.ndarray, agg_dict: dict) -> pd.DataFrame:
+    """
+    Per-partition partial state: count, sum, min, max and the sum of squared
+    deviations (M2) per value column, plus the row count per group.
+    """
+    partials = {('__size__', 'n'): pd.Series(keys).value_counts()}
+    grouped = frame.groupby(keys)
+    for col, funcs in agg_dict.items():
+        funcs = set(funcs)
+        count = grouped[col].count()
+        partials[(col, 'count')] = count
+        if funcs & {'sum', 'mean', 'std', 'var'}:
+            partials[(col, 'sum')] = grouped[col].sum()
+        if funcs & {'std', 'var'}:
+            partials[(col, 'm2')] = grouped[col].var(ddof=0) * count
+        if 'min' in funcs:
+            partials[(col, 'min')] = grouped[col].min()
+        if 'max' in funcs:
+            partials[(col, 'max')] = grouped[col].max()
+    return pd.DataFrame(partials)
+
+
+# ==================================================================================
+# Block 3: Merge
+# ==================================================================================
+def _merge_partials(partials: pd.DataFrame, agg_dict: dict, want_size: bool) -> pd.DataFrame:
+    keys = partials.index.to_numpy()
+
+    def combine(column, how):
+        return getattr(partials[column].groupby(keys), how)()
+
+    merged = {}
+    for col, funcs in agg_dict.items():
+        count = combine((col, 'count'), 'sum')
+        if (col, 'sum') in partials.columns:
+            total = combine((col, 'sum'), 'sum')
+            mean = total / count.where(count > 0)
+        if (col, 'm2') in partials.columns:
+            # Chan et al. parallel variance: M2 = sum(M2_i + n_i * (mean_i - mean)^2)
+            part_mean = partials[(col, 'sum')] / partials[(col, 'count')].where(partials[(col, 'count')] > 0)
+            shift = (part_mean - mean.reindex(keys).to_numpy()) ** 2 * partials[(col, 'count')]
+            m2 = (partials[(col, 'm2')].fillna(0) + shift.fillna(0)).groupby(keys).sum()
+            var = m2 / (count - 1).where(count > 1)
+        for func in funcs:
+            if func == 'count':
+                merged[(col, func)] = count
+            elif func == 'sum':
+                merged[(col, func)] = total
+            elif func == 'mean':
+                merged[(col, func)] = mean
+            elif func == 'var':
+                merged[(col, func)] = var
+            elif func == 'std':
+                merged[(col, func)] = np.sqrt(var)
+            elif func == 'min':
+                merged[(col, func)] = combine((col, 'min'), 'min')
+            elif func == 'max':
+                merged[(col, func)] = combine((col, 'max'), 'max')
+            elif func == 'size':
+                merged[(col, func)] = combine(('__size__', 'n'), 'sum')
+    if want_size:
+        merged[('__size__', 'size')] = combine(('__size__', 'n'), 'sum')
+    return pd.DataFrame(merged)
+
+
+# ==================================================================================
+# Block 4: Public API
+# ==================================================================================
+def _factorize_groups(df: pd.DataFrame, group_cols: list):
+    codes_list, uniques_list = [], []
+    for col in group_cols:
+        codes, uniques = pd.factorize(df[col], sort=True)
+        codes_list.append(codes.astype(np.int64))
+        uniques_list.append(uniques)
+
+    dims = [max(len(u), 1) for u in uniques_list]
+    if np.prod([float(d) for d in dims]) >= 2 ** 62:
+        return None, None, None
+    valid = np.logical_and.reduce([c >= 0 for c in codes_list])
+    combined = np.ravel_multi_index([np.where(valid, c, 0) for c in codes_list], dims)
+    combined = np.where(valid, combined, -1).astype(np.int64)
+    return combined, uniques_list, dims
+
+
+def _build_index(codes: np.ndarray, group_cols: list, uniques_list: list, dims: list) -> pd.Index:
+    positions = np.unravel_index(codes, dims)
+    if len(group_cols) == 1:
+        return pd.Index(uniques_list[0].take(positions[0]), name=group_cols[0])
+    return pd.MultiIndex.from_arrays([u.take(p) for u, p in zip(uniques_list, positions)], names=group_cols)
+
+
+def _use_pandas(df: pd.DataFrame, agg_dict: dict, min_rows: int) -> bool:
+    if len(df) < min_rows or PARALLEL_MAX_WORKERS < 2:
+        return True
+    known = DECOMPOSABLE_FUNCS | SHARDED_FUNCS
+    for col, funcs in agg_dict.items():
+        if not pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_bool_dtype(df[col]):
+            return True
+        if not all(isinstance(f, str) and f in known for f in funcs):
+            return True
+    return False
+
+
+def parallel_groupby_agg(df: pd.DataFrame, group_cols: list, agg_dict: dict, date_col: str = 'Date',
+                         n_workers: int = None, min_rows: int = PARALLEL_MIN_ROWS) -> pd.DataFrame:
+    """
+    Equivalent of `df.groupby(group_cols).agg(agg_dict)` run on a process pool.
+
+    Args:
+        df (pd.DataFrame): The data.
+        group_cols (list): Grouping columns.
+        agg_dict (dict): {value_col: [func names]}; 'size' may be requested via {'__size__': ['size']}.
+        date_col (str): Column used to split the rows into date-range partitions.
+        n_workers (int): Number of partitions/workers (defaults to PARALLEL_MAX_WORKERS).
+        min_rows (int): Smaller inputs are aggregated in-process with pandas.
+
+    Returns:
+        pd.DataFrame: Indexed by the group keys (sorted), with (value_col, func) MultiIndex columns.
+    """
+    agg_dict = {col: list(funcs) if isinstance(funcs, (list, tuple)) else [funcs] for col, funcs in agg_dict.items()}
+    want_size = '__size__' in agg_dict
+    value_aggs = {col: funcs for col, funcs in agg_dict.items() if col != '__size__'}
+
+    if _use_pandas(df, value_aggs, min_rows):
+        return _pandas_groupby_agg(df, group_cols, value_aggs, want_size)
+
+    codes, uniques_list, dims = _factorize_groups(df, group_cols)
+    if codes is None:
+        return _pandas_groupby_agg(df, group_cols, value_aggs, want_size)
+
+    n_workers = n_workers or PARALLEL_MAX_WORKERS
+    decomposable = all(f in DECOMPOSABLE_FUNCS for funcs in value_aggs.values() for f in funcs)
+
+    blocks = []
+    try:
+        codes_spec = _to_shared(codes, blocks)
+        value_specs = {col: _to_shared(df[col].to_numpy(dtype=np.float64, na_value=np.nan), blocks) for col in value_aggs}
+        tasks = []
+        if decomposable:
+            dates_spec, edges = None, np.linspace(0, len(df), n_workers + 1).astype(np.int64)
+            if date_col in df.columns:
+                dates = pd.to_datetime(df[date_col], errors='coerce').to_numpy(dtype='datetime64[ns]').view(np.int64)
+                valid_dates = dates[dates != np.iinfo(np.int64).min]
+                if valid_dates.size:
+                    dates_spec = _to_shared(dates, blocks)
+                    # Integer arithmetic: float edges would lose the nanosecond precision of the bounds
+                    first, span = int(valid_dates.min()), int(valid_dates.max()) + 1 - int(valid_dates.min())
+                    edges = [first + span * i // n_workers for i in range(n_workers + 1)]
+            for i in range(n_workers):
+                tasks.append({'mode': 'date', 'codes': codes_spec, 'dates': dates_spec, 'values': value_specs,
+                              'lo': int(edges[i]), 'hi': int(edges[i + 1]), 'include_nat': i == 0,
+                              'agg_dict': value_aggs})
+        else:
+            for shard in range(n_workers):
+                tasks.append({'mode': 'shard', 'codes': codes_spec, 'values': value_specs, 'shard': shard,
+                              'n_shards': n_workers, 'agg_dict': value_aggs, 'size': want_size})
+
+        parts = [part for part in _get_executor().map(_aggregate_task, tasks) if len(part)]
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    if not parts:
+        return _pandas_groupby_agg(df.iloc[0:0], group_cols, value_aggs, want_size)
+    if decomposable:
+        result = _merge_partials(pd.concat(parts), value_aggs, want_size)
+    else:
+        result = pd.concat(parts).sort_index()
+    result.index = _build_index(result.index.to_numpy(), group_cols, uniques_list, dims)
+    columns = [(col, f) for col, funcs in value_aggs.items() for f in funcs] + ([('__size__', 'size')] if want_size else [])
+    result = result[columns]
+    result.columns = pd.MultiIndex.from_tuples(columns)
+
+    # Values travelled as float64; restore the dtypes pandas would have produced
+    for col, func in columns:
+        if func in ('count', 'size'):
+            result[(col, func)] = result[(col, func)].fillna(0).astype(np.int64)
+        elif func in ('sum', 'min', 'max') and pd.api.types.is_integer_dtype(df[col]) and result[(col, func)].notna().all():
+            result[(col, func)] = result[(col, func)].astype(df[col].dtype)
+    return result
+
+
+def _pandas_groupby_agg(df: pd.DataFrame, group_cols: list, value_aggs: dict, want_size: bool) -> pd.DataFrame:
+    grouped = df.groupby(group_cols)
+    result = grouped.agg(value_aggs) if value_aggs else pd.DataFrame(index=grouped.size().index)
+    if want_size:
+        result[('__size__', 'size')] = grouped.size()
+    if len(result.columns) and not isinstance(result.columns, pd.MultiIndex):
+        result.columns = pd.MultiIndex.from_tuples(result.columns)
+    return result
+
+
+def parallel_group_size(df: pd.DataFrame, group_cols: list, **kwargs) -> pd.Series:
+    """
+    Equivalent of `df.groupby(group_cols).size()` run on the process pool.
+    """
+    result = parallel_groupby_agg(df, group_cols, {'__size__': ['size']}, **kwargs)
+    return result[('__size__', 'size')].rename(None)
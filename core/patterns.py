@@ -0,0 +1,169 @@
+import itertools
+import numpy as np
+import pandas as pd
+from core.cache import memoize
+
+# This module mines frequently co-occurring attribute values
+# (e.g. Weather_Condition=Rain & Road_Condition=Wet & Violation_Type=Overspeeding).
+# Every "Column=Value" item is stored as a packed bitset of the rows that contain
+# it (one bit per row, 64 rows per uint64 word). Eclat then walks the itemset
+# lattice depth-first; the support of a candidate is the popcount of a bitwise AND.
+
+# ---------------------------------------------------------
+# PATTERN MINING CONFIGURATION
+# ---------------------------------------------------------
+DEFAULT_MIN_SUPPORT = 0.05
+DEFAULT_MIN_CONFIDENCE = 0.5
+DEFAULT_MIN_LIFT = 1.0
+DEFAULT_MAX_LEN = 3
+MAX_CATEGORIES_PER_COLUMN = 50   # Higher cardinality columns (IDs, free text) are not mined
+
+
+# ==================================================================================
+# Block 1: Item Bitsets
+# ==================================================================================
+def _pack_rows(mask: np.ndarray) -> np.ndarray:
+    """
+    Packs a boolean row mask into uint64 words (bit i of the bitset = row i).
+    """
+    packed = np.packbits(mask, bitorder='little')
+    padding = (-len(packed)) % 8
+    if padding:
+        packed = np.concatenate([packed, np.zeros(padding, dtype=np.uint8)])
+    return packed.view(np.uint64)
+
+
+def _popcount(bitset: np.ndarray) -> int:
+    return int(np.bitwise_count(bitset).sum())
+
+
+def mineable_columns(df: pd.DataFrame, max_categories: int = MAX_CATEGORIES_PER_COLUMN) -> list:
+    """
+    Categorical columns with 2..max_categories distinct values.
+    """
+    columns = []
+    for col in df.columns:
+        if pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_datetime64_any_dtype(df[col]):
+            continue
+        if 1 < df[col].nunique() <= max_categories:
+            columns.append(col)
+    return columns
+
+
+def build_item_bitsets(df: pd.DataFrame, columns: list, min_count: int = 0):
+    """
+    Returns (labels, columns_of_items, bitsets, counts) for every Column=Value item
+    with at least `min_count` rows, ordered by ascending support (Eclat heuristic).
+    """
+    labels, item_columns, bitsets, counts = [], [], [], []
+    for col_pos, col in enumerate(columns):
+        codes, values = pd.factorize(df[col], sort=True)
+        value_counts = np.bincount(codes[codes >= 0], minlength=len(values))
+        for code in np.nonzero(value_counts >= max(min_count, 1))[0]:
+            labels.append(f"{col}={values[code]}")
+            item_columns.append(col_pos)
+            bitsets.append(_pack_rows(codes == code))
+            counts.append(int(value_counts[code]))
+
+    order = np.argsort(counts, kind='mergesort')
+    return ([labels[i] for i in order], [item_columns[i] for i in order],
+            [bitsets[i] for i in order], [counts[i] for i in order])
+
+
+# ==================================================================================
+# Block 2: Eclat Frequent Itemsets
+# ==================================================================================
+@memoize()
+def mine_frequent_itemsets(df: pd.DataFrame, columns: list = None, min_support: float = DEFAULT_MIN_SUPPORT,
+                           max_len: int = DEFAULT_MAX_LEN) -> pd.DataFrame:
+    """
+    Finds every combination of Column=Value items that co-occur in at least
+    `min_support` of the rows.
+
+    Args:
+        df (pd.DataFrame): Dataset.
+        columns (list): Categorical columns to mine. Defaults to mineable_columns(df).
+        min_support (float): Minimum fraction of rows containing the itemset.
+        max_len (int): Largest itemset size.
+
+    Returns:
+        pd.DataFrame: ['Itemset', 'Length', 'Count', 'Support'] sorted by support (descending).
+            'Itemset' is a tuple of "Column=Value" labels.
+    """
+    columns = mineable_columns(df) if columns is None else list(columns)
+    n_rows = len(df)
+    if n_rows == 0 or not columns:
+        return pd.DataFrame(columns=['Itemset', 'Length', 'Count', 'Support'])
+
+    min_count = max(1, int(np.ceil(min_support * n_rows)))
+    labels, item_columns, bitsets, counts = build_item_bitsets(df, columns, min_count)
+
+    found = []
+
+    def extend(prefix, prefix_columns, candidates):
+        # candidates: [(item, bitset, count)] that are frequent together with prefix
+        for pos, (item, bitset, count) in enumerate(candidates):
+            itemset = prefix + (item,)
+            found.append((itemset, count))
+            if len(itemset) >= max_len:
+                continue
+            used_columns = prefix_columns | {item_columns[item]}
+            next_candidates = []
+            for other, other_bitset, _ in candidates[pos + 1:]:
+                # Two values of the same column never co-occur
+                if item_columns[other] in used_columns:
+                    continue
+                joint = bitset & other_bitset
+                joint_count = _popcount(joint)
+                if joint_count >= min_count:
+                    next_candidates.append((other, joint, joint_count))
+            if next_candidates:
+                extend(itemset, used_columns, next_candidates)
+
+    extend((), frozenset(), [(i, bitsets[i], counts[i]) for i in range(len(labels))])
+
+    result = pd.DataFrame({
+        'Itemset': [tuple(labels[i] for i in itemset) for itemset, _ in found],
+        'Length': [len(itemset) for itemset, _ in found],
+        'Count': [count for _, count in found],
+    })
+    result['Support'] = result['Count'] / n_rows
+    return result.sort_values(['Support', 'Length'], ascending=[False, True], ignore_index=True)
+
+
+# ==================================================================================
+# Block 3: Association Rules
+# ==================================================================================
+def association_rules(itemsets: pd.DataFrame, min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+                      min_lift: float = DEFAULT_MIN_LIFT) -> pd.DataFrame:
+    """
+    Derives rules A => C from frequent itemsets.
+
+    confidence = support(A u C) / support(A), lift = confidence / support(C).
+    Every subset of a frequent itemset is frequent, so all supports are looked up.
+
+    Returns:
+        pd.DataFrame: ['Antecedent', 'Consequent', 'Support', 'Confidence', 'Lift'] sorted by lift.
+    """
+    columns = ['Antecedent', 'Consequent', 'Support', 'Confidence', 'Lift']
+    if itemsets.empty:
+        return pd.DataFrame(columns=columns)
+
+    support = {frozenset(itemset): sup for itemset, sup in zip(itemsets['Itemset'], itemsets['Support'])}
+    rules = []
+    for itemset, sup in zip(itemsets['Itemset'], itemsets['Support']):
+        if len(itemset) < 2:
+            continue
+        for size in range(1, len(itemset)):
+            for antecedent in itertools.combinations(itemset, size):
+                consequent = tuple(item for item in itemset if item not in antecedent)
+                confidence = sup / support[frozenset(antecedent)]
+                if confidence < min_confidence:
+                    continue
+                lift = confidence / support[frozenset(consequent)]
+                if lift < min_lift:
+                    continue
+                rules.append((' & '.join(antecedent), ' & '.join(consequent), sup, confidence, lift))
+
+    result = pd.DataFrame(rules, columns=columns)
+    return result.sort_values(['Lift', 'Confidence'], ascending=False, ignore_index=True)
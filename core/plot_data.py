@@ -0,0 +1,215 @@
+import numpy as np
+import pandas as pd
+from core.cache import memoize
+from core.crosstab import crosstab
+
+# This module is the aggregation step of the plot functions.
+# Each function reduces the raw rows to the small table a chart actually draws
+# (category counts, group means, count matrices, violin KDE grids, 2-D histograms) and is
+# memoized per dataset. The plot modules only render these aggregates, so
+# drawing a chart costs the same for 4 thousand or 4 million rows, and seaborn
+# never regroups rows or bootstraps confidence intervals (errorbar=None).
+
+# ---------------------------------------------------------
+# PLOT AGGREGATION CONFIGURATION
+# ---------------------------------------------------------
+KDE_GRID_SIZE = 100        # Points per violin outline (seaborn's gridsize)
+KDE_CUT = 2                # Bandwidths the outline extends past the extreme values (seaborn's cut)
+KDE_BINS = 512             # Values are binned before the KDE is evaluated
+WHISKER_IQR = 1.5          # Inner box whiskers reach the furthest value within 1.5 IQR
+DENSITY_MIN_ROWS = 5000    # Scatter comparisons with more points are drawn as a 2-D histogram
+DENSITY_BINS = 60          # Bins per axis of that histogram
+
+
+# ==================================================================================
+# Block 1: Category Order
+# ==================================================================================
+def appearance_order(values: pd.Series) -> list:
+    """
+    The order seaborn gives a categorical axis: categories of a categorical dtype,
+    otherwise values in order of first appearance (sorted if numeric).
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return list(values.cat.categories)
+    order = pd.unique(values.dropna())
+    if pd.api.types.is_numeric_dtype(values):
+        order = np.sort(order)
+    return list(order)
+
+
+# ==================================================================================
+# Block 2: Counts & Group Statistics
+# ==================================================================================
+@memoize()
+def group_stat(df: pd.DataFrame, by: str, value_col: str = None, stat: str = 'count', order: str = 'key') -> pd.Series:
+    """
+    One value per group of `by`.
+
+    Args:
+        stat (str): 'count' (rows), 'mean' or 'sum' (of value_col).
+        order (str): 'key' (sorted keys, as groupby), 'value' (largest first, as value_counts)
+            or 'appearance' (seaborn's categorical order).
+    """
+    if stat == 'count':
+        result = df[by].value_counts()
+    elif stat in ('mean', 'sum'):
+        result = df.groupby(by, observed=False)[value_col].agg(stat)
+    else:
+        raise ValueError(f"Unsupported stat: {stat}")
+
+    if order == 'key':
+        return result.sort_index()
+    if order == 'value':
+        return result if stat == 'count' else result.sort_values(ascending=False)
+    if order == 'appearance':
+        return result.reindex(appearance_order(df[by]))
+    raise ValueError(f"Unsupported order: {order}")
+
+
+@memoize()
+def count_table(df: pd.DataFrame, x_col: str, hue_col: str) -> pd.DataFrame:
+    """
+    Row counts per (x, hue) pair in long form, what sns.countplot(x=, hue=) would count.
+
+    Returns:
+        pd.DataFrame: [x_col, hue_col, 'Count'] for the observed pairs. Both keys are
+        ordered categoricals in seaborn's order, so a bar plot lays them out the same way.
+    """
+    counts = df.groupby([x_col, hue_col], observed=True, sort=False).size().reset_index(name='Count')
+    for col in (x_col, hue_col):
+        counts[col] = pd.Categorical(counts[col], categories=appearance_order(df[col]))
+    return counts.sort_values([x_col, hue_col], ignore_index=True)
+
+
+@memoize()
+def cross_table(df: pd.DataFrame, index_col: str, columns_col: str, values_col: str = None,
+                aggfunc: str = 'count', observed: bool = False) -> pd.DataFrame:
+    """
+    Memoized crosstab of two columns of df (see core/crosstab.py), for heatmaps and grouped bars.
+    """
+    values = df[values_col] if values_col is not None else None
+    return crosstab(df[index_col], df[columns_col], values=values, aggfunc=aggfunc, observed=observed)
+
+
+@memoize()
+def yearly_stat(df: pd.DataFrame, value_col: str, stat: str = 'sum') -> pd.Series:
+    """
+    'sum' or 'mean' of value_col per calendar year of 'Date'.
+    """
+    years = pd.to_datetime(df['Date'], errors='coerce').dt.year.rename('Year')
+    return df[value_col].groupby(years).agg(stat)
+
+
+@memoize()
+def hour_counts(df: pd.DataFrame):
+    """
+    Violations per hour of day parsed from 'Time' ('HH:MM:SS' or 'HH:MM').
+
+    Returns:
+        pd.Series | None: Counts indexed by hour, or None if 'Time' cannot be parsed.
+    """
+    try:
+        hours = pd.to_datetime(df['Time'], format='%H:%M:%S', errors='coerce').dt.hour
+        if hours.isnull().any():
+            hours = pd.to_datetime(df['Time'], format='%H:%M', errors='coerce').dt.hour
+        if hours.isnull().all():
+            hours = df['Time'].astype(str).str.split(':').str[0].astype(float)
+    except Exception:
+        return None
+    return hours.value_counts().sort_index()
+
+
+# ==================================================================================
+# Block 3: Violin KDE Grids
+# ==================================================================================
+def _kde_on_grid(values: np.ndarray, gridsize: int, cut: float):
+    """
+    Gaussian KDE (Scott's bandwidth, as seaborn) of `values` evaluated on `gridsize` points.
+    The values are first binned into KDE_BINS bins, so evaluation does not grow with their count.
+    """
+    n = len(values)
+    low, high = values.min(), values.max()
+    std = values.std(ddof=1) if n > 1 else 0.0
+    bandwidth = std * n ** (-1 / 5)
+    if not bandwidth > 0:
+        # A single distinct value: a flat line at that value
+        return np.full(gridsize, low, dtype=np.float64), np.zeros(gridsize)
+
+    support = np.linspace(low - cut * bandwidth, high + cut * bandwidth, gridsize)
+    counts, edges = np.histogram(values, bins=KDE_BINS, range=(low, high))
+    centers = (edges[:-1] + edges[1:]) / 2
+    occupied = counts > 0
+    z = (support[:, None] - centers[occupied][None, :]) / bandwidth
+    density = (np.exp(-0.5 * z ** 2) @ counts[occupied]) / (n * bandwidth * np.sqrt(2 * np.pi))
+    return support, density
+
+
+@memoize()
+def violin_grid(df: pd.DataFrame, group_col: str, value_col: str, gridsize: int = KDE_GRID_SIZE,
+                cut: float = KDE_CUT) -> dict:
+    """
+    Everything a violin plot with an inner box draws, per group of `group_col`.
+
+    Returns:
+        dict: {
+            'groups': list of groups in seaborn's order,
+            'support': groups x gridsize array of values,
+            'density': groups x gridsize array of KDE densities (each integrates to 1),
+            'stats': DataFrame indexed by group ['Q1', 'Median', 'Q3', 'Whisker_Low', 'Whisker_High', 'Count']
+        }
+    """
+    data = df[[group_col, value_col]].dropna()
+    groups = appearance_order(df[group_col])
+    values_by_group = {group: values.to_numpy(dtype=np.float64)
+                       for group, values in data.groupby(group_col, observed=True, sort=False)[value_col]}
+
+    support = np.zeros((len(groups), gridsize))
+    density = np.zeros((len(groups), gridsize))
+    stats = []
+    for i, group in enumerate(groups):
+        values = values_by_group.get(group)
+        if values is None or len(values) == 0:
+            stats.append((np.nan,) * 5 + (0,))
+            continue
+        support[i], density[i] = _kde_on_grid(values, gridsize, cut)
+        q1, median, q3 = np.percentile(values, [25, 50, 75])
+        reach = WHISKER_IQR * (q3 - q1)
+        whisker_low = values[values >= q1 - reach].min()
+        whisker_high = values[values <= q3 + reach].max()
+        stats.append((q1, median, q3, whisker_low, whisker_high, len(values)))
+
+    stats = pd.DataFrame(stats, index=pd.Index(groups, name=group_col),
+                         columns=['Q1', 'Median', 'Q3', 'Whisker_Low', 'Whisker_High', 'Count'])
+    return {'groups': groups, 'support': support, 'density': density, 'stats': stats}
+
+
+# ==================================================================================
+# Block 4: Scatter Pairs & 2-D Histograms
+# ==================================================================================
+@memoize()
+def numeric_pairs(df: pd.DataFrame, x_col: str, y_col: str) -> pd.DataFrame:
+    """
+    The (x, y) values of the rows where both columns are present, as columns ['x', 'y'].
+    Rows are dropped together, so every x stays paired with the y of its own row.
+    """
+    pairs = pd.DataFrame({'x': df[x_col], 'y': df[y_col]}).dropna()
+    return pairs.reset_index(drop=True)
+
+
+@memoize()
+def density_grid(df: pd.DataFrame, x_col: str, y_col: str, bins: int = DENSITY_BINS) -> dict:
+    """
+    Row counts of the (x, y) pairs on a bins x bins grid (np.histogram2d), what a
+    density plot draws instead of one marker per row.
+
+    Returns:
+        dict: {
+            'counts': bins x bins array, rows along x and columns along y,
+            'x_edges', 'y_edges': bin edges (bins + 1 each),
+            'rows': number of pairs binned
+        }
+    """
+    pairs = numeric_pairs(df, x_col, y_col)
+    counts, x_edges, y_edges = np.histogram2d(pairs['x'].to_numpy(dtype=np.float64),
+                                              pairs['y'].to_numpy(dtype=np.float64), bins=bins)
+    return {'counts': counts, 'x_edges': x_edges, 'y_edges': y_edges, 'rows': len(pairs)}
@@ -0,0 +1,129 @@
+import functools
+import threading
+import contextlib
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+import streamlit as st
+
+# This module applies the plot modules' styles without touching global state.
+# Each module registers the function that sets up its look (sns.set_theme +
+# rcParams). That function runs once per (style, theme) against a scratch copy
+# of the rcParams; the resulting settings are kept as a plain dict that every
+# plot function runs under, and the previous rcParams are restored on exit
+# (like plt.rc_context, without re-validating every value per figure).
+# Figures are created through the object-oriented API (new_figure) rather than
+# pyplot, so they are never registered with pyplot's global figure manager and
+# can be built and saved from worker threads.
+
+_SETUPS = {}
+_COMPILED = {}
+_COMPILE_LOCK = threading.Lock()
+# rcParams are process-wide, so figures are built one at a time while a style is active.
+# Re-entrant because styled plot functions may call each other.
+_STYLE_LOCK = threading.RLock()
+
+
+# ==================================================================================
+# Block 1: Style Registry
+# ==================================================================================
+@functools.lru_cache(maxsize=None)
+def current_theme() -> str:
+    """
+    The configured Streamlit base theme ('light' or 'dark'), looked up once per process.
+    """
+    try:
+        return st.get_option("theme.base") or 'light'
+    except Exception:
+        return 'light'
+
+
+def register_style(name: str, setup):
+    """
+    Registers `setup(theme)`, a function that applies a style to the global rcParams.
+    """
+    _SETUPS[name] = setup
+    with _COMPILE_LOCK:
+        for key in [key for key in _COMPILED if key[0] == name]:
+            del _COMPILED[key]
+
+
+def compiled_style(name: str, theme: str = None) -> dict:
+    """
+    The rcParams that `name`'s setup produces for `theme`, starting from matplotlib's defaults.
+    """
+    theme = current_theme() if theme is None else theme
+    key = (name, theme)
+    with _COMPILE_LOCK:
+        if key not in _COMPILED:
+            with _STYLE_LOCK, mpl.rc_context():
+                mpl.rcdefaults()
+                _SETUPS[name](theme)
+                # The full set, so the result never depends on what the global rcParams hold.
+                # 'backend' is left alone, as rc_context does.
+                _COMPILED[key] = {param: value for param, value in dict.items(mpl.rcParams) if param != 'backend'}
+        return _COMPILED[key]
+
+
+# ==================================================================================
+# Block 2: Applying a Style
+# ==================================================================================
+@contextlib.contextmanager
+def style_context(name: str, theme: str = None):
+    """
+    Runs the enclosed block with `name`'s style applied; the global rcParams are restored afterwards.
+    """
+    rc = compiled_style(name, theme)
+    with _STYLE_LOCK:
+        saved = {param: value for param, value in dict.items(mpl.rcParams) if param != 'backend'}
+        # The values were validated when the style was compiled, so they are
+        # written directly (the same way rc_context restores its snapshot)
+        dict.update(mpl.rcParams, rc)
+        try:
+            yield
+        finally:
+            dict.update(mpl.rcParams, saved)
+
+
+def style_lock():
+    """
+    Holds the style lock so that no style is swapped into the global rcParams meanwhile.
+    """
+    return _STYLE_LOCK
+
+
+def styled(name: str):
+    """
+    Decorator: the plot function builds its figure inside style_context(name).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with style_context(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ==================================================================================
+# Block 3: Figures Outside pyplot
+# ==================================================================================
+def new_figure(figsize=None, **subplot_kw):
+    """
+    A Figure with one Axes that pyplot does not track (no plt.close needed).
+    Call inside a style context so the figure picks up the style's defaults.
+
+    Returns:
+        (Figure, Axes)
+    """
+    fig = Figure(figsize=figsize)
+    return fig, fig.subplots(**subplot_kw)
+
+
+def release_figure(fig):
+    """
+    Frees a figure's artists; figures that were created through pyplot are also closed there.
+    """
+    if getattr(fig.canvas, 'manager', None) is not None:
+        plt.close(fig)
+    fig.clear()
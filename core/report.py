@@ -0,0 +1,359 @@
+import io
+import os
+import re
+import sys
+import html
+import time
+import base64
+import argparse
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.image import imread
+from core import (
+    utils,
+    cache,
+    features,
+    rolling,
+    map_plot,
+    figure_cache,
+    dashboard_summary,
+    dashboard_plot,
+    visualize_plot,
+    trend_plot,
+)
+
+# This module renders the dashboard's analyses to standalone report files,
+# without a Streamlit server: one HTML and/or PDF file per value of a filter
+# column (e.g. one report per state).
+#
+# The dataset is loaded and prepared once. The one aggregate that spans the
+# whole dataset (violations per state for the map) is built once in the parent
+# and handed to every worker when the pool starts, not recomputed per report.
+# Everything else, including the high-fine threshold, is computed from the
+# report's own rows, as the app does for the rows it shows. Each worker then builds whole reports,
+# so its memoized summaries and figure cache are reused by every report it
+# writes. Set FIGURE_CACHE_DIR to also reuse rendered figures across runs.
+#
+# Usage (from the repository root):
+#   python -m core.report dataset/Indian_Traffic_Violations.csv --values Gujarat Punjab --format html pdf
+
+# ---------------------------------------------------------
+# REPORT CONFIGURATION
+# ---------------------------------------------------------
+REPORT_FORMATS = ('html', 'pdf')
+DEFAULT_FILTER_COL = 'Location'
+DEFAULT_OUTPUT_DIR = 'reports'
+REPORT_WORKERS = os.cpu_count() or 1
+TREND_WINDOWS = (30,)                  # Moving-average window of the daily trend plot (days)
+HOTSPOT_ROWS = 10                      # Latest hotspot alerts listed per report
+PDF_PAGE_SIZE = (8.27, 11.69)          # A4 portrait, inches
+
+# (title, plot function of the report's rows)
+REPORT_PLOTS = [
+    ("Vehicle Type vs Violation Type", dashboard_plot.plot_vehicle_type_vs_violation_type),
+    ("Violation Type Share", visualize_plot.plot_violation_type_percentage),
+    ("Average Fine by Violation Type", visualize_plot.plot_avg_fine_by_violation_type),
+    ("Speeding by Weather", visualize_plot.plot_speed_exceeded_vs_weather),
+    ("Speeding by Road Condition", visualize_plot.plot_speeding_vs_road_condition),
+    ("Fine Amount by Weather", visualize_plot.plot_fine_amount_distribution_vs_weather),
+    ("Driver Age vs Alcohol Level", visualize_plot.plot_age_alcohol_heatmap),
+    ("Driver Risk by Age", visualize_plot.plot_driver_risk_by_age),
+    ("Peak Violation Hours", trend_plot.plot_peak_hour_traffic),
+    ("Fines per Year", trend_plot.plot_fines_per_year),
+]
+
+# Set in each worker by _init_worker (and in the parent for in-process runs)
+_SHARED = {}
+
+
+# ==================================================================================
+# Block 1: Dataset & Shared Aggregates
+# ==================================================================================
+def load_dataset(path: str, start=None, end=None) -> pd.DataFrame:
+    """
+    Loads a dataset the way the app does (parsed Date/Time) and keeps the rows from start to end.
+    """
+    df = utils.filter_the_dataset(cache.tag_dataset(pd.read_csv(path), cache.file_token(path)))
+    if start is not None:
+        df = df[df['Date'] >= pd.Timestamp(start)]
+    if end is not None:
+        df = df[df['Date'] <= pd.Timestamp(end)]
+    return df.reset_index(drop=True)
+
+
+def build_shared_aggregates(df: pd.DataFrame) -> dict:
+    """
+    Everything the reports share, computed once for the whole dataset.
+    """
+    shared = {
+        'map_html': None,
+    }
+    geojson_data, state_prop_name = map_plot.load_geojson()
+    if geojson_data is not None and 'Location' in df.columns:
+        map_data = df['Location'].value_counts().rename_axis('Location').reset_index(name='Violations')
+        violation_map = map_plot.plot_choropleth_map(map_data, geojson_data, 'Location', 'Violations', state_prop_name)
+        shared['map_html'] = violation_map.get_root().render()
+    return shared
+
+
+def _init_worker(df: pd.DataFrame, shared: dict):
+    _SHARED.clear()
+    _SHARED.update(shared, df=df)
+    # Each worker derives the feature columns once for the whole dataset
+    features.prepare_features(df)
+
+
+# ==================================================================================
+# Block 2: Report Contents
+# ==================================================================================
+def _metric_table(rows) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=['Metric', 'Value'])
+
+
+def build_report(df: pd.DataFrame, title: str) -> dict:
+    """
+    Computes the summary tables and renders the figures of one report.
+
+    Returns:
+        dict: {'title', 'rows', 'tables': [(heading, DataFrame)], 'figures': [(heading, PNG bytes)]}
+    """
+    overview = dashboard_summary.get_global_overview_metrics(df)
+    # No shared sketch store: the p90 fine must be this subset's, not the whole dataset's
+    behavior = dashboard_summary.get_behavioral_analysis(df)
+    hotspot_results = dashboard_summary.get_hotspot_alerts(df, top_n=HOTSPOT_ROWS)
+
+    over_speeding_count, over_speeding_pct = behavior['over_speeding_stats']
+    high_fine_count, high_fine_pct, high_fine_threshold = behavior['high_fine_stats']
+    court_count, court_pct = behavior['court_appearance_stats']
+    repeat_offender_count, repeat_offender_pct = behavior['repeat_offender_stats']
+    bad_weather_count, bad_weather_pct = behavior['bad_weather_stats']
+    top_weather_name, top_weather_count, top_weather_pct = behavior['most_frequent_weather_stats']
+
+    tables = [
+        ("Executive Summary", _metric_table([
+            ("Total Violations", f"{overview.get('total_violations', 0):,}"),
+            ("Most Common Violation", overview.get('most_common_violation', 'N/A')),
+            ("Top Licensed Agency", overview.get('top_agency', 'N/A')),
+            ("Avg Fine", f"Rs. {overview.get('avg_fine', 0):,.2f}"),
+            ("Max Fine", f"Rs. {overview.get('max_fine', 0):,.2f}"),
+            ("Min Fine", f"Rs. {overview.get('min_fine', 0):,.2f}"),
+            ("Common Payment", overview.get('common_payment', 'N/A')),
+        ])),
+        ("Advanced Risk Indicators", _metric_table([
+            ("Over-Speeding Incidents", f"{over_speeding_count} ({over_speeding_pct:.1f}%)"),
+            ("Repeat Offenders Involved", f"{repeat_offender_count} ({repeat_offender_pct:.1f}%)"),
+            ("Court Appearance Required", f"{court_count} ({court_pct:.1f}%)"),
+            ("Bad-Weather Violations", f"{bad_weather_count} ({bad_weather_pct:.1f}%)"),
+            ("Most Violation Weather", f"{top_weather_name} ({top_weather_count}, {top_weather_pct:.1f}%)"),
+            (f"High-Fine Violations (> Rs. {high_fine_threshold:,.0f})", f"{high_fine_count} ({high_fine_pct:.1f}%)"),
+        ])),
+    ]
+    if not hotspot_results['latest_alerts'].empty:
+        tables.append(("Latest Hotspot Alerts", hotspot_results['latest_alerts'].round(2)))
+
+    figures = []
+    if not df.empty:
+        for heading, plot_func in REPORT_PLOTS:
+            data = figure_cache.figure_bytes(plot_func, df, context='report')
+            if data is not None:
+                figures.append((heading, data))
+        daily = rolling.daily_rollup(df, 'Violation_Type')
+        if not daily.empty:
+            data = figure_cache.figure_bytes(trend_plot.plot_trend_analysis_line, daily, 'Date', 'Violation_Type',
+                                             rolling_windows=list(TREND_WINDOWS), context='report')
+            if data is not None:
+                figures.append((f"Daily Violations ({TREND_WINDOWS[0]}-day average)", data))
+
+    return {'title': title, 'rows': len(df), 'tables': tables, 'figures': figures}
+
+
+# ==================================================================================
+# Block 3: Writers
+# ==================================================================================
+def write_html(report: dict, path: str, map_html: str = None):
+    """
+    One self-contained HTML file: tables inline, figures as embedded PNGs.
+    The interactive map (if given) loads Leaflet and its tiles from their CDNs.
+    """
+    parts = [f"<h1>{html.escape(report['title'])}</h1>",
+             f"<p class='meta'>{report['rows']:,} violations &middot; generated {pd.Timestamp.now():%Y-%m-%d %H:%M}</p>"]
+    for heading, table in report['tables']:
+        parts.append(f"<h2>{html.escape(heading)}</h2>")
+        parts.append(table.to_html(index=False, border=0, classes='table'))
+    for heading, data in report['figures']:
+        encoded = base64.b64encode(data).decode('ascii')
+        parts.append(f"<h2>{html.escape(heading)}</h2><img src='data:image/png;base64,{encoded}' alt='{html.escape(heading)}'>")
+    if map_html:
+        parts.append("<h2>Violations by State (all reports)</h2>")
+        parts.append(f"<iframe class='map' srcdoc=\"{html.escape(map_html)}\"></iframe>")
+
+    style = ("body{font-family:sans-serif;max-width:1100px;margin:auto;padding:1em;color:#222}"
+             "h2{border-bottom:1px solid #ddd;padding-bottom:.2em;margin-top:1.5em}"
+             ".meta{color:#666}.table{border-collapse:collapse}"
+             ".table td,.table th{padding:.3em .8em;border-bottom:1px solid #eee;text-align:left}"
+             "img{max-width:100%}.map{width:100%;height:520px;border:0}")
+    document = (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(report['title'])}</title>"
+                f"<style>{style}</style></head><body>{''.join(parts)}</body></html>")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(document)
+
+
+def _pdf_table_page(pdf, title: str, heading_tables: list, subtitle: str = None):
+    fig = Figure(figsize=PDF_PAGE_SIZE)
+    fig.text(0.5, 0.96, title, ha='center', va='top', fontsize=16, fontweight='bold')
+    if subtitle:
+        fig.text(0.5, 0.925, subtitle, ha='center', va='top', fontsize=9, color='#666666')
+    axes = fig.subplots(len(heading_tables), 1, squeeze=False)[:, 0]
+    fig.subplots_adjust(top=0.88, bottom=0.04, hspace=0.35)
+    for ax, (heading, table) in zip(axes, heading_tables):
+        ax.axis('off')
+        ax.set_title(heading, loc='left', fontweight='bold')
+        cells = ax.table(cellText=table.astype(str).to_numpy(), colLabels=list(table.columns), loc='upper center',
+                         cellLoc='left')
+        cells.auto_set_font_size(False)
+        cells.set_fontsize(7 if table.shape[1] > 2 else 9)
+    pdf.savefig(fig)
+
+
+def write_pdf(report: dict, path: str):
+    """
+    One PDF: the summary tables, then one page per figure.
+    """
+    with PdfPages(path) as pdf:
+        subtitle = f"{report['rows']:,} violations - generated {pd.Timestamp.now():%Y-%m-%d %H:%M}"
+        _pdf_table_page(pdf, report['title'], report['tables'][:2], subtitle)
+        if len(report['tables']) > 2:
+            _pdf_table_page(pdf, report['title'], report['tables'][2:])
+        for heading, data in report['figures']:
+            fig = Figure(figsize=PDF_PAGE_SIZE)
+            ax = fig.add_axes([0.05, 0.05, 0.9, 0.85])
+            ax.imshow(imread(io.BytesIO(data), format='png'))
+            ax.axis('off')
+            fig.text(0.5, 0.95, heading, ha='center', va='top', fontsize=14, fontweight='bold')
+            pdf.savefig(fig)
+
+
+# ==================================================================================
+# Block 4: Batch Generation
+# ==================================================================================
+def _file_stem(value) -> str:
+    return re.sub(r'[^A-Za-z0-9]+', '_', str(value)).strip('_') or 'report'
+
+
+def _report_task(task: dict) -> list:
+    """
+    Builds and writes the report of one filter value. Runs in a worker process.
+    """
+    df = _SHARED['df']
+    subset = df[df[task['filter_col']] == task['value']]
+    report = build_report(subset, f"Traffic Violation Report: {task['value']}")
+    paths = []
+    stem = os.path.join(task['out_dir'], _file_stem(task['value']))
+    if 'html' in task['formats']:
+        write_html(report, stem + '.html', _SHARED['map_html'])
+        paths.append(stem + '.html')
+    if 'pdf' in task['formats']:
+        write_pdf(report, stem + '.pdf')
+        paths.append(stem + '.pdf')
+    return paths
+
+
+def resolve_values(df: pd.DataFrame, filter_col: str, values) -> list:
+    """
+    Matches requested filter values (e.g. CLI strings) to the values of filter_col,
+    cast to the column's dtype ('2019' -> 2019 for a numeric column).
+
+    Raises:
+        ValueError: If a value does not occur in the column.
+    """
+    present = df[filter_col].dropna().unique()
+    by_text = {str(value): value for value in present}
+    numeric = pd.api.types.is_numeric_dtype(df[filter_col]) and not pd.api.types.is_bool_dtype(df[filter_col])
+    resolved, unknown = [], []
+    for value in values:
+        if isinstance(value, str) and numeric:
+            number = pd.to_numeric(value.strip(), errors='coerce')
+            match = next((item for item in present if item == number), None) if pd.notna(number) else None
+        else:
+            match = by_text.get(str(value).strip() if isinstance(value, str) else str(value))
+        if match is None:
+            unknown.append(str(value))
+        elif match not in resolved:
+            resolved.append(match)
+    if unknown:
+        raise ValueError(f"Value(s) not found in column '{filter_col}': {', '.join(unknown)}")
+    return resolved
+
+
+def generate_reports(df: pd.DataFrame, filter_col: str = DEFAULT_FILTER_COL, values=None, formats=('html',),
+                     out_dir: str = DEFAULT_OUTPUT_DIR, max_workers: int = REPORT_WORKERS):
+    """
+    Writes one report per value of filter_col (all values by default).
+    Requested values are checked and cast with resolve_values.
+
+    Yields:
+        (value, list of written paths) as reports finish.
+    """
+    unknown = set(formats) - set(REPORT_FORMATS)
+    if unknown:
+        raise ValueError(f"Unsupported report format(s): {', '.join(sorted(unknown))}")
+    if values is None:
+        values = sorted(df[filter_col].dropna().unique())
+    else:
+        values = resolve_values(df, filter_col, values)
+    os.makedirs(out_dir, exist_ok=True)
+
+    shared = build_shared_aggregates(df)
+    tasks = [{'filter_col': filter_col, 'value': value, 'formats': tuple(formats), 'out_dir': out_dir}
+             for value in values]
+
+    if max_workers <= 1 or len(tasks) <= 1:
+        _init_worker(df, shared)
+        for task in tasks:
+            yield task['value'], _report_task(task)
+        return
+
+    # 'spawn' so workers start clean, as core/parallel.py does; the dataset and shared aggregates
+    # are sent once per worker, not once per report
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(tasks)), mp_context=mp.get_context('spawn'),
+                             initializer=_init_worker, initargs=(df, shared)) as pool:
+        futures = {pool.submit(_report_task, task): task['value'] for task in tasks}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Render per-value traffic violation reports without the Streamlit app.")
+    parser.add_argument('dataset', help="CSV file in the traffic violation format")
+    parser.add_argument('--by', default=DEFAULT_FILTER_COL, help="Column to split reports by (default: %(default)s)")
+    parser.add_argument('--values', nargs='+', help="Values of --by to report on (default: all)")
+    parser.add_argument('--format', nargs='+', default=['html'], choices=REPORT_FORMATS, dest='formats')
+    parser.add_argument('--start', help="First date to include (YYYY-MM-DD)")
+    parser.add_argument('--end', help="Last date to include (YYYY-MM-DD)")
+    parser.add_argument('--out', default=DEFAULT_OUTPUT_DIR, help="Output directory (default: %(default)s)")
+    parser.add_argument('--workers', type=int, default=REPORT_WORKERS, help="Worker processes (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    df = load_dataset(args.dataset, args.start, args.end)
+    if args.by not in df.columns:
+        parser.error(f"Column '{args.by}' not found in {args.dataset}")
+    if args.values:
+        try:
+            args.values = resolve_values(df, args.by, args.values)
+        except ValueError as e:
+            parser.error(str(e))
+
+    count = 0
+    for value, paths in generate_reports(df, args.by, args.values, args.formats, args.out, args.workers):
+        count += 1
+        print(f"{value}: {', '.join(paths)}")
+    print(f"{count} report(s) written to {args.out} in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+# This module computes moving-window metrics over daily rollups.
+# The raw rows are rolled up once into a dense (day x category) matrix; every
+# requested window for every category then comes from a single cumulative
+# sum over that matrix: window_sum[t] = cumsum[t] - cumsum[t - w].
+
+# ---------------------------------------------------------
+# ROLLING CONFIGURATION
+# ---------------------------------------------------------
+DEFAULT_WINDOWS = (7, 30, 90)
+ROLLING_STATS = ['mean', 'sum', 'rate']   # moving average, rolling total, rolling share of all violations (%)
+
+
+# ==================================================================================
+# Block 1: Daily Rollup
+# ==================================================================================
+def daily_rollup(df: pd.DataFrame, category_col: str = None, value_col: str = None, date_col: str = 'Date') -> pd.DataFrame:
+    """
+    Rolls rows up to one row per calendar day.
+
+    Args:
+        df (pd.DataFrame): Dataset with a date column.
+        category_col (str | list): Optional column (or list of columns) whose values become
+            the output columns. A list gives MultiIndex columns, e.g. (Location, Violation_Type).
+        value_col (str): Optional numeric column to sum. Rows are counted when None.
+        date_col (str): Name of the date column.
+
+    Returns:
+        pd.DataFrame: Dense daily index (days without violations are 0), one column per category
+        (or a single 'Total' column when category_col is None).
+    """
+    dates = pd.to_datetime(df[date_col], errors='coerce')
+    valid = dates.notna().to_numpy()
+    if category_col is not None:
+        valid &= df[category_col].notna().to_numpy().reshape(len(df), -1).all(axis=1)
+    if not valid.any():
+        return pd.DataFrame(index=pd.DatetimeIndex([], name=date_col))
+
+    day_numbers = dates[valid].to_numpy(dtype='datetime64[D]').astype(np.int64)
+    first_day = day_numbers.min()
+    n_days = int(day_numbers.max() - first_day + 1)
+    day_codes = day_numbers - first_day
+
+    if isinstance(category_col, (list, tuple)):
+        cat_codes, labels = pd.factorize(pd.MultiIndex.from_frame(df.loc[valid, list(category_col)]), sort=True)
+    elif category_col is not None:
+        cat_codes, labels = pd.factorize(df.loc[valid, category_col], sort=True)
+    else:
+        cat_codes, labels = np.zeros(len(day_codes), dtype=np.int64), pd.Index(['Total'])
+    n_cats = len(labels)
+
+    weights = None
+    if value_col is not None:
+        weights = pd.to_numeric(df.loc[valid, value_col], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+
+    key = day_codes * n_cats + cat_codes
+    table = np.bincount(key, weights=weights, minlength=n_days * n_cats).reshape(n_days, n_cats)
+    if weights is None:
+        table = table.astype(np.int64)
+
+    index = pd.date_range(pd.Timestamp(np.datetime64(int(first_day), 'D')), periods=n_days, freq='D', name=date_col)
+    columns = labels.set_names(list(category_col)) if isinstance(labels, pd.MultiIndex) else pd.Index(labels, name=category_col)
+    return pd.DataFrame(table, index=index, columns=columns)
+
+
+# ==================================================================================
+# Block 2: Multi-Window Rolling Metrics
+# ==================================================================================
+def _window_sums(cumulative: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing window sums from a zero-prefixed cumulative sum (rows = days).
+    """
+    n_days = cumulative.shape[0] - 1
+    upper = np.arange(1, n_days + 1)
+    lower = np.maximum(upper - window, 0)
+    return cumulative[upper] - cumulative[lower]
+
+
+def rolling_metrics(daily: pd.DataFrame, windows=DEFAULT_WINDOWS, stat: str = 'mean', min_periods: int = None) -> pd.DataFrame:
+    """
+    Computes trailing-window metrics for every column of a daily rollup.
+
+    Args:
+        daily (pd.DataFrame): Output of daily_rollup (dense daily index).
+        windows (iterable): Window lengths in days.
+        stat (str): 'mean' (moving average), 'sum' (rolling total) or
+            'rate' (column's share of the row total within the window, in %).
+        min_periods (int): Days required before a value is reported. Defaults to the full window.
+
+    Returns:
+        pd.DataFrame: Columns are a MultiIndex of (window label, category), e.g. ('7D', 'Overspeeding').
+    """
+    if stat not in ROLLING_STATS:
+        raise ValueError(f"Unsupported rolling stat: {stat}")
+
+    windows = sorted({int(w) for w in windows})
+    values = daily.to_numpy(dtype=np.float64)
+    n_days = values.shape[0]
+    cumulative = np.zeros((n_days + 1, values.shape[1]))
+    np.cumsum(values, axis=0, out=cumulative[1:])
+    if stat == 'rate':
+        total_cumulative = np.concatenate([[0.0], np.cumsum(values.sum(axis=1))])
+
+    frames = []
+    days_seen = np.arange(1, n_days + 1)
+    for window in windows:
+        sums = _window_sums(cumulative, window)
+        if stat == 'mean':
+            result = sums / np.minimum(days_seen, window)[:, None]
+        elif stat == 'sum':
+            result = sums
+        else:
+            totals = _window_sums(total_cumulative[:, None], window)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                result = np.where(totals > 0, sums / totals * 100, np.nan)
+
+        required = window if min_periods is None else min(min_periods, window)
+        result[:max(required - 1, 0)] = np.nan
+        frames.append(pd.DataFrame(result, index=daily.index, columns=daily.columns))
+
+    return pd.concat(frames, axis=1, keys=[f"{w}D" for w in windows], names=['Window'] + list(daily.columns.names))
+
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+from core.cache import memoize
+
+# This module computes the violation severity score used by the severity heatmaps.
+# The score is built from whole-column NumPy expressions; missing columns and
+# null cells simply contribute nothing, exactly like the original row-wise helper.
+
+# ---------------------------------------------------------
+# SEVERITY WEIGHTS
+# ---------------------------------------------------------
+SEVERITY_WEIGHTS = {
+    'fine_per_1000': 1.0,          # Fine_Amount / 1000
+    'penalty_point': 1.0,          # Penalty_Points
+    'overspeed_per_10_kmph': 1.0,  # (Recorded_Speed - Speed_Limit) / 10, only when over the limit
+    'alcohol_level': 10.0,         # Alcohol_Level * 10
+    'no_helmet': 10.0,             # Helmet_Worn == 'No'
+    'no_seatbelt': 10.0,           # Seatbelt_Worn == 'No'
+    'red_light': 15.0,             # Traffic_Light_Status == 'Red'
+    'previous_violation': 1.5,     # Previous_Violations * 1.5
+}
+
+
+def _numeric(df: pd.DataFrame, col: str) -> np.ndarray:
+    """
+    Column as float64 with nulls (and missing columns) as NaN.
+    """
+    if col not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64)
+
+
+def _flag(df: pd.DataFrame, col: str, value: str) -> np.ndarray:
+    if col not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    return (df[col] == value).to_numpy(dtype=bool)
+
+
+@memoize()
+def compute_severity_score(df: pd.DataFrame, weights: dict = None) -> pd.Series:
+    """
+    Computes the severity score of every violation.
+
+    Args:
+        df (pd.DataFrame): Violations dataset.
+        weights (dict): Optional overrides for SEVERITY_WEIGHTS (same keys).
+
+    Returns:
+        pd.Series: 'Violation_Severity_Score', aligned with df.index.
+    """
+    w = dict(SEVERITY_WEIGHTS, **(weights or {}))
+
+    fine = _numeric(df, 'Fine_Amount')
+    points = _numeric(df, 'Penalty_Points')
+    overspeed = _numeric(df, 'Recorded_Speed') - _numeric(df, 'Speed_Limit')
+    alcohol = _numeric(df, 'Alcohol_Level')
+    previous = _numeric(df, 'Previous_Violations')
+
+    # NaN terms are masked to 0 so a null in one column does not void the others
+    score = np.nan_to_num(fine / 1000 * w['fine_per_1000'], nan=0.0)
+    score += np.nan_to_num(points * w['penalty_point'], nan=0.0)
+    score += np.where(overspeed > 0, overspeed / 10 * w['overspeed_per_10_kmph'], 0.0)
+    score += np.nan_to_num(alcohol * w['alcohol_level'], nan=0.0)
+    score += _flag(df, 'Helmet_Worn', 'No') * w['no_helmet']
+    score += _flag(df, 'Seatbelt_Worn', 'No') * w['no_seatbelt']
+    score += _flag(df, 'Traffic_Light_Status', 'Red') * w['red_light']
+    score += np.nan_to_num(previous * w['previous_violation'], nan=0.0)
+
+    return pd.Series(score, index=df.index, name='Violation_Severity_Score')
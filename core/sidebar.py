@@ -2,6 +2,10 @@ import streamlit as st
 import pandas as pd
 import os
 from streamlit_local_storage import LocalStorage
+from core import vega_plot
+from core import cache
+from core import features
+from core import figure_cache
 
 def render_sidebar() -> pd.DataFrame:
     """
@@ -98,11 +102,38 @@ def render_sidebar() -> pd.DataFrame:
     @st.cache_data
     def load_data(path):
         df = pd.read_csv(path)
+        # Memoized analyses key this dataset (and its slices) on the file instead of hashing its rows
+        cache.tag_dataset(df, cache.file_token(path))
         return df.copy() # Return a copy to prevent mutation of cached data
     df = load_data(selected_dataset_path)
+    # Derived columns are computed once per dataset, next to it rather than in it
+    features.prepare_features(df)
     
     # 4. Display Success Message
     st.sidebar.success(f"Loaded dataset: **{selected_dataset_display_name}**")
+
+    # Where charts are drawn (read by figure_cache.show_plot through vega_plot.active_backend).
+    # Kept under a plain session key so the choice carries over to the other pages.
+    backends = list(vega_plot.CHART_BACKENDS)
+    current_backend = st.session_state.get(vega_plot.BACKEND_STATE_KEY)
+    st.session_state[vega_plot.BACKEND_STATE_KEY] = st.sidebar.radio(
+        "Chart Rendering",
+        backends,
+        index=backends.index(current_backend) if current_backend in backends else 0,
+        help="Browser rendering sends small chart specs with tooltips and zoom instead of PNG images.",
+    )
     
+    # Memoized analyses and rendered figures are held in memory for the whole server process
+    with st.sidebar.expander("Cache", expanded=False):
+        stats = cache.cache_stats()
+        memo_mb = stats['bytes'].sum() / 1024 ** 2 if not stats.empty else 0.0
+        figure_info = figure_cache.get_cache().info()
+        st.caption(f"Analyses: {int(stats['entries'].sum()) if not stats.empty else 0} results, {memo_mb:,.1f} MB  \n"
+                   f"Figures: {figure_info['entries']} images, {figure_info['bytes'] / 1024 ** 2:,.1f} MB")
+        if st.button("Clear caches", width="stretch", help="Frees the memory held by cached analyses and figures; they are rebuilt on demand."):
+            cache.clear_all_caches()
+            figure_cache.get_cache().clear()
+            st.rerun()
+
     # 5. Return the loaded dataset
     return df.copy()
@@ -0,0 +1,416 @@
+import heapq
+import math
+import numpy as np
+import pandas as pd
+from core.cache import memoize
+
+# This module holds mergeable summaries (sketches) of the dataset.
+# A sketch is built once per column per time partition; answers for any
+# date range come from merging the partition sketches instead of
+# re-scanning (and sorting) the raw rows.
+
+# ---------------------------------------------------------
+# SKETCH CONFIGURATION
+# ---------------------------------------------------------
+KLL_K = 400             # Compactor size. Rank error stays well under 1%
+HEAVY_HITTER_CAPACITY = 64   # Counters per sketch. Items above n/64 occurrences are always tracked
+SKETCH_PARTITION_FREQ = 'M'
+
+
+# ==================================================================================
+# Block 1: Quantile Sketch (KLL)
+# ==================================================================================
+class KLLSketch:
+    """
+    Mergeable quantile sketch (Karnin, Lang & Liberty).
+
+    Items are kept in a stack of compactors. Level h holds items of weight 2**h;
+    when a level overflows it is sorted and every other item is promoted to the
+    next level. Sketches built on different partitions can be merged freely.
+    """
+
+    def __init__(self, k: int = KLL_K, seed: int = 0):
+        self.k = k
+        self.n = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.compactors = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def update(self, values) -> "KLLSketch":
+        """
+        Adds a batch of values (nulls are ignored).
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+
+        self.n += int(values.size)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.compactors[0] = np.concatenate([self.compactors[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """
+        Merges another sketch into this one (in place) and returns self.
+        """
+        if other.n == 0:
+            return self
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0, dtype=np.float64))
+        for level, items in enumerate(other.compactors):
+            self.compactors[level] = np.concatenate([self.compactors[level], items])
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _compress(self):
+        level = 0
+        while level < len(self.compactors):
+            items = self.compactors[level]
+            if len(items) >= self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0, dtype=np.float64))
+                items = np.sort(items)
+                # Keep one item behind when the level has an odd length
+                leftover = items[-1:] if len(items) % 2 else items[:0]
+                paired = items[:len(items) - len(leftover)]
+                offset = int(self._rng.integers(2))
+                self.compactors[level + 1] = np.concatenate([self.compactors[level + 1], paired[offset::2]])
+                self.compactors[level] = leftover
+            level += 1
+
+    def _weighted_items(self):
+        items = np.concatenate(self.compactors)
+        weights = np.concatenate([
+            np.full(len(c), 2 ** level, dtype=np.float64) for level, c in enumerate(self.compactors)
+        ])
+        order = np.argsort(items, kind='mergesort')
+        return items[order], weights[order]
+
+    def quantile(self, q):
+        """
+        Returns the approximate q-quantile(s) for q in [0, 1] (scalar or list).
+        """
+        qs = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        if self.n == 0:
+            result = np.full(qs.shape, np.nan)
+        else:
+            items, weights = self._weighted_items()
+            cum_weights = np.cumsum(weights)
+            ranks = qs * cum_weights[-1]
+            idx = np.clip(np.searchsorted(cum_weights, ranks, side='left'), 0, len(items) - 1)
+            result = items[idx]
+            # The exact extremes are tracked separately
+            result = np.where(qs <= 0, self.min, result)
+            result = np.where(qs >= 1, self.max, result)
+        return float(result[0]) if np.isscalar(q) else result
+
+    def rank(self, value) -> float:
+        """
+        Returns the approximate fraction of items <= value.
+        """
+        if self.n == 0:
+            return float('nan')
+        items, weights = self._weighted_items()
+        return float(weights[items <= value].sum() / weights.sum())
+
+    def __len__(self):
+        return self.n
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_rng')
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._rng = np.random.default_rng(self.n)
+
+
+# ==================================================================================
+# Block 2: Heavy-Hitter Sketch (Space-Saving)
+# ==================================================================================
+class SpaceSaving:
+    """
+    Mergeable top-N sketch (Metwally, Agrawal & El Abbadi).
+
+    At most `capacity` items are tracked, each with an overestimated count and
+    the maximum overestimation. Every item occurring more than n / capacity times
+    is tracked. Sketches are merged with the rule of Cafaro et al.: an item missing
+    from one side is credited with that side's smallest count (0 while it is not full).
+    """
+
+    def __init__(self, capacity: int = HEAVY_HITTER_CAPACITY):
+        self.capacity = capacity
+        self.n = 0
+        self.counts = {}
+        self.errors = {}
+
+    def _floor(self) -> int:
+        # Largest count an untracked item can have
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    def _combine(self, counts: dict, errors: dict, floor: int):
+        own_floor = self._floor()
+        combined_counts, combined_errors = {}, {}
+        for item in self.counts.keys() | counts.keys():
+            combined_counts[item] = self.counts.get(item, own_floor) + counts.get(item, floor)
+            combined_errors[item] = self.errors.get(item, own_floor) + errors.get(item, floor)
+        if len(combined_counts) > self.capacity:
+            kept = heapq.nlargest(self.capacity, combined_counts, key=combined_counts.__getitem__)
+            combined_counts = {item: combined_counts[item] for item in kept}
+            combined_errors = {item: combined_errors[item] for item in kept}
+        self.counts, self.errors = combined_counts, combined_errors
+
+    def update(self, values) -> "SpaceSaving":
+        """
+        Adds a batch of values (nulls are ignored).
+        """
+        batch = pd.Series(values).value_counts(dropna=True)
+        return self.update_counts(dict(zip(batch.index, batch.to_numpy().tolist())))
+
+    def update_counts(self, counts: dict) -> "SpaceSaving":
+        """
+        Adds pre-aggregated {item: count} pairs (exact counts).
+        """
+        if counts:
+            self._combine(counts, {}, 0)
+            self.n += int(sum(counts.values()))
+        return self
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """
+        Merges another sketch into this one (in place) and returns self.
+        """
+        if other.n == 0:
+            return self
+        self._combine(other.counts, other.errors, other._floor())
+        self.n += other.n
+        return self
+
+    def top(self, n: int = None) -> list:
+        """
+        Returns [(item, count, max_error)] for the n most frequent items, largest first.
+        The true count lies in [count - max_error, count].
+        """
+        items = sorted(self.counts, key=lambda item: (-self.counts[item], str(item)))
+        return [(item, self.counts[item], self.errors[item]) for item in items[:n]]
+
+    def __len__(self):
+        return self.n
+
+
+# ==================================================================================
+# Block 3: Correlation Moments
+# ==================================================================================
+class MomentSketch:
+    """
+    Mergeable pairwise moments of numeric columns for Pearson correlation.
+
+    For every column pair (i, j) it keeps, over the rows where both are present:
+    the count N[i, j], the mean and sum of squared deviations of column i
+    (MEAN[i, j], M2[i, j]; column j's are the transposes) and the co-moment C[i, j].
+    Batches and partitions are combined with Chan et al.'s pairwise update, so
+    the matrix matches DataFrame.corr() (pairwise-complete) for any union of
+    partitions at O(k^2) cost.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.n = np.zeros((k, k))
+        self.mean = np.zeros((k, k))
+        self.m2 = np.zeros((k, k))
+        self.comoment = np.zeros((k, k))
+
+    def update(self, df: pd.DataFrame) -> "MomentSketch":
+        """
+        Adds a batch of rows (non-numeric cells count as missing).
+        """
+        values = df[self.columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+        if len(values) == 0:
+            return self
+        present = ~np.isnan(values)
+        mask = present.astype(np.float64)
+        # Centre on the batch column means so the raw sums below do not cancel
+        with np.errstate(invalid='ignore'):
+            centre = np.nanmean(np.where(present, values, np.nan), axis=0) if present.any() else np.zeros(values.shape[1])
+        centred = np.where(present, values - np.nan_to_num(centre), 0.0)
+
+        batch = MomentSketch(self.columns)
+        batch.n = mask.T @ mask
+        sums = centred.T @ mask                 # sums[i, j]: column i over rows where j is present
+        squares = (centred ** 2).T @ mask
+        cross = centred.T @ centred
+        with np.errstate(invalid='ignore', divide='ignore'):
+            pair_mean = np.where(batch.n > 0, sums / batch.n, 0.0)
+        batch.mean = pair_mean + np.nan_to_num(centre)[:, None]
+        batch.m2 = squares - sums * pair_mean
+        batch.comoment = cross - sums * pair_mean.T
+        return self.merge(batch)
+
+    def merge(self, other: "MomentSketch") -> "MomentSketch":
+        """
+        Merges another sketch over the same columns into this one (in place) and returns self.
+        """
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge MomentSketch objects over different columns.")
+        total = self.n + other.n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(total > 0, self.n * other.n / total, 0.0)
+            share = np.where(total > 0, other.n / total, 0.0)
+        delta = other.mean - self.mean
+        self.m2 = self.m2 + other.m2 + delta ** 2 * weight
+        self.comoment = self.comoment + other.comoment + delta * delta.T * weight
+        self.mean = self.mean + delta * share
+        self.n = total
+        return self
+
+    def corr(self, columns=None) -> pd.DataFrame:
+        """
+        Pearson correlation matrix (NaN where a pair has < 2 rows or no variance).
+        """
+        columns = self.columns if columns is None else list(columns)
+        idx = [self.columns.index(col) for col in columns]
+        grid = np.ix_(idx, idx)
+        m2, n = self.m2[grid], self.n[grid]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = self.comoment[grid] / np.sqrt(m2 * m2.T)
+        result = np.where((n >= 2) & (m2 > 0) & (m2.T > 0), np.clip(result, -1.0, 1.0), np.nan)
+        return pd.DataFrame(result, index=columns, columns=columns)
+
+
+@memoize()
+def build_moment_sketch(df: pd.DataFrame, columns) -> MomentSketch:
+    """
+    One-pass moment sketch of `columns` over the whole frame.
+    """
+    return MomentSketch(columns).update(df)
+
+
+# ==================================================================================
+# Block 4: Partitioned Sketch Store
+# ==================================================================================
+def _partition_keys(df: pd.DataFrame, freq: str) -> pd.Series:
+    dates = pd.to_datetime(df['Date'], errors='coerce') if 'Date' in df.columns else pd.Series(pd.NaT, index=df.index)
+    return dates.dt.to_period(freq)
+
+
+def build_sketch_store(df: pd.DataFrame, numeric_cols=None, freq: str = SKETCH_PARTITION_FREQ,
+                       heavy_hitter_cols=None) -> dict:
+    """
+    Builds quantile and heavy-hitter sketches per column per date partition.
+
+    Args:
+        df (pd.DataFrame): Dataset with a 'Date' column (rows with invalid dates go to a NaT partition).
+        numeric_cols (list): Columns that get a quantile sketch. Defaults to all numeric columns.
+        freq (str): Pandas period frequency used to partition the rows ('D', 'M', 'Y', ...).
+        heavy_hitter_cols (list): Columns that get a top-N sketch. Defaults to none.
+
+    Returns:
+        dict: {'freq': freq, 'partitions': {period: {'quantile': {col: KLLSketch},
+        'heavy_hitters': {col: SpaceSaving}}}}
+    """
+    if numeric_cols is None:
+        numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+    heavy_hitter_cols = heavy_hitter_cols or []
+
+    store = {'freq': freq, 'partitions': {}}
+    keys = _partition_keys(df, freq)
+    if numeric_cols:
+        for period, part in df.groupby(keys, dropna=False, sort=True):
+            entry = _store_entry(store, period)
+            for col in numeric_cols:
+                entry['quantile'].setdefault(col, KLLSketch()).update(pd.to_numeric(part[col], errors='coerce'))
+
+    for col in heavy_hitter_cols:
+        # One grouped count per column; each partition then folds in its exact counts
+        pair_counts = df.groupby([keys, df[col]], dropna=False, sort=False, observed=True).size()
+        pair_counts = pair_counts[pair_counts.index.get_level_values(1).notna()]
+        for period, counts in pair_counts.groupby(level=0, dropna=False, sort=False):
+            _store_entry(store, period)['heavy_hitters'].setdefault(col, SpaceSaving()).update_counts(
+                dict(zip(counts.index.get_level_values(1), counts.to_numpy().tolist())))
+    return store
+
+
+def _store_entry(store: dict, period) -> dict:
+    entry = store['partitions'].setdefault(period, {})
+    for kind in ('quantile', 'heavy_hitters'):
+        entry.setdefault(kind, {})
+    return entry
+
+
+def merge_sketches(store: dict, kind: str, col: str, start=None, end=None):
+    """
+    Merges the sketches of one column over the partitions in [start, end].
+
+    Args:
+        store (dict): Result of build_sketch_store.
+        kind (str): 'quantile' or 'heavy_hitters'.
+        col (str): Column name.
+        start, end: Optional date bounds (anything pd.Timestamp accepts). None means unbounded.
+
+    Returns:
+        KLLSketch | SpaceSaving | None: The merged sketch, or None if the column was never sketched.
+    """
+    # Bounds as period ordinals: a partition overlaps [start, end] when its ordinal does
+    first = pd.Period(pd.Timestamp(start), store['freq']).ordinal if start is not None else None
+    last = pd.Period(pd.Timestamp(end), store['freq']).ordinal if end is not None else None
+
+    merged = None
+    for period, entry in store['partitions'].items():
+        if pd.isna(period):
+            if first is not None or last is not None:
+                continue
+        else:
+            if first is not None and period.ordinal < first:
+                continue
+            if last is not None and period.ordinal > last:
+                continue
+        sketch = entry.get(kind, {}).get(col)
+        if sketch is None:
+            continue
+        if merged is None:
+            if kind == 'quantile':
+                merged = KLLSketch(sketch.k)
+            else:
+                merged = SpaceSaving(sketch.capacity)
+        merged.merge(sketch)
+    return merged
+
+
+def approx_quantiles(store: dict, col: str, qs, start=None, end=None):
+    """
+    Returns approximate quantile(s) of a column for a date range.
+    """
+    sketch = merge_sketches(store, 'quantile', col, start, end)
+    if sketch is None:
+        return np.full(len(np.atleast_1d(qs)), np.nan) if not np.isscalar(qs) else float('nan')
+    return sketch.quantile(qs)
+
+
+def approx_top_n(store: dict, col: str, n: int = None, start=None, end=None) -> pd.DataFrame:
+    """
+    Returns the n most frequent values of a column for a date range.
+
+    Returns:
+        pd.DataFrame: [col, 'Count', 'Max_Error'] sorted by count (Count is exact when Max_Error is 0).
+        The frame's attrs hold 'total' (rows in the range) and 'tracked' (distinct values tracked).
+    """
+    sketch = merge_sketches(store, 'heavy_hitters', col, start, end)
+    top = sketch.top(n) if sketch is not None else []
+    result = pd.DataFrame(top, columns=[col, 'Count', 'Max_Error'])
+    result.attrs['total'] = sketch.n if sketch is not None else 0
+    result.attrs['tracked'] = len(sketch.counts) if sketch is not None else 0
+    return result
+
@@ -1,8 +1,12 @@
-import streamlit as st
-import matplotlib.pyplot as plt
+import matplotlib as mpl
+from matplotlib.artist import setp
 import seaborn as sns
 import pandas as pd
 import matplotlib.ticker as mtick
+from core import rolling
+from core import downsample
+from core import plot_style
+from core import plot_data
 
 # This module handles plots for Trend Analysis
 
@@ -16,16 +20,34 @@ TREND_LABEL_SIZE = 14
 TREND_TICK_SIZE = 12
 TREND_TICK_WEIGHT = 'bold'
 TREND_FIG_SIZE = (12, 6)
+# {measure} is "Violations" or the summed column's name (e.g. "Fine Amount")
+ROLLING_Y_LABELS = {
+    'mean': "Moving Average ({measure} / Day)",
+    'sum': "Rolling Total ({measure})",
+    'rate': "Rolling Share of {measure} (%)",
+}
 
-def apply_trend_plot_style():
+
+def trend_y_label(rolling_windows=None, rolling_stat='mean', value_col=None) -> str:
+    """
+    Y-axis label of a trend plot of violation counts, or of `value_col` sums when given.
+    """
+    measure = "Violations" if value_col is None else value_col.replace('_', ' ').title()
+    if rolling_windows:
+        return ROLLING_Y_LABELS.get(rolling_stat, "{measure}").format(measure=measure)
+    return "Number of Violations" if value_col is None else f"Total {measure}"
+
+def apply_trend_plot_style(theme=None):
     """
-    Applies the specific style settings for Trend Analysis plots.
-    Call this at the start of trend plot functions.
+    Applies the specific style settings for Trend Analysis plots (globally).
+    Plot functions do not call it: it is compiled once per theme by core/plot_style.py
+    and applied per figure with @plot_style.styled('trend').
     """
     # Based on streamlit current theme the canvas color is updated
-    if st.get_option("theme.base") == 'dark':
+    theme = plot_style.current_theme() if theme is None else theme
+    if theme == 'dark':
         sns.set_theme(style="dark", context="notebook")
-        plt.rcParams.update({
+        mpl.rcParams.update({
             'font.family': 'sans-serif',
             'font.size': TREND_TICK_SIZE,
             'axes.titlesize': TREND_TITLE_SIZE,
@@ -50,7 +72,7 @@ def apply_trend_plot_style():
         })
     else:
         sns.set_theme(style="whitegrid", context="notebook")
-        plt.rcParams.update({
+        mpl.rcParams.update({
             'font.family': 'sans-serif',
             'font.size': TREND_TICK_SIZE,
             'axes.titlesize': TREND_TITLE_SIZE,
@@ -65,40 +87,78 @@ def apply_trend_plot_style():
             'grid.alpha': 0.3
         })
 
+plot_style.register_style('trend', apply_trend_plot_style)
+
 # ==================================================================================
-def plot_trend_analysis_line(attribute_based_pivot, x_axis_label, line_category_label):
+@plot_style.styled('trend')
+def plot_trend_analysis_line(attribute_based_pivot, x_axis_label, line_category_label, rolling_windows=None, rolling_stat='mean', change_points=None,
+                             value_col=None):
     """
     Generates a trend line plot.
+    Lines longer than downsample.DEFAULT_POINTS are thinned with LTTB before drawing.
     
     Parameters:
     - attribute_based_pivot: DataFrame containing the pivoted data for plotting.
     - x_axis_label: Label for the X-axis.
     - line_category_label: Label for the line category (legend).
+    - rolling_windows: Optional window lengths in days (e.g. [7, 30, 90]). Requires a daily
+      rollup (see rolling.daily_rollup); each category is drawn once per window.
+    - rolling_stat: 'mean' (moving average), 'sum' (rolling total) or 'rate' (rolling share in %).
+    - change_points: Optional {column: [dates]} (see changepoint.change_point_dates); each break
+      is drawn as a dashed vertical line in the colour of its series.
+    - value_col: Column summed by the daily rollup (e.g. 'Fine_Amount'); only used for the
+      Y-axis label. None when the pivot counts violations.
     
     Returns:
     - fig: The matplotlib figure object.
     """
-    apply_trend_plot_style()
     
-    fig, ax = plt.subplots(figsize=TREND_FIG_SIZE)
+    fig, ax = plot_style.new_figure(figsize=TREND_FIG_SIZE)
     markers = ['o', '*', 'x', 's', 'p', 'd', 'h', 'D', 'H']
+    colors = mpl.rcParams['axes.prop_cycle'].by_key()['color']
+    # Daily series have too many points for markers to be readable
+    use_markers = len(attribute_based_pivot.index) <= 60
     
-    for i, col in enumerate(attribute_based_pivot.columns):
-        ax.plot(
-            attribute_based_pivot.index, 
-            attribute_based_pivot[col], 
-            marker=markers[i % len(markers)], 
-            linestyle='-', 
-            linewidth=2, 
-            label=col
-        )
+    # Long series are thinned to about one point per pixel column first (see core/downsample.py)
+    if rolling_windows:
+        rolled = rolling.rolling_metrics(attribute_based_pivot, rolling_windows, rolling_stat)
+        lines = downsample.downsample_columns(rolled)
+        linestyles = ['-', '--', ':', '-.']
+        window_labels = rolled.columns.get_level_values(0).unique()
+        for i, col in enumerate(attribute_based_pivot.columns):
+            for j, window in enumerate(window_labels):
+                ax.plot(
+                    lines[(window, col)].index,
+                    lines[(window, col)].values,
+                    color=colors[i % len(colors)],
+                    linestyle=linestyles[j % len(linestyles)],
+                    linewidth=2,
+                    label=f"{col} ({window})"
+                )
+    else:
+        lines = downsample.downsample_columns(attribute_based_pivot)
+        for i, col in enumerate(attribute_based_pivot.columns):
+            ax.plot(
+                lines[col].index, 
+                lines[col].values, 
+                marker=markers[i % len(markers)] if use_markers else None, 
+                linestyle='-', 
+                linewidth=2, 
+                color=colors[i % len(colors)],
+                label=col
+            )
+
+    if change_points:
+        for i, col in enumerate(attribute_based_pivot.columns):
+            for break_date in change_points.get(col, []):
+                ax.axvline(break_date, color=colors[i % len(colors)], linestyle='--', linewidth=1.5, alpha=0.8)
 
     ax.set_title(f"{line_category_label.replace('_',' ').title()} Trend based on {x_axis_label.replace('_',' ').title()}", fontsize=TREND_TITLE_SIZE, fontweight='bold')
     ax.set_xlabel(x_axis_label.replace(" ", " ").title(), fontsize=TREND_LABEL_SIZE, fontweight='bold')
-    ax.set_ylabel("Number of Violations", fontsize=TREND_LABEL_SIZE, fontweight='bold')
+    ax.set_ylabel(trend_y_label(rolling_windows, rolling_stat, value_col), fontsize=TREND_LABEL_SIZE, fontweight='bold')
     
-    plt.xticks(rotation=45, ha="right", fontsize=TREND_TICK_SIZE, fontweight=TREND_TICK_WEIGHT)
-    plt.yticks(fontsize=TREND_TICK_SIZE, fontweight=TREND_TICK_WEIGHT)
+    setp(ax.get_xticklabels(), rotation=45, ha="right", fontsize=TREND_TICK_SIZE, fontweight=TREND_TICK_WEIGHT)
+    setp(ax.get_yticklabels(), fontsize=TREND_TICK_SIZE, fontweight=TREND_TICK_WEIGHT)
     
     ax.grid(axis='y', linestyle='--', alpha=0.7)
     
@@ -120,6 +180,7 @@ def plot_trend_analysis_line(attribute_based_pivot, x_axis_label, line_category_
 
 
 # -------------------------------------------------------------------------------
+@plot_style.styled('trend')
 def plot_categorical_heatmap(percent_pivot, annot, x_label, y_label):
     """
     Generates a categorical heatmap.
@@ -133,9 +194,8 @@ def plot_categorical_heatmap(percent_pivot, annot, x_label, y_label):
     Returns:
     - fig: The matplotlib figure object.
     """
-    apply_trend_plot_style()
     
-    fig, ax = plt.subplots(figsize=(14, 7)) # Heatmaps might need slightly more width
+    fig, ax = plot_style.new_figure(figsize=(14, 7)) # Heatmaps might need slightly more width
     sns.heatmap(
         percent_pivot,
         annot=annot,
@@ -151,8 +211,8 @@ def plot_categorical_heatmap(percent_pivot, annot, x_label, y_label):
     ax.set_xlabel(x_label, fontsize=TREND_LABEL_SIZE, fontweight='bold')
     ax.set_ylabel(y_label, fontsize=TREND_LABEL_SIZE, fontweight='bold')
     
-    plt.xticks(rotation=45, fontweight=TREND_TICK_WEIGHT)
-    plt.yticks(fontweight=TREND_TICK_WEIGHT)
+    setp(ax.get_xticklabels(), rotation=45, fontweight=TREND_TICK_WEIGHT)
+    setp(ax.get_yticklabels(), fontweight=TREND_TICK_WEIGHT)
     
     fig.tight_layout()
     return fig
@@ -161,57 +221,45 @@ def plot_categorical_heatmap(percent_pivot, annot, x_label, y_label):
 # MOVED PLOTS FROM VISUALIZE DATA
 # -------------------------------------------------------------------------------
 
+@plot_style.styled('trend')
 def plot_peak_hour_traffic(df):
-    apply_trend_plot_style()
-    df = df.copy()
     if 'Time' in df.columns:
-        try:
-            df['hour'] = pd.to_datetime(df['Time'], format='%H:%M:%S', errors='coerce').dt.hour
-            if df['hour'].isnull().any():
-                 df['hour'] = pd.to_datetime(df['Time'], format='%H:%M', errors='coerce').dt.hour
-            if df['hour'].isnull().all():
-                 df['hour'] = df['Time'].astype(str).str.split(':').str[0].astype(float)
-        except:
-             return None
-
-        hour_counts = df['hour'].value_counts().sort_index()
-        fig, ax = plt.subplots(figsize=TREND_FIG_SIZE)
-        sns.lineplot(x=hour_counts.index, y=hour_counts.values, marker="o", linewidth=3, color="teal", ax=ax)
+        hour_counts = plot_data.hour_counts(df)
+        if hour_counts is None:
+            return None
+        fig, ax = plot_style.new_figure(figsize=TREND_FIG_SIZE)
+        sns.lineplot(x=hour_counts.index, y=hour_counts.values, marker="o", linewidth=3, color="teal", errorbar=None, ax=ax)
         ax.set_title("Peak Hour Traffic Violations", fontsize=TREND_TITLE_SIZE, fontweight='bold')
         ax.set_xlabel("Hour of the Day (0–23)", fontsize=TREND_LABEL_SIZE, fontweight='bold')
         ax.set_ylabel("Number of Violations", fontsize=TREND_LABEL_SIZE, fontweight='bold')
-        plt.xticks(range(0, 24), rotation=25, fontweight=TREND_TICK_WEIGHT)
-        plt.yticks(fontweight=TREND_TICK_WEIGHT)
-        plt.tight_layout()
-        plt.close()
+        ax.set_xticks(range(0, 24))
+        setp(ax.get_xticklabels(), rotation=25, fontweight=TREND_TICK_WEIGHT)
+        setp(ax.get_yticklabels(), fontweight=TREND_TICK_WEIGHT)
+        fig.tight_layout()
         return fig
     return None
 
+@plot_style.styled('trend')
 def plot_fines_per_year(df):
-    apply_trend_plot_style()
-    df = df.copy()
     if 'Date' in df.columns:
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-        df['Year'] = df['Date'].dt.year
-        fines_per_year = df.groupby('Year')['Fine_Amount'].sum()
+        fines_per_year = plot_data.yearly_stat(df, 'Fine_Amount', 'sum')
         
-        fig, ax = plt.subplots(figsize=TREND_FIG_SIZE)
+        fig, ax = plot_style.new_figure(figsize=TREND_FIG_SIZE)
         ax.plot(fines_per_year.index, fines_per_year.values, marker='o', linewidth=3, markersize=8, color="skyblue")
         ax.grid(True, which='both', linestyle='--', linewidth=0.9, alpha=0.5)
         ax.set_title("Total Fines Per Year", fontsize=TREND_TITLE_SIZE, fontweight='bold')
         ax.set_xlabel("Year", fontsize=TREND_LABEL_SIZE, fontweight='bold')
         ax.set_ylabel("Total Fine Amount", fontsize=TREND_LABEL_SIZE, fontweight='bold')
-        plt.xticks(rotation=25, fontweight=TREND_TICK_WEIGHT)
-        plt.yticks(fontweight=TREND_TICK_WEIGHT)
-        plt.close()
+        setp(ax.get_xticklabels(), rotation=25, fontweight=TREND_TICK_WEIGHT)
+        setp(ax.get_yticklabels(), fontweight=TREND_TICK_WEIGHT)
         return fig
     else:
         return None
 
+@plot_style.styled('trend')
 def plot_avg_fine_location_line(df):
-    apply_trend_plot_style()
-    fine_location = df.groupby('Location')['Fine_Amount'].mean().reset_index()
-    fig, ax = plt.subplots(figsize=TREND_FIG_SIZE)
+    fine_location = plot_data.group_stat(df, 'Location', 'Fine_Amount', 'mean').reset_index()
+    fig, ax = plot_style.new_figure(figsize=TREND_FIG_SIZE)
     ax.plot(
         fine_location['Location'],
         fine_location['Fine_Amount'],
@@ -223,11 +271,10 @@ def plot_avg_fine_location_line(df):
     ax.set_title("Average Fine Amount vs Location", fontsize=TREND_TITLE_SIZE, fontweight='bold')
     ax.set_xlabel("Location", fontsize=TREND_LABEL_SIZE, fontweight='bold')
     ax.set_ylabel("Average Fine Amount", fontsize=TREND_LABEL_SIZE, fontweight='bold')
-    plt.xticks(rotation=25, fontweight=TREND_TICK_WEIGHT)
-    plt.yticks(fontweight=TREND_TICK_WEIGHT)
+    setp(ax.get_xticklabels(), rotation=25, fontweight=TREND_TICK_WEIGHT)
+    setp(ax.get_yticklabels(), fontweight=TREND_TICK_WEIGHT)
     ax.grid(True)
-    plt.tight_layout()
-    plt.close()
+    fig.tight_layout()
     return fig
 
 # ==================================================================================
\ No newline at end of file
@@ -2,6 +2,11 @@ import streamlit as st
 import pandas as pd
 from streamlit_folium import st_folium
 from core import map_plot
+from core import sketches
+from core import parallel
+from core import features
+from core.crosstab import crosstab
+from core.cache import memoize
 """
 All Fields in the dataset:
     Violation_ID                  object
@@ -149,9 +154,16 @@ def find_location_columns(df, known_locations, sample_size=20, threshold=0.8) ->
 # Block 1: Data Quality Analysis Functions
 # ===================== Data Quality Analysis Functions ============================
 
-def get_data_quality_analysis(df: pd.DataFrame) -> pd.DataFrame:
+def get_data_quality_analysis(df: pd.DataFrame, sketch_store: dict = None) -> pd.DataFrame:
     """
     Calculates missing, unique, and duplicate statistics for each column.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to analyze.
+        sketch_store (dict): Optional result of sketches.build_sketch_store for the same rows.
+            When given, quartiles come from the merged quantile sketches instead of
+            sorting the full columns. Unique counts are always exact, since the
+            duplicate share is derived from them.
     
     Returns:
         pd.DataFrame: A formatted DataFrame with percentage metrics.
@@ -172,8 +184,11 @@ def get_data_quality_analysis(df: pd.DataFrame) -> pd.DataFrame:
         # Outlier Calculation (IQR Method) for numeric columns
         outlier_pct = 0.0
         if pd.api.types.is_numeric_dtype(df[col]):
-            Q1 = df[col].quantile(0.25)
-            Q3 = df[col].quantile(0.75)
+            if sketch_store is not None:
+                Q1, Q3 = sketches.approx_quantiles(sketch_store, col, [0.25, 0.75])
+            else:
+                Q1 = df[col].quantile(0.25)
+                Q3 = df[col].quantile(0.75)
             IQR = Q3 - Q1
             lower_bound = Q1 - 1.5 * IQR
             upper_bound = Q3 + 1.5 * IQR
@@ -200,6 +215,7 @@ def get_data_quality_analysis(df: pd.DataFrame) -> pd.DataFrame:
 # Block 2: Numerical Analysis Functions (Tabular/Grouped)
 # ===================== Numerical Analysis Functions ===============================
 
+@memoize()
 def get_violation_stats_table(df: pd.DataFrame) -> pd.DataFrame:
     """
     Aggregates Fine Amount by Violation Type (Count, Sum, Mean, Min, Max).
@@ -212,6 +228,7 @@ def get_violation_stats_table(df: pd.DataFrame) -> pd.DataFrame:
     stats = stats.sort_values(by='Total Fines', ascending=False)
     return stats
 # -------------------------------------------------------------------------------
+@memoize()
 def get_demographic_pivot(df: pd.DataFrame) -> pd.DataFrame:
     """
     Creates a pivot table of Violation Counts by Violation Type (Rows) and Driver Gender (Columns).
@@ -219,11 +236,12 @@ def get_demographic_pivot(df: pd.DataFrame) -> pd.DataFrame:
     if 'Violation_Type' not in df.columns or 'Driver_Gender' not in df.columns:
         return pd.DataFrame()
     
-    pivot = df.pivot_table(index='Violation_Type', columns='Driver_Gender', values='Violation_ID', aggfunc='count', fill_value=0)
+    pivot = crosstab(df['Violation_Type'], df['Driver_Gender'], values=df['Violation_ID'], aggfunc='count')
     pivot['Total'] = pivot.sum(axis=1)
     pivot = pivot.sort_values(by='Total', ascending=False)
     return pivot
 # -------------------------------------------------------------------------------
+@memoize()
 def get_vehicle_analysis_table(df: pd.DataFrame) -> pd.DataFrame:
     """
     Aggregates fines and counts by Vehicle Type and Model Year.
@@ -232,11 +250,12 @@ def get_vehicle_analysis_table(df: pd.DataFrame) -> pd.DataFrame:
     if not all(col in df.columns for col in cols_needed):
         return pd.DataFrame()
         
-    stats = df.groupby(['Vehicle_Type', 'Vehicle_Model_Year'])['Fine_Amount'].agg(['count', 'mean']).reset_index()
+    stats = parallel.parallel_groupby_agg(df, ['Vehicle_Type', 'Vehicle_Model_Year'], {'Fine_Amount': ['count', 'mean']})['Fine_Amount'].reset_index()
     stats.columns = ['Vehicle Type', 'Model Year', 'Violation Count', 'Avg Fine']
     stats = stats.sort_values(by='Violation Count', ascending=False)
     return stats
 # -------------------------------------------------------------------------------
+@memoize()
 def get_speeding_analysis_by_zone(df: pd.DataFrame) -> pd.DataFrame:
     """
     Analyzes speeding violations grouped by Speed Limit zones.
@@ -245,17 +264,17 @@ def get_speeding_analysis_by_zone(df: pd.DataFrame) -> pd.DataFrame:
     if not all(col in df.columns for col in cols_needed):
         return pd.DataFrame()
     
-    df_speed = df.copy()
-    df_speed['Excess_Speed'] = df_speed['Recorded_Speed'] - df_speed['Speed_Limit']
-    df_speed = df_speed[df_speed['Excess_Speed'] > 0] # Only actual speeding
+    df_speed = features.ensure_features(df, ['Speed_Exceeded'])
+    df_speed = df_speed[df_speed['Speed_Exceeded'] > 0] # Only actual speeding
     
     if df_speed.empty:
         return pd.DataFrame()
 
-    stats = df_speed.groupby('Speed_Limit')['Excess_Speed'].agg(['count', 'mean', 'max']).reset_index()
+    stats = df_speed.groupby('Speed_Limit')['Speed_Exceeded'].agg(['count', 'mean', 'max']).reset_index()
     stats.columns = ['Speed Limit Zone', 'Speeding Incidents', 'Avg Excess Speed', 'Max Excess Speed']
     return stats
 # -------------------------------------------------------------------------------
+@memoize()
 def get_environmental_stats(df: pd.DataFrame) -> pd.DataFrame:
     """
     Grouped analysis of violations by Weather Condition and Road Condition.
@@ -268,6 +287,7 @@ def get_environmental_stats(df: pd.DataFrame) -> pd.DataFrame:
     stats = stats.sort_values(by='Violation Count', ascending=False)
     return stats
 # -------------------------------------------------------------------------------
+@memoize()
 def get_hourly_patterns_table(df: pd.DataFrame) -> pd.DataFrame:
     """
     Pivot table of Violation Counts by Day of Week vs Hour of Day.
@@ -284,10 +304,11 @@ def get_hourly_patterns_table(df: pd.DataFrame) -> pd.DataFrame:
     days_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
     temp_df['Day'] = pd.Categorical(temp_df['Day'], categories=days_order, ordered=True)
     
-    # Fix FutureWarning: specify observed=False for categorical data
-    pivot = temp_df.pivot_table(index='Day', columns='Hour', values='Violation_ID', aggfunc='count', fill_value=0, observed=False)
+    # All seven days are kept even when some have no violations
+    pivot = crosstab(temp_df['Day'], temp_df['Hour'], values=temp_df['Violation_ID'], aggfunc='count')
     return pivot
 # -------------------------------------------------------------------------------
+@memoize()
 def get_custom_grouping(df: pd.DataFrame, group_cols: list, agg_cols: list, agg_funcs: list) -> pd.DataFrame:
     """
     Dynamically groups the dataframe based on user input.
@@ -299,7 +320,8 @@ def get_custom_grouping(df: pd.DataFrame, group_cols: list, agg_cols: list, agg_
     agg_dict = {col: agg_funcs for col in agg_cols}
     
     try:
-        grouped_df = df.groupby(group_cols).agg(agg_dict).reset_index()
+        # Large inputs are split by date range and aggregated on the process pool
+        grouped_df = parallel.parallel_groupby_agg(df, group_cols, agg_dict).reset_index()
         
         # Flatten MultiIndex columns (e.g., ('Fine_Amount', 'sum') -> 'Fine_Amount_sum')
         new_cols = []
@@ -328,9 +350,11 @@ def get_custom_grouping(df: pd.DataFrame, group_cols: list, agg_cols: list, agg_
 # Block 4: Map Visualization Functions
 # ========================= Map Visualization Functions ==========================
 
-def render_choropleth_map_on_page(map_data, geojson_data, location_col, value_col, state_prop_name, color_theme="YlGnBu", title="Map"):
+def render_choropleth_map_on_page(map_data, geojson_data, location_col, value_col, state_prop_name, color_theme="YlGnBu", title="Map", categorical=False):
     """
     Renders a Folium Choropleth map using the core module and displays it on Streamlit.
+    With categorical=True, value_col holds labels (e.g. cluster IDs): each one gets its own
+    colour from the qualitative palette `color_theme` instead of a binned scale.
     """
     if map_data is None or map_data.empty:
         st.warning(f"No data available for {title}.")
@@ -352,7 +376,11 @@ def render_choropleth_map_on_page(map_data, geojson_data, location_col, value_co
         """, unsafe_allow_html=True)
 
         # Generate Map Object using core Logic
-        m = map_plot.plot_choropleth_map(map_data, geojson_data, location_col, value_col, state_prop_name, color_theme)
+        if categorical:
+            category_colors = map_plot.category_colors(sorted(map_data[value_col].unique()), color_theme)
+            m = map_plot.plot_category_map(map_data, geojson_data, location_col, value_col, state_prop_name, category_colors)
+        else:
+            m = map_plot.plot_choropleth_map(map_data, geojson_data, location_col, value_col, state_prop_name, color_theme)
         st_folium(m, width='stretch', height=500, key=f"map_{title.replace(' ', '_')}", returned_objects=[])
 
     with col2:
@@ -361,7 +389,17 @@ def render_choropleth_map_on_page(map_data, geojson_data, location_col, value_co
         # for Fine Amount -> show Total Fine Amount Rs.(Sum)
         # For Driver's Age -> show Total Drivers(Avg)
 
-        if pd.api.types.is_numeric_dtype(map_data[value_col]) and title == "Violations Count":
+        if categorical:
+            st.metric(label=f"Number of {value_col}s", value=len(category_colors), border=True)
+            # Legend: one swatch per category
+            st.markdown("".join(
+                f'<div style="display: flex; align-items: center; margin-bottom: 4px;">'
+                f'<div style="width: 20px; height: 20px; background-color: {color}; opacity: 0.7; margin-right: 10px; border: 1px solid #ccc;"></div>'
+                f'<span>{value_col} {category}</span></div>'
+                for category, color in category_colors.items()
+            ), unsafe_allow_html=True)
+
+        elif pd.api.types.is_numeric_dtype(map_data[value_col]) and title == "Violations Count":
             total_val = map_data[value_col].sum()
             st.metric(label="Total Violations Count", value=f"{total_val:,.0f}")
 
@@ -377,10 +415,11 @@ def render_choropleth_map_on_page(map_data, geojson_data, location_col, value_co
             total_count = map_data.shape[0]
             st.metric(label="Total Records", value=total_count, border=True)
 
-        # Top 5 Locations Table
-        st.caption(f"Top 5 {location_col.title()}s")
-        top_5 = map_data.sort_values(by=value_col, ascending=False).head(5)
-        st.dataframe(top_5, hide_index=True, width='stretch')
+        # Top 5 Locations Table (a ranking means nothing for labels)
+        if not categorical:
+            st.caption(f"Top 5 {location_col.title()}s")
+            top_5 = map_data.sort_values(by=value_col, ascending=False).head(5)
+            st.dataframe(top_5, hide_index=True, width='stretch')
         
         # View Full Data Expander
         with st.expander("Full Data"):
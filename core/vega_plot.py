@@ -0,0 +1,321 @@
+import functools
+import altair as alt
+import numpy as np
+import pandas as pd
+import streamlit as st
+from core import plot_data
+from core import dashboard_plot, visualize_plot, trend_plot
+from core import rolling
+from core import downsample
+from core.crosstab import crosstab
+from core.features import ensure_features
+from core.severity import compute_severity_score
+
+# This module is the browser-side rendering backend.
+# For a plot function of dashboard_plot / visualize_plot / trend_plot it builds
+# a Vega-Lite chart (via Altair) over the same memoized aggregate from
+# core/plot_data.py. Only the aggregate (a few dozen rows) is sent to the
+# browser, which draws the chart with tooltips and zoom; the server does no
+# rasterizing. figure_cache.show_plot uses it while the sidebar's chart
+# rendering option is set to the browser and falls back to PNGs for plots
+# without a Vega-Lite version here.
+
+# ---------------------------------------------------------
+# VEGA-LITE CONFIGURATION
+# ---------------------------------------------------------
+CHART_BACKENDS = {
+    "Server (PNG images)": 'png',
+    "Browser (interactive Vega-Lite)": 'vega',
+}
+BACKEND_STATE_KEY = 'chart_backend'
+DEFAULT_BACKEND = 'png'
+CHART_HEIGHT = 420
+LABEL_ANGLE = -25
+TITLE_FONT_SIZE = 16
+MAX_CHART_ROWS = 4000      # Points sent per line chart (Altair refuses more than 5000); long series are downsampled
+
+_CHARTS = {}
+
+
+# ==================================================================================
+# Block 1: Backend Selection & Registry
+# ==================================================================================
+def active_backend() -> str:
+    """
+    'png' or 'vega', as chosen with the sidebar's chart rendering option.
+    """
+    try:
+        label = st.session_state.get(BACKEND_STATE_KEY)
+    except Exception:
+        return DEFAULT_BACKEND
+    return CHART_BACKENDS.get(label, DEFAULT_BACKEND)
+
+
+def renders(*plot_funcs):
+    """
+    Decorator: registers a chart builder for matplotlib plot functions with the same signature.
+    """
+    def decorator(builder):
+        for plot_func in plot_funcs:
+            _CHARTS[plot_func] = builder
+        return builder
+    return decorator
+
+
+def _resolve(plot_func, args, kwargs):
+    # functools.partial(plot_func, ...) -> (plot_func, full args, full kwargs)
+    while isinstance(plot_func, functools.partial):
+        args = plot_func.args + tuple(args)
+        kwargs = {**plot_func.keywords, **kwargs}
+        plot_func = plot_func.func
+    return plot_func, args, kwargs
+
+
+def has_chart(plot_func) -> bool:
+    return _resolve(plot_func, (), {})[0] in _CHARTS
+
+
+def build_chart(plot_func, *args, **kwargs):
+    """
+    The Vega-Lite version of plot_func(*args, **kwargs).
+
+    Returns:
+        alt.Chart | None: None when the plot function would not produce a figure either.
+    """
+    plot_func, args, kwargs = _resolve(plot_func, args, kwargs)
+    return _CHARTS[plot_func](*args, **kwargs)
+
+
+# ==================================================================================
+# Block 2: Chart Templates
+# ==================================================================================
+def _finish(chart, title: str, zoom: bool = False):
+    chart = chart.properties(title=alt.TitleParams(title, fontSize=TITLE_FONT_SIZE), height=CHART_HEIGHT)
+    return chart.interactive(bind_y=False) if zoom else chart
+
+
+def _frame(values: pd.Series, category: str, value: str) -> pd.DataFrame:
+    data = values.rename_axis(category).reset_index(name=value)
+    data[category] = data[category].astype(str)
+    return data
+
+
+def _category_bars(values: pd.Series, category: str, value: str, title: str, scheme: str = 'tableau10',
+                   horizontal: bool = False, value_format: str = ',.0f'):
+    data = _frame(values, category, value)
+    order = list(data[category])
+    category_enc = alt.X(f'{category}:N', sort=order, title=category.replace('_', ' '),
+                         axis=alt.Axis(labelAngle=LABEL_ANGLE))
+    value_enc = alt.Y(f'{value}:Q', title=value.replace('_', ' '))
+    if horizontal:
+        category_enc = alt.Y(f'{category}:N', sort=order, title=category.replace('_', ' '))
+        value_enc = alt.X(f'{value}:Q', title=value.replace('_', ' '))
+    chart = alt.Chart(data).mark_bar().encode(
+        category_enc, value_enc,
+        color=alt.Color(f'{category}:N', sort=order, scale=alt.Scale(scheme=scheme), legend=None),
+        tooltip=[alt.Tooltip(f'{category}:N'), alt.Tooltip(f'{value}:Q', format=value_format)],
+    )
+    return _finish(chart, title)
+
+
+def _share_arcs(values: pd.Series, category: str, value: str, title: str, scheme: str = 'tableau10',
+                inner_radius: int = 0):
+    data = _frame(values, category, value)
+    data['Share'] = data[value] / data[value].sum() if data[value].sum() else 0.0
+    chart = alt.Chart(data).mark_arc(innerRadius=inner_radius, stroke='white').encode(
+        theta=alt.Theta(f'{value}:Q'),
+        color=alt.Color(f'{category}:N', sort=list(data[category]), scale=alt.Scale(scheme=scheme),
+                        title=category.replace('_', ' ')),
+        order=alt.Order(f'{value}:Q', sort='descending'),
+        tooltip=[alt.Tooltip(f'{category}:N'), alt.Tooltip(f'{value}:Q', format=',.0f'),
+                 alt.Tooltip('Share:Q', format='.1%')],
+    )
+    return _finish(chart, title)
+
+
+def _heatmap(table: pd.DataFrame, x_title: str, y_title: str, title: str, scheme: str,
+             value_format: str = ',.0f', labels: pd.DataFrame = None, domain=None, reverse: bool = False):
+    data = table.rename_axis(index='Row', columns='Column').stack(future_stack=True).rename('Value').reset_index()
+    data['Row'] = data['Row'].astype(str)
+    data['Column'] = data['Column'].astype(str)
+    if labels is not None:
+        data['Label'] = np.asarray(labels, dtype=object).ravel()
+    x = alt.X('Column:N', sort=[str(c) for c in table.columns], title=x_title, axis=alt.Axis(labelAngle=LABEL_ANGLE))
+    y = alt.Y('Row:N', sort=[str(r) for r in table.index], title=y_title)
+    scale = alt.Scale(scheme=scheme, domain=domain, reverse=reverse) if domain else alt.Scale(scheme=scheme, reverse=reverse)
+    cells = alt.Chart(data).mark_rect().encode(
+        x, y, color=alt.Color('Value:Q', scale=scale, title=None),
+        tooltip=['Row:N', 'Column:N', alt.Tooltip('Value:Q', format=value_format)],
+    )
+    text = alt.Chart(data).mark_text(fontWeight='bold').encode(
+        x, y, text='Label:N' if labels is not None else alt.Text('Value:Q', format=value_format),
+    )
+    return _finish(cells + text, title)
+
+
+def _line(values: pd.Series, x: str, y: str, title: str, color: str, x_type: str = 'O'):
+    data = values.rename_axis(x).reset_index(name=y)
+    chart = alt.Chart(data).mark_line(point=True, color=color, strokeWidth=3).encode(
+        alt.X(f'{x}:{x_type}', title=x.replace('_', ' ')),
+        alt.Y(f'{y}:Q', title=y.replace('_', ' ')),
+        tooltip=[f'{x}:{x_type}', alt.Tooltip(f'{y}:Q', format=',.2f')],
+    )
+    return _finish(chart, title, zoom=x_type in ('Q', 'T'))
+
+
+# ==================================================================================
+# Block 3: Charts for the Plot Modules
+# ==================================================================================
+@renders(visualize_plot.plot_speed_exceeded_vs_weather, visualize_plot.plot_speed_exceeded_vs_weather_2)
+def chart_speed_exceeded_vs_weather(df):
+    df = ensure_features(df, ['Speed_Exceeded'])
+    avg_speed = plot_data.group_stat(df, 'Weather_Condition', 'Speed_Exceeded', 'mean', order='value')
+    return _category_bars(avg_speed.rename('Average_Speed_Exceeded'), 'Weather_Condition', 'Average_Speed_Exceeded',
+                          "Average Speed Exceeded vs Weather Condition", scheme='magma', value_format='.1f')
+
+
+@renders(visualize_plot.plot_bar_or_count)
+def chart_bar_or_count(df, x_col, y_col):
+    if y_col == 'Count':
+        return _category_bars(plot_data.group_stat(df, x_col, order='value'), x_col, 'Count', f"Count of {x_col}")
+    means = plot_data.group_stat(df, x_col, y_col, 'mean', order='appearance')
+    return _category_bars(means, x_col, f"Mean_{y_col}", f"Mean of {y_col} by {x_col}", value_format=',.2f')
+
+
+@renders(visualize_plot.plot_top_5_locations_violation)
+def chart_top_5_locations_violation(df, sketch_store=None):
+    counts = visualize_plot.top_location_counts(df, 5, sketch_store)
+    return _category_bars(counts, 'Location', 'Count', "Top 5 Locations (Violations)", scheme='viridis')
+
+
+@renders(visualize_plot.plot_vehicle_type_vs_violation_type, dashboard_plot.plot_vehicle_type_vs_violation_type)
+def chart_vehicle_type_vs_violation_type(df):
+    counts = plot_data.count_table(df, 'Violation_Type', 'Vehicle_Type')
+    violation_order = [str(v) for v in counts['Violation_Type'].cat.categories]
+    vehicle_order = [str(v) for v in counts['Vehicle_Type'].cat.categories]
+    counts = counts.astype({'Violation_Type': str, 'Vehicle_Type': str})
+    chart = alt.Chart(counts).mark_bar().encode(
+        alt.X('Violation_Type:N', sort=violation_order, title="Violation Type", axis=alt.Axis(labelAngle=LABEL_ANGLE)),
+        alt.Y('Count:Q', title="Number of Violations"),
+        xOffset=alt.XOffset('Vehicle_Type:N', sort=vehicle_order),
+        color=alt.Color('Vehicle_Type:N', sort=vehicle_order, title="Vehicle Type"),
+        tooltip=['Violation_Type:N', 'Vehicle_Type:N', 'Count:Q'],
+    )
+    return _finish(chart, "Vehicle Type vs Violation Type")
+
+
+@renders(visualize_plot.plot_violation_type_percentage)
+def chart_violation_type_percentage(df):
+    counts = plot_data.group_stat(df, 'Violation_Type', order='value')
+    return _share_arcs(counts, 'Violation_Type', 'Violations', "Percentage of Traffic Violation Types")
+
+
+@renders(visualize_plot.plot_fine_vs_vehicle_pie)
+def chart_fine_vs_vehicle_pie(df):
+    fines = plot_data.group_stat(df, 'Vehicle_Type', 'Fine_Amount', 'sum')
+    return _share_arcs(fines, 'Vehicle_Type', 'Total_Fines', "Total Fines Paid by Vehicle Type",
+                       scheme='set2', inner_radius=90)
+
+
+@renders(visualize_plot.plot_speeding_vs_road_condition)
+def chart_speeding_vs_road_condition(df):
+    if 'Recorded_Speed' not in df.columns or 'Speed_Limit' not in df.columns:
+        return None
+    df = ensure_features(df, ['Speed_Exceeded'])
+    avg_speeding = plot_data.group_stat(df[df['Speed_Exceeded'] > 0], 'Road_Condition', 'Speed_Exceeded', 'mean')
+    return _category_bars(avg_speeding, 'Road_Condition', 'Average_Speeding', "Average Speeding vs Road Conditions",
+                          scheme='magma', horizontal=True, value_format='.1f')
+
+
+@renders(visualize_plot.plot_age_alcohol_heatmap)
+def chart_age_alcohol_heatmap(df):
+    df = ensure_features(df, ['Age_Group', 'Alcohol_Range'])
+    table = plot_data.cross_table(df, 'Age_Group', 'Alcohol_Range', observed=True)
+    return _heatmap(table, "Alcohol Test Classification", "Age Group", "Age Group vs Alcohol Risk Heatmap", 'yelloworangered')
+
+
+@renders(visualize_plot.plot_driver_risk_by_age)
+def chart_driver_risk_by_age(df):
+    df = ensure_features(df, ['Age_Group', 'Risk_Level'])
+    risk_by_age = plot_data.group_stat(df, 'Age_Group', 'Risk_Level', 'mean').dropna()
+    risk_by_age.index = risk_by_age.index.astype(str)
+    return _line(risk_by_age.rename_axis('Age_Group'), 'Age_Group', 'Average_Risk_Level',
+                 "Average Driver Risk Level by Age Group", color='#D43F6A')
+
+
+@renders(dashboard_plot.plot_severity_heatmap_by_location)
+def chart_severity_heatmap_by_location(df):
+    table = crosstab(df['Location'], df['Violation_Type'], values=compute_severity_score(df), aggfunc='mean')
+    return _heatmap(table, "Violation Type", "Location", "Average Severity Score by Location and Violation Type",
+                    'magma', value_format='.1f', reverse=True)
+
+
+@renders(trend_plot.plot_trend_analysis_line)
+def chart_trend_analysis_line(attribute_based_pivot, x_axis_label, line_category_label, rolling_windows=None,
+                              rolling_stat='mean', change_points=None, value_col=None):
+    category = line_category_label.replace('_', ' ').title()
+    temporal = isinstance(attribute_based_pivot.index, pd.DatetimeIndex)
+    x_order = None if temporal else [str(x) for x in attribute_based_pivot.index]
+
+    if rolling_windows:
+        wide = rolling.rolling_metrics(attribute_based_pivot, rolling_windows, rolling_stat)
+    else:
+        wide = pd.concat({'': attribute_based_pivot}, axis=1)
+    y_title = trend_plot.trend_y_label(rolling_windows, rolling_stat, value_col)
+    # LTTB keeps each line's shape within the row budget shared by all lines
+    n_out = min(downsample.DEFAULT_POINTS, max(3, MAX_CHART_ROWS // max(1, wide.shape[1])))
+    thinned = downsample.downsample_columns(wide, n_out)
+    data = pd.concat({key: series.rename_axis('X') for key, series in thinned.items()}, names=['Window', 'Category'])
+    data = data.rename('Value').reset_index()
+    data['Category'] = data['Category'].astype(str)
+    if not temporal:
+        data['X'] = data['X'].astype(str)
+
+    x = alt.X('X:T' if temporal else 'X:O', sort=x_order, title=x_axis_label.title(),
+              axis=alt.Axis(labelAngle=-45))
+    encodings = dict(
+        color=alt.Color('Category:N', title=category),
+        tooltip=[alt.Tooltip('X:T' if temporal else 'X:O', title=x_axis_label.title()), 'Category:N',
+                 alt.Tooltip('Value:Q', format=',.2f')],
+    )
+    if rolling_windows:
+        encodings['strokeDash'] = alt.StrokeDash('Window:N', title="Window")
+        encodings['tooltip'].insert(2, 'Window:N')
+    # Markers only while the points are few enough to be readable, as in the matplotlib version
+    lines = alt.Chart(data).mark_line(point=len(attribute_based_pivot.index) <= 60, strokeWidth=2).encode(
+        x, alt.Y('Value:Q', title=y_title), **encodings)
+
+    chart = lines
+    if change_points and temporal:
+        breaks = pd.DataFrame([(str(col), date) for col, dates in change_points.items() for date in dates],
+                              columns=['Category', 'X'])
+        if not breaks.empty:
+            chart = lines + alt.Chart(breaks).mark_rule(strokeDash=[6, 4], strokeWidth=1.5).encode(
+                alt.X('X:T'), color=alt.Color('Category:N'), tooltip=['Category:N', alt.Tooltip('X:T', title="Change Point")])
+    title = f"{category} Trend based on {x_axis_label.replace('_', ' ').title()}"
+    return _finish(chart, title, zoom=temporal)
+
+
+@renders(trend_plot.plot_categorical_heatmap)
+def chart_categorical_heatmap(percent_pivot, annot, x_label, y_label):
+    return _heatmap(percent_pivot, x_label, y_label, f"{y_label} vs {x_label} (%)", 'redblue',
+                    value_format='.1f', labels=annot, domain=[0, 100], reverse=True)
+
+
+@renders(trend_plot.plot_peak_hour_traffic)
+def chart_peak_hour_traffic(df):
+    if 'Time' not in df.columns:
+        return None
+    hour_counts = plot_data.hour_counts(df)
+    if hour_counts is None:
+        return None
+    return _line(hour_counts.rename_axis('Hour'), 'Hour', 'Violations', "Peak Hour Traffic Violations",
+                 color='teal', x_type='Q')
+
+
+@renders(trend_plot.plot_fines_per_year)
+def chart_fines_per_year(df):
+    if 'Date' not in df.columns:
+        return None
+    return _line(plot_data.yearly_stat(df, 'Fine_Amount', 'sum'), 'Year', 'Total_Fine_Amount',
+                 "Total Fines Per Year", color='skyblue')
@@ -1,7 +1,14 @@
-import matplotlib.pyplot as plt
+import matplotlib as mpl
+from matplotlib.artist import setp
 import seaborn as sns
 import pandas as pd
 import matplotlib.ticker as mtick
+from core.crosstab import crosstab
+from core.severity import compute_severity_score
+from core import plot_style
+from core import plot_data
+from core.features import ensure_features
+from core import sketches
 
 # ---------------------------------------------------------
 # UNIFORM STYLE CONFIGURATION
@@ -22,11 +29,12 @@ DISTINCT_COLORS = sns.color_palette("deep")
 
 def apply_plot_style():
     """
-    Applies the uniform style settings to matplotlib and seaborn.
-    Call this at the start of plot functions or globally.
+    Applies the uniform style settings to matplotlib and seaborn (globally).
+    Plot functions do not call it: it is compiled once by core/plot_style.py
+    and applied per figure with @plot_style.styled('visualize').
     """
     sns.set_theme(style="whitegrid", context="talk", palette=UNI_PALETTE)
-    plt.rcParams.update({
+    mpl.rcParams.update({
         'font.family': 'sans-serif',
         'font.size': TICK_SIZE,
         'axes.titlesize': TITLE_SIZE,
@@ -46,27 +54,31 @@ def apply_plot_style():
 
 # Apply global style on module load
 apply_plot_style()
+plot_style.register_style('visualize', lambda theme: apply_plot_style())
 
 # ---------------------------------------------------------
 # PLOT FUNCTIONS
 # ---------------------------------------------------------
+# Every plot reads a small memoized aggregate from core/plot_data.py and draws
+# that; seaborn gets one value per bar and errorbar=None.
 
+@plot_style.styled('visualize')
 def plot_speed_exceeded_vs_weather(df):
     """
     Plots Average Speed Exceeded vs Weather Condition.
     """
-    apply_plot_style()
-    df['Speed_Exceeded'] = df['Recorded_Speed'] - df['Speed_Limit']
+    df = ensure_features(df, ['Speed_Exceeded'])
 
-    fig, ax = plt.subplots(figsize=FIG_SIZE)
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
 
-    avg_speed = df.groupby('Weather_Condition')['Speed_Exceeded'].mean().sort_values(ascending=False)
+    avg_speed = plot_data.group_stat(df, 'Weather_Condition', 'Speed_Exceeded', 'mean', order='value')
 
     sns.barplot(
         x=avg_speed.index,
         y=avg_speed.values,
         hue=avg_speed.index,
         palette='magma', # Intensity based
+        errorbar=None,
         ax=ax,
         legend=False
     )
@@ -79,19 +91,19 @@ def plot_speed_exceeded_vs_weather(df):
     ax.set_xlabel("Weather Condition")
     ax.set_ylabel("Average Speed Exceeded (km/h)")
 
-    plt.xticks(rotation=25, fontweight=TICK_WEIGHT)
-    plt.yticks(fontweight=TICK_WEIGHT)
-    plt.tight_layout()
+    setp(ax.get_xticklabels(), rotation=25, fontweight=TICK_WEIGHT)
+    setp(ax.get_yticklabels(), fontweight=TICK_WEIGHT)
+    fig.tight_layout()
     return fig
 
+@plot_style.styled('visualize')
 def plot_avg_fine_by_violation_type(df):
     """
     Plots Average Fine Amount by Violation Type (Scatter Plot).
     """
-    apply_plot_style()
-    fig, ax = plt.subplots(figsize=FIG_SIZE)
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
 
-    avg_fines = df.groupby('Violation_Type')['Fine_Amount'].mean().sort_values(ascending=False)
+    avg_fines = plot_data.group_stat(df, 'Violation_Type', 'Fine_Amount', 'mean', order='value')
 
     sns.scatterplot(
         x=avg_fines.index, 
@@ -108,57 +120,61 @@ def plot_avg_fine_by_violation_type(df):
     ax.set_xlabel("Violation Type")
     ax.set_ylabel("Average Fine Amount (₹)")
 
-    plt.xticks(rotation=25, fontweight=TICK_WEIGHT)
-    plt.yticks(fontweight=TICK_WEIGHT)
-    plt.tight_layout()
+    setp(ax.get_xticklabels(), rotation=25, fontweight=TICK_WEIGHT)
+    setp(ax.get_yticklabels(), fontweight=TICK_WEIGHT)
+    fig.tight_layout()
     return fig
 
+@plot_style.styled('visualize')
 def plot_bar_or_count(df, x_col, y_col):
     """
     Generates a bar plot or count plot based on the Y-axis selection.
     """
-    apply_plot_style()
-    fig, ax = plt.subplots(figsize=FIG_SIZE)
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
 
     if y_col == 'Count':
-        sns.countplot(x=x_col, data=df, ax=ax, order=df[x_col].value_counts().index, palette=UNI_PALETTE)
+        heights = plot_data.group_stat(df, x_col, order='value')
         ax.set_title(f"Count of {x_col}")
         ax.set_ylabel("Count")
     else:
-        sns.barplot(x=x_col, y=y_col, hue=x_col, legend=False, data=df, ax=ax, estimator=lambda x: x.mean(), palette=UNI_PALETTE)
+        heights = plot_data.group_stat(df, x_col, y_col, 'mean', order='appearance')
         ax.set_title(f"Mean of {y_col} by {x_col}")
         ax.set_ylabel(f"Mean {y_col}")
+    order = list(heights.index)
+    sns.barplot(x=heights.index, y=heights.values, order=order, hue=heights.index, hue_order=order,
+                legend=False, errorbar=None, palette=UNI_PALETTE, ax=ax)
 
     ax.set_xlabel(x_col)
     ax.set_xlabel(x_col)
     ax.tick_params(axis='x', rotation=25, labelsize=TICK_SIZE, labelcolor='black')
     # Apply weight manually since tick_params doesn't support fontweight directly easily for all backends in one go, 
-    # but let's use plt.setp for reliability or just handle axis ticks.
+    # but let's use setp for reliability or just handle axis ticks.
     for label in ax.get_xticklabels() + ax.get_yticklabels():
         label.set_fontweight(TICK_WEIGHT)
     fig.tight_layout()
     return fig
 
+@plot_style.styled('visualize')
 def plot_correlation_heatmap(df, numerical_cols):
     """
     Plots a correlation heatmap for numerical columns.
     """
-    apply_plot_style()
-    corr_matrix = df[numerical_cols].corr()
+    corr_matrix = sketches.build_moment_sketch(df, list(numerical_cols)).corr()
 
-    fig = plt.figure(figsize=FIG_SIZE)
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
     sns.heatmap(
         corr_matrix, 
         annot=True, 
         cmap='coolwarm', 
         linewidths=0.5,  
         fmt=".2f",
-        annot_kws={"size": TICK_SIZE, "weight": "bold"}
+        annot_kws={"size": TICK_SIZE, "weight": "bold"},
+        ax=ax
     )
-    plt.title("Numerical Correlation Matrix")
-    plt.xticks(rotation=25, fontweight=TICK_WEIGHT)
-    plt.yticks(fontweight=TICK_WEIGHT)
-    plt.tight_layout()
+    ax.set_title("Numerical Correlation Matrix")
+    setp(ax.get_xticklabels(), rotation=25, fontweight=TICK_WEIGHT)
+    setp(ax.get_yticklabels(), fontweight=TICK_WEIGHT)
+    fig.tight_layout()
     return fig
 
 # ---------------------------------------------------------
@@ -167,44 +183,51 @@ def plot_correlation_heatmap(df, numerical_cols):
 
 # --- MONIKA'S PLOTS ---
 
-def plot_top_5_locations_violation(df):
-    apply_plot_style()
-    fig = plt.figure(figsize=FIG_SIZE)
-    Location_Count = df['Location'].value_counts().head(5)
-    sns.barplot(x=Location_Count.index, y=Location_Count.values, hue=Location_Count.index, legend=False, palette="viridis")
-    plt.title("Top 5 Locations (Violations)")
-    plt.xlabel("Location")
-    plt.ylabel("Count")
-    plt.xticks(rotation=25, fontweight=TICK_WEIGHT)
-    plt.yticks(fontweight=TICK_WEIGHT)
-    plt.close()
+def top_location_counts(df, n=5, sketch_store=None):
+    # With daily 'Location' heavy-hitter sketches the top n is merged from the store
+    # over the date range of df instead of counting its rows
+    if sketch_store is not None and not df.empty:
+        top_locations = sketches.approx_top_n(sketch_store, 'Location', n, df['Date'].min(), df['Date'].max())
+        return top_locations.set_index('Location')['Count']
+    return plot_data.group_stat(df, 'Location', order='value').head(n)
+
+@plot_style.styled('visualize')
+def plot_top_5_locations_violation(df, sketch_store=None):
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
+    Location_Count = top_location_counts(df, 5, sketch_store)
+    sns.barplot(x=Location_Count.index, y=Location_Count.values, hue=Location_Count.index, legend=False, palette="viridis", errorbar=None, ax=ax)
+    ax.set_title("Top 5 Locations (Violations)")
+    ax.set_xlabel("Location")
+    ax.set_ylabel("Count")
+    setp(ax.get_xticklabels(), rotation=25, fontweight=TICK_WEIGHT)
+    setp(ax.get_yticklabels(), fontweight=TICK_WEIGHT)
     return fig
 
+@plot_style.styled('visualize')
 def plot_vehicle_type_vs_violation_type(df):
-    apply_plot_style()
-    fig = plt.figure(figsize=FIG_SIZE)
-    sns.countplot(data=df, x='Violation_Type', hue='Vehicle_Type', palette=UNI_PALETTE)
-    plt.title('Vehicle Type vs Violation Type')
-    plt.xlabel('Violation Type')
-    plt.ylabel('Number of Violations')
-    plt.legend(title='Vehicle Type', fontsize=TICK_SIZE)
-    plt.xticks(rotation=25, fontweight=TICK_WEIGHT)
-    plt.yticks(fontweight=TICK_WEIGHT)
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
+    counts = plot_data.count_table(df, 'Violation_Type', 'Vehicle_Type')
+    sns.barplot(data=counts, x='Violation_Type', y='Count', hue='Vehicle_Type', palette=UNI_PALETTE, errorbar=None, ax=ax)
+    ax.set_title('Vehicle Type vs Violation Type')
+    ax.set_xlabel('Violation Type')
+    ax.set_ylabel('Number of Violations')
+    ax.legend(title='Vehicle Type', fontsize=TICK_SIZE)
+    setp(ax.get_xticklabels(), rotation=25, fontweight=TICK_WEIGHT)
+    setp(ax.get_yticklabels(), fontweight=TICK_WEIGHT)
     # COntrol the legend size and location out of the plot area
-    plt.legend(fontsize=TICK_SIZE,loc='upper right', bbox_to_anchor=(1.2, 1))
-    plt.tight_layout()
-    plt.close()
+    ax.legend(fontsize=TICK_SIZE,loc='upper right', bbox_to_anchor=(1.2, 1))
+    fig.tight_layout()
     return fig
 
 # --- AMITH'S PLOTS ---
 
+@plot_style.styled('visualize')
 def plot_violation_type_percentage(df):
-    apply_plot_style()
-    violation_counts = df['Violation_Type'].value_counts()
-    fig = plt.figure(figsize=FIG_SIZE)
+    violation_counts = plot_data.group_stat(df, 'Violation_Type', order='value')
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
     
     # Use distinct colors
-    plt.pie(
+    ax.pie(
         violation_counts,
         labels=violation_counts.index,
         autopct='%1.1f%%',
@@ -212,43 +235,41 @@ def plot_violation_type_percentage(df):
         colors=sns.color_palette(UNI_PALETTE),
         textprops={'fontsize': TICK_SIZE, 'weight': 'bold'}
     )
-    plt.title('Percentage of Traffic Violation Types')
-    plt.axis('equal')
-    plt.close()
+    ax.set_title('Percentage of Traffic Violation Types')
+    ax.axis('equal')
     return fig
 
 
 
 # --- HARIKA'S PLOTS ---
 
+@plot_style.styled('visualize')
 def plot_repeat_offenders(df):
-    apply_plot_style()
-    fig = plt.figure(figsize=FIG_SIZE)
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
     # Use a high contrast sequential palette
     palette = sns.color_palette("rocket_r", n_colors=10) 
     
     if 'Previous_Violations' in df.columns:
         violations = df[df['Previous_Violations']>3].head(10)
         if not violations.empty:
-            plt.barh(
+            ax.barh(
                 violations.get('Violation_ID', range(len(violations))), 
                 violations['Previous_Violations'], 
-                color=palette
+                color=palette[:len(violations)]
             )
-            plt.title('Repeat Offenders (Records with > 3 violations)')
-            plt.xlabel('Number of Previous Violations')
-            plt.ylabel('Record / Violation ID')
-            plt.tight_layout()
-            plt.xticks(fontweight=TICK_WEIGHT)
-            plt.yticks(fontweight=TICK_WEIGHT)
+            ax.set_title('Repeat Offenders (Records with > 3 violations)')
+            ax.set_xlabel('Number of Previous Violations')
+            ax.set_ylabel('Record / Violation ID')
+            fig.tight_layout()
+            setp(ax.get_xticklabels(), fontweight=TICK_WEIGHT)
+            setp(ax.get_yticklabels(), fontweight=TICK_WEIGHT)
         else:
-            plt.text(0.5, 0.5, "No records with > 3 previous violations", ha='center', fontsize=TITLE_SIZE)
-    plt.close()
+            ax.text(0.5, 0.5, "No records with > 3 previous violations", ha='center', fontsize=TITLE_SIZE)
     return fig
 
+@plot_style.styled('visualize')
 def plot_violation_by_location_pie(df):
-    apply_plot_style()
-    location_counts = df["Location"].value_counts()
+    location_counts = plot_data.group_stat(df, 'Location', order='value')
     if len(location_counts) > 10:
         top_n = location_counts.head(10)
         others_count = location_counts.iloc[10:].sum()
@@ -256,7 +277,7 @@ def plot_violation_by_location_pie(df):
             top_n['Others'] = others_count
         location_counts = top_n
 
-    fig, ax = plt.subplots(figsize=FIG_SIZE)
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
     
     wedges, texts, autotexts = ax.pie(
         location_counts,
@@ -268,7 +289,7 @@ def plot_violation_by_location_pie(df):
         textprops={'fontsize': TICK_SIZE}
     )
     
-    plt.setp(autotexts, size=12, weight="bold", color="white")
+    setp(autotexts, size=12, weight="bold", color="white")
     
     ax.legend(
         wedges, 
@@ -282,22 +303,20 @@ def plot_violation_by_location_pie(df):
     
     ax.set_title("Violations by Location (%)")
     ax.axis('equal')
-    plt.tight_layout()
-    plt.close()
+    fig.tight_layout()
     return fig
 
 # --- DARSANA'S PLOTS ---
 
+@plot_style.styled('visualize')
 def plot_speeding_vs_road_condition(df):
-    apply_plot_style()
-    df = df.copy()
     if 'Recorded_Speed' in df.columns and 'Speed_Limit' in df.columns:
-        df['Speeding'] = df['Recorded_Speed'] - df['Speed_Limit']
-        speed_df = df[df['Speeding'] > 0]
+        df = ensure_features(df, ['Speed_Exceeded'])
+        speed_df = df[df['Speed_Exceeded'] > 0]
         
-        avg_speeding = speed_df.groupby('Road_Condition')['Speeding'].mean().reset_index()
+        avg_speeding = plot_data.group_stat(speed_df, 'Road_Condition', 'Speed_Exceeded', 'mean').reset_index(name='Speeding')
         
-        fig = plt.figure(figsize=FIG_SIZE)
+        fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
         sns.barplot(
             data=avg_speeding,
             y='Road_Condition',
@@ -305,21 +324,22 @@ def plot_speeding_vs_road_condition(df):
             orient='h',
             palette='magma', # Heat intensity
             hue='Road_Condition',
-            legend=False
+            legend=False,
+            errorbar=None,
+            ax=ax
         )
-        plt.title("Average Speeding vs Road Conditions")
-        plt.xlabel("Average Speeding (km/h)")
-        plt.ylabel("Road Condition")
-        plt.xticks(rotation=25, fontweight=TICK_WEIGHT)
-        plt.yticks(fontweight=TICK_WEIGHT)
-        plt.close()
+        ax.set_title("Average Speeding vs Road Conditions")
+        ax.set_xlabel("Average Speeding (km/h)")
+        ax.set_ylabel("Road Condition")
+        setp(ax.get_xticklabels(), rotation=25, fontweight=TICK_WEIGHT)
+        setp(ax.get_yticklabels(), fontweight=TICK_WEIGHT)
         return fig
     return None
 
+@plot_style.styled('visualize')
 def plot_fines_vs_weather_severity(df):
-    apply_plot_style()
-    fig = plt.figure(figsize=FIG_SIZE)
-    df_severity = df.groupby('Weather_Condition')['Fine_Amount'].mean().sort_values()
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
+    df_severity = plot_data.group_stat(df, 'Weather_Condition', 'Fine_Amount', 'mean').sort_values()
     
     sns.barplot(
         x=df_severity.values,
@@ -327,59 +347,44 @@ def plot_fines_vs_weather_severity(df):
         orient='h',
         hue=df_severity.index,
         palette='Reds', # Intensity helps identify
-        legend=False
+        legend=False,
+        errorbar=None,
+        ax=ax
     )
-    plt.xlabel("Average Fine Amount (Severity Indicator)")
-    plt.ylabel("Weather Condition")
-    plt.title("Weather Condition vs Severity")
-    plt.xticks(rotation=25, fontweight=TICK_WEIGHT)
-    plt.yticks(fontweight=TICK_WEIGHT)
-    plt.tight_layout()
-    plt.close()
+    ax.set_xlabel("Average Fine Amount (Severity Indicator)")
+    ax.set_ylabel("Weather Condition")
+    ax.set_title("Weather Condition vs Severity")
+    setp(ax.get_xticklabels(), rotation=25, fontweight=TICK_WEIGHT)
+    setp(ax.get_yticklabels(), fontweight=TICK_WEIGHT)
+    fig.tight_layout()
     return fig
 
 # --- MRUNALINI'S PLOTS ---
 
+@plot_style.styled('visualize')
 def plot_severity_heatmap_by_location(df):
-    apply_plot_style()
-    df = df.copy()
+    severity_score = compute_severity_score(df)
     
-    def calc_severity_score(row):
-        severity = 0
-        if pd.notnull(row.get('Fine_Amount')): severity += row['Fine_Amount'] / 1000
-        if pd.notnull(row.get('Penalty_Points')): severity += row['Penalty_Points'] 
-        if pd.notnull(row.get('Recorded_Speed')) and pd.notnull(row.get('Speed_Limit')):
-            overspeed = row['Recorded_Speed'] - row['Speed_Limit']
-            if overspeed > 0: severity += overspeed /10
-        if pd.notnull(row.get('Alcohol_Level')): severity += row['Alcohol_Level'] * 10
-        if row.get('Helmet_Worn') == 'No': severity += 10
-        if row.get('Seatbelt_Worn') == 'No': severity += 10
-        if row.get('Traffic_Light_Status') == 'Red': severity += 15
-        if pd.notnull(row.get('Previous_Violations')): severity += row['Previous_Violations'] * 1.5
-        return severity
-
-    df['Violation_Severity_Score'] = df.apply(calc_severity_score, axis=1)
-    
-    location_heatmap = df.pivot_table(
-        values='Violation_Severity_Score',
-        index='Location',
-        columns='Violation_Type',
+    location_heatmap = crosstab(
+        df['Location'],
+        df['Violation_Type'],
+        values=severity_score,
         aggfunc='mean'
     )
 
-    fig = plt.figure(figsize=FIG_SIZE)
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
     sns.heatmap(
         location_heatmap, 
         cmap='magma_r', # Updated color family
         annot=True, 
         fmt=".1f",
-        annot_kws={"size": TICK_SIZE, "weight": "bold"}
+        annot_kws={"size": TICK_SIZE, "weight": "bold"},
+        ax=ax
     )
-    plt.title("Average Severity Score Heatmap", pad=20)
-    plt.xticks(rotation=25, fontweight=TICK_WEIGHT)
-    plt.yticks(fontweight=TICK_WEIGHT)
-    plt.tight_layout()
-    plt.close()
+    ax.set_title("Average Severity Score Heatmap", pad=20)
+    setp(ax.get_xticklabels(), rotation=25, fontweight=TICK_WEIGHT)
+    setp(ax.get_yticklabels(), fontweight=TICK_WEIGHT)
+    fig.tight_layout()
     return fig
 
 # --- POOJITHA'S PLOTS ---
@@ -394,11 +399,11 @@ def plot_avg_fine_by_violation_type_2(df):
 
 
 
+@plot_style.styled('visualize')
 def plot_violation_by_road_condition(df):
-    apply_plot_style()
-    road_counts = df['Road_Condition'].value_counts()
+    road_counts = plot_data.group_stat(df, 'Road_Condition', order='value')
     
-    fig, ax = plt.subplots(figsize=FIG_SIZE)
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
     
     wedges, texts, autotexts = ax.pie(
         road_counts,
@@ -409,7 +414,7 @@ def plot_violation_by_road_condition(df):
         pctdistance=0.85
     )
     
-    plt.setp(autotexts, size=12, weight="bold")
+    setp(autotexts, size=12, weight="bold")
     
     ax.legend(
         wedges, 
@@ -423,106 +428,89 @@ def plot_violation_by_road_condition(df):
 
     ax.set_title("Violations by Road Condition")
     ax.axis('equal')
-    plt.tight_layout()
-    plt.close()
+    fig.tight_layout()
     return fig
 
 # --- SANIYA'S PLOTS ---
 
+@plot_style.styled('visualize')
 def plot_weather_impact_heatmap(df):
-    apply_plot_style()
-    pivot = df.pivot_table(
-        index="Violation_Type",
-        columns="Weather_Condition",
-        values="Violation_ID",
-        aggfunc="count",
-        fill_value=0
-    )
-    fig = plt.figure(figsize=FIG_SIZE)
+    pivot = plot_data.cross_table(df, "Violation_Type", "Weather_Condition", values_col="Violation_ID", aggfunc="count")
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
     sns.heatmap(
         pivot, 
         annot=True, 
         fmt="d", 
         cmap="YlGnBu", # Updated color family
         cbar=True,
-        annot_kws={"size": TICK_SIZE, "weight": "bold"}
+        annot_kws={"size": TICK_SIZE, "weight": "bold"},
+        ax=ax
     )
-    plt.title("Impact of Weather Conditions")
-    plt.xlabel("Weather Condition")
-    plt.ylabel("Violation Type")
-    plt.xticks(rotation=25, fontweight=TICK_WEIGHT)
-    plt.yticks(fontweight=TICK_WEIGHT)
-    plt.tight_layout()
-    plt.close()
+    ax.set_title("Impact of Weather Conditions")
+    ax.set_xlabel("Weather Condition")
+    ax.set_ylabel("Violation Type")
+    setp(ax.get_xticklabels(), rotation=25, fontweight=TICK_WEIGHT)
+    setp(ax.get_yticklabels(), fontweight=TICK_WEIGHT)
+    fig.tight_layout()
     return fig
 
 
 
 # --- SANJANA'S PLOTS ---
 
+@plot_style.styled('visualize')
 def plot_vehicle_risk_countplot(df):
-    apply_plot_style()
-    vehicle_counts = df['Vehicle_Type'].value_counts().index
-    fig = plt.figure(figsize=FIG_SIZE)
-    sns.countplot(
-        y=df['Vehicle_Type'],
-        order=vehicle_counts,
+    vehicle_counts = plot_data.group_stat(df, 'Vehicle_Type', order='value')
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
+    sns.barplot(
+        x=vehicle_counts.values,
+        y=vehicle_counts.index,
+        orient='h',
+        order=vehicle_counts.index,
         palette='Reds_r', # Intensity indicates risk/freq
-        hue=df['Vehicle_Type'],
-        legend=False
+        hue=vehicle_counts.index,
+        hue_order=vehicle_counts.index,
+        legend=False,
+        errorbar=None,
+        ax=ax
     )
-    plt.title('Vehicle-Type Based Risk Analysis')
-    plt.xlabel('Count')
-    plt.ylabel('Vehicle Type')
-    plt.xticks(rotation=25, fontweight=TICK_WEIGHT)
-    plt.yticks(fontweight=TICK_WEIGHT)
-    plt.tight_layout()
-    plt.close()
+    ax.set_title('Vehicle-Type Based Risk Analysis')
+    ax.set_xlabel('Count')
+    ax.set_ylabel('Vehicle Type')
+    setp(ax.get_xticklabels(), rotation=25, fontweight=TICK_WEIGHT)
+    setp(ax.get_yticklabels(), fontweight=TICK_WEIGHT)
+    fig.tight_layout()
     return fig
 
+@plot_style.styled('visualize')
 def plot_age_alcohol_heatmap(df):
-    apply_plot_style()
-    df = df.copy()
-    bins = [0, 25, 35, 45, 60, 100]
-    labels = ["18-25", "26-35", "36-45", "46-60", "60+"]
-    
-    max_alcohol = df['Alcohol_Level'].max()
-    upper = max(0.251, max_alcohol)
-    ranges = [0, 0.03, 0.08, 0.15, 0.25, upper]
-    safelevels = ['Safe', 'Mild', 'Risky', 'High Risk', 'Dangerous']
-    ranges = sorted(list(set(ranges)))
+    df = ensure_features(df, ['Age_Group', 'Alcohol_Range'])
     
-    if len(ranges) - 1 != len(safelevels): 
-        return None
-
-    df["Age_Group"] = pd.cut(df["Driver_Age"], bins=bins, labels=labels, include_lowest=True)
-    df["Alcohol_Range"] = pd.cut(df["Alcohol_Level"], bins=ranges, labels=safelevels, include_lowest=True)
-    
-    heatmap_data = pd.crosstab(df['Age_Group'], df['Alcohol_Range'])
+    heatmap_data = plot_data.cross_table(df, 'Age_Group', 'Alcohol_Range', observed=True)
     
-    fig = plt.figure(figsize=FIG_SIZE)
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
     sns.heatmap(
         heatmap_data, 
         annot=True, 
         fmt="d", 
         cmap="YlOrRd", # Updated Color
-        annot_kws={"size": TICK_SIZE, "weight": "bold"}
+        annot_kws={"size": TICK_SIZE, "weight": "bold"},
+        ax=ax
     )
-    plt.title("Age Group vs Alcohol Risk Heatmap")
-    plt.xlabel("Alcohol Test Classification")
-    plt.ylabel("Age Group")
-    plt.xticks(rotation=25, fontweight=TICK_WEIGHT)
-    plt.yticks(fontweight=TICK_WEIGHT)
-    plt.tight_layout()
-    plt.close()
+    ax.set_title("Age Group vs Alcohol Risk Heatmap")
+    ax.set_xlabel("Alcohol Test Classification")
+    ax.set_ylabel("Age Group")
+    setp(ax.get_xticklabels(), rotation=25, fontweight=TICK_WEIGHT)
+    setp(ax.get_yticklabels(), fontweight=TICK_WEIGHT)
+    fig.tight_layout()
     return fig
 
 # --- ISHWARI'S PLOTS ---
 
+@plot_style.styled('visualize')
 def plot_fine_vs_vehicle_pie(df):
-    apply_plot_style()
-    fine_data = df.groupby('Vehicle_Type')['Fine_Amount'].sum()
-    fig, ax = plt.subplots(figsize=FIG_SIZE)
+    fine_data = plot_data.group_stat(df, 'Vehicle_Type', 'Fine_Amount', 'sum')
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
     
     wedges, texts, autotexts = ax.pie(
         fine_data.values,
@@ -540,19 +528,18 @@ def plot_fine_vs_vehicle_pie(df):
     # fig.gca().add_artist(centre_circle)
     
     ax.set_title("Total Fines Paid by Vehicle Type")
-    plt.axis('equal') 
-    plt.close()
+    ax.axis('equal') 
     return fig
 
 
 
 # ---- Anshu's Plots ----
 
+@plot_style.styled('visualize')
 def plot_license_validity_by_gender(df):
-    apply_plot_style()
-    validity_gender = df.groupby(['License_Validity', 'Driver_Gender']).size().unstack(fill_value=0)
+    validity_gender = plot_data.cross_table(df, 'License_Validity', 'Driver_Gender', observed=True)
     
-    fig, ax = plt.subplots(figsize=FIG_SIZE)
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
     validity_gender.plot(
         kind='bar', 
         ax=ax, 
@@ -562,70 +549,79 @@ def plot_license_validity_by_gender(df):
     ax.set_title("License Validity by Gender")
     ax.set_xlabel("License Status")
     ax.set_ylabel("Count")
-    plt.xticks(rotation=25, fontweight=TICK_WEIGHT)
-    plt.yticks(fontweight=TICK_WEIGHT)
+    setp(ax.get_xticklabels(), rotation=25, fontweight=TICK_WEIGHT)
+    setp(ax.get_yticklabels(), fontweight=TICK_WEIGHT)
     ax.legend(title="Driver Gender", fontsize=TICK_SIZE)
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
+def _draw_violins(ax, grid, palette, width=0.8):
+    """
+    Draws one violin with an inner box per group of a plot_data.violin_grid result.
+    Widths follow seaborn's density_norm='area': all densities share one scale.
+    """
+    peak = grid['density'].max()
+    scale = width / 2 / peak if peak > 0 else 0.0
+    for i, group in enumerate(grid['groups']):
+        stats = grid['stats'].iloc[i]
+        if not stats['Count']:
+            continue
+        color = sns.desaturate(palette[i % len(palette)], 0.75) # seaborn's default saturation
+        half_width = grid['density'][i] * scale
+        ax.fill_betweenx(grid['support'][i], i - half_width, i + half_width,
+                         facecolor=color, edgecolor='.3', linewidth=1.5, zorder=1)
+        ax.plot([i, i], [stats['Whisker_Low'], stats['Whisker_High']], color='.3', linewidth=2.5, zorder=2)
+        ax.plot([i, i], [stats['Q1'], stats['Q3']], color='.3', linewidth=7.5, solid_capstyle='butt', zorder=2)
+        ax.scatter([i], [stats['Median']], color='white', s=12, zorder=3)
+    ax.set_xticks(range(len(grid['groups'])), labels=[str(group) for group in grid['groups']])
+    ax.set_xlim(-0.5, len(grid['groups']) - 0.5)
+    ax.grid(False, axis='x')
+
+@plot_style.styled('visualize')
 def plot_fine_amount_distribution_vs_weather(df):
-    apply_plot_style()
-    plt.figure(figsize=FIG_SIZE)
-    sns.violinplot(
-        data=df, 
-        x='Weather_Condition', 
-        y='Fine_Amount', 
-        inner='box', 
-        palette="muted",
-        hue='Weather_Condition',
-        legend=False
-    )
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
+    # Violins are drawn from precomputed KDE grids instead of sns.violinplot on the raw rows
+    _draw_violins(ax, plot_data.violin_grid(df, 'Weather_Condition', 'Fine_Amount'), sns.color_palette("muted"))
     
-    plt.title("Fine Amount Distribution vs Weather")
-    plt.xlabel("Weather Condition")
-    plt.ylabel("Fine Amount")
-    plt.xticks(rotation=25, fontweight=TICK_WEIGHT)
-    plt.yticks(fontweight=TICK_WEIGHT)
-    plt.tight_layout()
-    return plt.gcf()
+    ax.set_title("Fine Amount Distribution vs Weather")
+    ax.set_xlabel("Weather Condition")
+    ax.set_ylabel("Fine Amount")
+    setp(ax.get_xticklabels(), rotation=25, fontweight=TICK_WEIGHT)
+    setp(ax.get_yticklabels(), fontweight=TICK_WEIGHT)
+    fig.tight_layout()
+    return fig
 
+@plot_style.styled('visualize')
 def plot_violation_types_vs_weather_heatmap(df):
-    apply_plot_style()
-    plt.figure(figsize=FIG_SIZE)
-    heatmap_violation = pd.crosstab(df['Weather_Condition'], df['Violation_Type'])
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
+    heatmap_violation = plot_data.cross_table(df, 'Weather_Condition', 'Violation_Type')
     
     sns.heatmap(
         heatmap_violation, 
         annot=True, 
         cmap='YlOrRd',
         fmt='d',
-        annot_kws={"size": TICK_SIZE, "weight": "bold"}
+        annot_kws={"size": TICK_SIZE, "weight": "bold"},
+        ax=ax
     )
     
-    plt.title("Violation Types vs Weather")
-    plt.xlabel("Violation Type")
-    plt.ylabel("Weather Condition")
-    plt.xticks(rotation=25, fontweight=TICK_WEIGHT)
-    plt.yticks(fontweight=TICK_WEIGHT)
-    plt.tight_layout()
-    return plt.gcf()
+    ax.set_title("Violation Types vs Weather")
+    ax.set_xlabel("Violation Type")
+    ax.set_ylabel("Weather Condition")
+    setp(ax.get_xticklabels(), rotation=25, fontweight=TICK_WEIGHT)
+    setp(ax.get_yticklabels(), fontweight=TICK_WEIGHT)
+    fig.tight_layout()
+    return fig
 
 
 
+@plot_style.styled('visualize')
 def plot_driver_risk_by_age(df):
-    apply_plot_style()
-    df = df.copy()
-    bins = [0, 25, 35, 45, 60, 100]
-    labels = ["18-25", "26-35", "36-45", "46-60", "60+"]
-    df["Age_Group"] = pd.cut(df["Driver_Age"], bins=bins, labels=labels, include_lowest=True)
-    
-    df['Alcohol_Flag'] = (df['Breathalyzer_Result'] == "Positive").astype(int)
-    df["Risk_Level"] = df["Previous_Violations"] + df["Alcohol_Flag"]
+    df = ensure_features(df, ['Age_Group', 'Risk_Level'])
 
-    risk_by_age = df.groupby("Age_Group", observed=False)["Risk_Level"].mean().reset_index()
-    risk_by_age = risk_by_age.sort_values("Age_Group")
+    risk_by_age = plot_data.group_stat(df, "Age_Group", "Risk_Level", 'mean').reset_index()
 
-    fig, ax = plt.subplots(figsize=FIG_SIZE)
+    fig, ax = plot_style.new_figure(figsize=FIG_SIZE)
     
     ax.plot(
         risk_by_age["Age_Group"],
@@ -648,8 +644,7 @@ def plot_driver_risk_by_age(df):
     ax.set_title("Average Driver Risk Level by Age Group", fontsize=TICK_SIZE, fontweight='bold')
     ax.set_xlabel("Age Group", fontsize=TICK_SIZE, fontweight='bold')
     ax.set_ylabel("Average Risk Level", fontsize=TICK_SIZE, fontweight='bold')
-    plt.xticks(rotation=25, fontweight=TICK_WEIGHT)
-    plt.yticks(fontweight=TICK_WEIGHT)
-    plt.tight_layout()
-    plt.close()
+    setp(ax.get_xticklabels(), rotation=25, fontweight=TICK_WEIGHT)
+    setp(ax.get_yticklabels(), fontweight=TICK_WEIGHT)
+    fig.tight_layout()
     return fig
\ No newline at end of file
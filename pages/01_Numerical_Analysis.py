@@ -1,7 +1,7 @@
 import streamlit as st
 import pandas as pd
 from core.sidebar import render_sidebar
-from core import utils
+from core import utils, sketches, officers
 
 # ------------------------------
 # PAGE CONFIG
@@ -124,6 +124,7 @@ quick_navigator = """
             <a class="nav-pill" href="#vehicle-and-fine-analysis" target="_self">Vehicles</a>
             <a class="nav-pill" href="#environmental-impact" target="_self">Environment</a>
             <a class="nav-pill" href="#hourly-violation-patterns" target="_self">Hourly</a>
+            <a class="nav-pill" href="#officer-and-agency-workload" target="_self">Officers</a>
             <a class="nav-pill" href="#custom-tabular-analysis" target="_self">Custom</a>
         </div>
     </div>
@@ -132,6 +133,11 @@ quick_navigator = """
 st.sidebar.markdown(quick_navigator, unsafe_allow_html=True)
 st.markdown(quick_navigator, unsafe_allow_html=True)
 
+@st.cache_resource(show_spinner=False)
+def load_sketch_store(df):
+    # Monthly quantile sketches of the numeric columns, used by the data quality report
+    return sketches.build_sketch_store(df)
+
 # ------------------------------
 # LOAD DATA
 # ------------------------------
@@ -192,7 +198,7 @@ st.markdown('<h2 id="dataset-info" style="text-align: center;">Dataset Informati
 # -----------------------------------
 st.subheader("Missing Duplicate Value Analysis")
 st.write("This section provides a combined view of column names, data types, and descriptive statistics for the filtered data.")
-data_quality_df = utils.get_data_quality_analysis(df)
+data_quality_df = utils.get_data_quality_analysis(df, sketch_store=load_sketch_store(df))
 st.dataframe(data_quality_df, width='stretch', hide_index=True)   
 # -----------------------------------
 # 5 Sample Rows
@@ -300,7 +306,44 @@ with st.expander("Day of Week vs Hour (Pivot)", expanded=True):
     else:
         st.info("Time Series data unavailable.")
 
-# 5. Custom Analysis
+# 5. Officer & Agency Workload
+# -------------------------------------------------------------------------
+st.markdown("---")
+st.markdown('<h2 id="officer-workload" style="text-align: center;">Officer & Agency Workload</h3>', unsafe_allow_html=True)
+st.write("Per-officer workload and fine collection, with a comparison across issuing agencies.")
+with st.expander("Officer Rankings & Agency Comparison", expanded=True):
+    if officers.can_analyze(df_filtered):
+        # Aggregated once per filtered dataset; the controls below only re-rank it
+        officer_table = officers.build_officer_table(df_filtered)
+        metric_options = [m for m in officers.OFFICER_METRICS if m in officer_table.columns]
+
+        oc1, oc2, oc3, oc4 = st.columns(4)
+        with oc1:
+            officer_metric = st.selectbox("Rank Officers by", metric_options, format_func=officers.OFFICER_METRICS.get, key="officer_metric")
+        with oc2:
+            officer_order = st.radio("Order", ["Highest", "Lowest"], horizontal=True, key="officer_order")
+        with oc3:
+            officer_k = st.number_input("Top K", min_value=1, max_value=100, value=officers.TOP_K_OFFICERS, key="officer_k")
+        with oc4:
+            officer_min_violations = st.number_input("Min Violations", min_value=1, value=1, key="officer_min_violations")
+
+        m1, m2, m3 = st.columns(3, border=True)
+        with m1: st.metric("Officers", f"{len(officer_table):,}")
+        with m2: st.metric("Avg Violations / Officer", f"{officer_table['Violations'].mean():.2f}")
+        if 'Collection_Rate' in officer_table.columns:
+            with m3: st.metric("Median Collection Rate", f"{officer_table['Collection_Rate'].median():.1f}%")
+
+        ranked = officers.top_k_officers(officer_table, officer_metric, int(officer_k), largest=(officer_order == "Highest"), min_violations=int(officer_min_violations))
+        st.dataframe(ranked.round(2), width='stretch')
+
+        agency_stats = officers.agency_comparison(officer_table)
+        if not agency_stats.empty:
+            st.markdown("##### Agency Comparison")
+            st.dataframe(agency_stats.round(2), width='stretch', hide_index=True)
+    else:
+        st.info("Officer data unavailable.")
+
+# 6. Custom Analysis
 # -------------------------------------------------------------------------
 st.markdown("---")
 st.markdown('<h2 id="custom-analysis" style="text-align: center;">Custom Tabular Analysis</h3>', unsafe_allow_html=True)
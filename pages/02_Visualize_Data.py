@@ -1,8 +1,9 @@
+import functools
 import streamlit as st
 import pandas as pd
 from core.sidebar import render_sidebar
 import core.visualize_plot as visualize_plot
-import matplotlib.pyplot as plt
+from core import sketches, figure_cache
 import seaborn as sns
 
 # ------------------------------
@@ -189,26 +190,33 @@ except Exception as e:
     st.error(f"An error occurred while loading the data: {e}")
     st.stop()
 
+@st.cache_resource(show_spinner=False)
+def load_location_sketches(df):
+    # Daily top-N Location sketches; each plot's date filter is answered by merging them
+    if not {'Date', 'Location'}.issubset(df.columns):
+        return None
+    return sketches.build_sketch_store(df, numeric_cols=[], freq='D', heavy_hitter_cols=['Location'])
+
 # ===========================================================================================
 # TEAM CONTRIBUTED PLOTS
 # ===========================================================================================
 
-def render_plot_item(title, insight, plot_func, team_member_name, df_local, key_suffix):
+@st.fragment
+def render_plot_item(title, insight, plot_func, team_member_name, df_local, key_suffix, expanded=False):
     """
     Renders a single plot item in an expander with independent date filtering.
+    The plot is only computed while its "Show" toggle is on. Switching it or changing its
+    dates reruns this item alone (st.fragment), and the image is served from the figure cache.
     """
     # Navigation Anchor
     st.markdown(f"### {title}")
     
     expander_title = f"{title}"
     
-    with st.expander(expander_title, expanded=True):
-        # Ensure fresh state for plots
-        try:
-            plt.close('all')
-        except:
-            pass
+    if not st.toggle(f"Show {title}", value=expanded, key=f"show_{key_suffix}"):
+        return
 
+    with st.expander(expander_title, expanded=True):
         # --- Date Filter for this SPECIFIC Plot ---
         key_start = f"start_{key_suffix}"
         key_end = f"end_{key_suffix}"
@@ -258,10 +266,8 @@ def render_plot_item(title, insight, plot_func, team_member_name, df_local, key_
             
             with col_plot:
                 try:
-                    fig = plot_func(filtered_df)
-                    if fig:
-                        st.pyplot(fig, width='stretch')
-                    else:
+                    # Rendered once per (plot, data, date range); later reruns serve the cached image
+                    if not figure_cache.show_plot(plot_func, filtered_df):
                         st.write("Plot could not be generated.")
                 except Exception as e:
                     st.error(f"Error generating plot: {e}")
@@ -283,8 +289,9 @@ st.markdown('<h2 id="top-5-locations-violations" style="text-align: center;">Loc
 render_plot_item(
     "Top 5 Locations (Violations)", 
     "This plot identifies the top 5 locations with the highest number of reported violations. These 'hotspots' indicate areas where traffic enforcement should be prioritized to reduce incident frequency.",
-    visualize_plot.plot_top_5_locations_violation,
-    "Monika", df, "monika_1"
+    functools.partial(visualize_plot.plot_top_5_locations_violation, sketch_store=load_location_sketches(df)),
+    "Monika", df, "monika_1",
+    expanded=True
 )
 
 # render_plot_item(
@@ -521,8 +528,7 @@ with st.expander("Custom Bar/Count Plot", expanded=True):
             if plot_df_bar.empty:
                 st.warning("No data available for the selected criteria.")
             else:
-                fig = visualize_plot.plot_bar_or_count(plot_df_bar, x_col_bar, y_col_bar)
-                st.pyplot(fig, width='stretch')
+                figure_cache.show_plot(visualize_plot.plot_bar_or_count, plot_df_bar, x_col_bar, y_col_bar)
 
                 # Display the underlying data in an expander
                 with st.expander("View Data"):
@@ -2,7 +2,7 @@ import streamlit as st
 import pandas as pd
 from core.sidebar import render_sidebar
 import core.trend_plot as trend_plot
-import matplotlib.pyplot as plt
+from core import parallel, rolling, changepoint, figure_cache, vega_plot
 
 # ------------------------------
 # PAGE CONFIG
@@ -241,23 +241,21 @@ def render_hardcoded_trend_plots(df):
         # --- Plotting Logic ---
         if timeframe_col == 'Month':
             data_filtered['Month'] = data_filtered['Date'].dt.month_name()
-            counts = data_filtered.groupby(['Month', 'Violation_Type']).size().reset_index(name='Count')
+            counts = parallel.parallel_group_size(data_filtered, ['Month', 'Violation_Type']).reset_index(name='Count')
             if not counts.empty:
                 pivot_data = counts.pivot(index='Month', columns='Violation_Type', values='Count').fillna(0)
                 month_order = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
                 pivot_data = pivot_data.reindex(month_order).dropna()
-                fig = trend_plot.plot_trend_analysis_line(pivot_data, plot_func_x_label, "Violation_Type")
-                st.pyplot(fig, width='stretch')
+                figure_cache.show_plot(trend_plot.plot_trend_analysis_line, pivot_data, plot_func_x_label, "Violation_Type")
             else:
                 st.info("No data to plot.")
 
         elif timeframe_col == 'Year':
             data_filtered['Year'] = data_filtered['Date'].dt.year
-            counts = data_filtered.groupby(['Year', 'Violation_Type']).size().reset_index(name='Count')
+            counts = parallel.parallel_group_size(data_filtered, ['Year', 'Violation_Type']).reset_index(name='Count')
             if not counts.empty:
                 pivot_data = counts.pivot(index='Year', columns='Violation_Type', values='Count').fillna(0)
-                fig = trend_plot.plot_trend_analysis_line(pivot_data, plot_func_x_label, "Violation_Type")
-                st.pyplot(fig, width='stretch')
+                figure_cache.show_plot(trend_plot.plot_trend_analysis_line, pivot_data, plot_func_x_label, "Violation_Type")
             else:
                  st.info("No data to plot.")
 
@@ -268,20 +266,21 @@ def render_hardcoded_trend_plots(df):
 # --- MOVED LINE PLOTS (FROM VISUALIZE DATA) ---
 # ===============================================================================================
 
-def render_plot_item(title, insight, plot_func, team_member_name, df_local, key_suffix):
+@st.fragment
+def render_plot_item(title, insight, plot_func, team_member_name, df_local, key_suffix, expanded=False):
     """
     Renders a single plot item in an expander with independent date filtering.
+    The plot is only computed while its "Show" toggle is on. Switching it or changing its
+    dates reruns this item alone (st.fragment), and the image is served from the figure cache.
     """
     st.markdown(f"### {title}")
     
     expander_title = f"{title}"
     
-    with st.expander(expander_title, expanded=True):
-        try:
-            plt.close('all')
-        except:
-            pass
+    if not st.toggle(f"Show {title}", value=expanded, key=f"show_{key_suffix}"):
+        return
 
+    with st.expander(expander_title, expanded=True):
         key_start = f"start_{key_suffix}"
         key_end = f"end_{key_suffix}"
         
@@ -327,10 +326,7 @@ def render_plot_item(title, insight, plot_func, team_member_name, df_local, key_
             
             with col_plot:
                 try:
-                    fig = plot_func(filtered_df)
-                    if fig:
-                        st.pyplot(fig, width='stretch')
-                    else:
+                    if not figure_cache.show_plot(plot_func, filtered_df):
                         st.write("Plot could not be generated.")
                 except Exception as e:
                     st.error(f"Error generating plot: {e}")
@@ -348,8 +344,8 @@ def render_plot_item(title, insight, plot_func, team_member_name, df_local, key_
 def render_trend_analysis_line_plot_section():
     def pre_dataset_test():
         # --- Validate required columns for analysis ---
-        x_axis_options = ['Year', 'Month', 'Year_Month', 'Location', 'Vehicle_Type', 'Weather_Condition', 'Road_Condition']
-        valid_x_axis_options = [opt for opt in x_axis_options if opt in df.columns or opt in ['Year', 'Month', 'Year_Month']]
+        x_axis_options = ['Date', 'Year', 'Month', 'Year_Month', 'Location', 'Vehicle_Type', 'Weather_Condition', 'Road_Condition']
+        valid_x_axis_options = [opt for opt in x_axis_options if opt in df.columns or opt in ['Date', 'Year', 'Month', 'Year_Month']]
 
         line_options = ['Violation_Type', 'Driver_Gender']
         valid_line_options = [opt for opt in line_options if opt in df.columns]
@@ -412,7 +408,27 @@ def render_trend_analysis_line_plot_section():
         
         with col_plot_type:
             with st.expander("Plot Type", expanded=False):
-                plot_type = st.radio("Select Plot Type", ["Matplotlib", "Streamlit Default"],)
+                plot_types = ["Matplotlib", "Vega-Lite (Interactive)", "Streamlit Default"]
+                plot_type = st.radio("Select Plot Type", plot_types, index=1 if vega_plot.active_backend() == 'vega' else 0)
+
+        # --- Rolling Window Options (daily X-axis only) ---
+        rolling_windows, rolling_stat, rolling_value_col = [], 'mean', None
+        if X_axis == 'Date':
+            col_win, col_stat, col_measure = st.columns(3)
+            with col_win:
+                rolling_windows = st.multiselect("Rolling windows (days)", [7, 30, 90], default=[7, 30], key="trend_rolling_windows")
+            with col_measure:
+                measure_options = ['Violations'] + (['Fine_Amount'] if 'Fine_Amount' in df.columns else [])
+                measure = st.selectbox("Measure", measure_options, key="trend_rolling_measure")
+                rolling_value_col = None if measure == 'Violations' else measure
+            with col_stat:
+                # The rate option names the chosen measure ("Rolling Share of Fine Amount (%)")
+                measure_label = measure.replace('_', ' ').title()
+                stat_labels = {'mean': "Moving Average", 'sum': "Rolling Total", 'rate': f"Rolling Share of {measure_label} (%)"}
+                rolling_stat = st.selectbox("Rolling series", list(stat_labels), format_func=stat_labels.get, key="trend_rolling_stat")
+            mark_change_points = st.checkbox("Mark change points (level shifts)", value=False, key="trend_change_points")
+        else:
+            mark_change_points = False
 
         col1, col2 = st.columns([5,1])
         with col2:
@@ -446,17 +462,24 @@ def render_trend_analysis_line_plot_section():
             elif X_axis == "Year_Month":
                 df_filtered['Year_Month'] = df_filtered['Date'].dt.to_period('M')
 
-            try:
-                attribute_based_counts = df_filtered.groupby([X_axis, Lines]).size().reset_index(name='Count')
-            except KeyError:
-                st.error(f"The selected columns '{X_axis}' or '{Lines}' are not found in the dataset.")
-                st.stop()
+            if X_axis == 'Date':
+                # Dense daily rollup; rolling windows are computed from it in one cumulative-sum pass
+                attribute_based_pivot = rolling.daily_rollup(df_filtered, Lines, rolling_value_col)
+                if attribute_based_pivot.empty:
+                    st.warning(f"No data to group for the selected criteria. Try different options.")
+                    st.stop()
+            else:
+                try:
+                    attribute_based_counts = parallel.parallel_group_size(df_filtered, [X_axis, Lines]).reset_index(name='Count')
+                except KeyError:
+                    st.error(f"The selected columns '{X_axis}' or '{Lines}' are not found in the dataset.")
+                    st.stop()
 
-            if attribute_based_counts.empty:
-                st.warning(f"No data to group for the selected criteria. Try different options.")
-                st.stop()
+                if attribute_based_counts.empty:
+                    st.warning(f"No data to group for the selected criteria. Try different options.")
+                    st.stop()
 
-            attribute_based_pivot = attribute_based_counts.pivot(index=X_axis, columns=Lines, values='Count').fillna(0)
+                attribute_based_pivot = attribute_based_counts.pivot(index=X_axis, columns=Lines, values='Count').fillna(0)
 
             if isinstance(attribute_based_pivot.index, pd.PeriodIndex):
                 attribute_based_pivot.index = attribute_based_pivot.index.to_timestamp()
@@ -468,15 +491,35 @@ def render_trend_analysis_line_plot_section():
             st.markdown(f"## `{Lines.replace('_',' ').title()}` Trend based on `{X_axis.replace('_',' ').title()}`")
             st.markdown(f"##### Date Range: `{start_date}` to `{end_date}`")
 
-            if plot_type == "Matplotlib":
-                fig = trend_plot.plot_trend_analysis_line(attribute_based_pivot, X_axis, Lines)
-                st.pyplot(fig, width='stretch')
+            change_points = changepoint.detect_change_points(attribute_based_pivot) if mark_change_points else None
+
+            if plot_type in ("Matplotlib", "Vega-Lite (Interactive)"):
+                figure_cache.show_plot(
+                    trend_plot.plot_trend_analysis_line,
+                    attribute_based_pivot, X_axis, Lines,
+                    backend='png' if plot_type == "Matplotlib" else 'vega',
+                    rolling_windows=rolling_windows, rolling_stat=rolling_stat, value_col=rolling_value_col,
+                    change_points=changepoint.change_point_dates(change_points) if change_points is not None else None
+                )
             elif plot_type == "Streamlit Default":
-                st.line_chart(attribute_based_pivot,width='stretch',x_label= X_axis, y_label="Count")
+                if rolling_windows:
+                    rolled = rolling.rolling_metrics(attribute_based_pivot, rolling_windows, rolling_stat)
+                    rolled.columns = [f"{category} ({window})" for window, category in rolled.columns]
+                    st.line_chart(rolled, width='stretch', x_label=X_axis, y_label=trend_plot.trend_y_label(rolling_windows, rolling_stat, rolling_value_col))
+                else:
+                    st.line_chart(attribute_based_pivot,width='stretch',x_label= X_axis, y_label="Count" if rolling_value_col is None else trend_plot.trend_y_label(value_col=rolling_value_col))
             else:
                 st.info("Coming Soon!")
             with st.expander("View Plotted Data"):
                 st.dataframe(attribute_based_pivot)
+            if change_points is not None:
+                with st.expander(f"Detected Change Points ({len(change_points)})"):
+                    st.dataframe(change_points.round(3), width='stretch', hide_index=True)
+                    if {'Location', 'Violation_Type'}.issubset(df_filtered.columns):
+                        # Every Location x Violation Type series, segmented in one vectorized pass
+                        cube_change_points = changepoint.detect_change_points(rolling.daily_rollup(df_filtered, ['Location', 'Violation_Type']))
+                        st.markdown(f"##### Location × Violation Type Change Points ({len(cube_change_points)})")
+                        st.dataframe(cube_change_points.round(3), width='stretch', hide_index=True)
         else:
             st.info("Configure the plot options above and click 'Generate Trend Plot' to see the analysis.")
 
@@ -573,10 +616,9 @@ def render_categorical_heatmap_section():
             
             annot = yes_pivot.astype(int).astype(str) + "\n(" + percent_pivot.round(1).astype(str) + "%)"
             
-            fig = trend_plot.plot_categorical_heatmap(percent_pivot, annot, x_col, group_col)
             st.markdown(f"## {category_col} ('{positive_value}') — Count & Percentage Heatmap")
             st.markdown(f"##### Date Range: `{start_date_cat}` to `{end_date_cat}`")
-            st.pyplot(fig, width='stretch')
+            figure_cache.show_plot(trend_plot.plot_categorical_heatmap, percent_pivot, annot, x_col, group_col)
         else:
             st.info("Configure the plot options above and click 'Generate Categorical Heatmap' to see the analysis.")
 
@@ -7,6 +7,7 @@ from core.utils import (
     
 )
 import core.map_plot as map_plot
+from core import hotspots, clustering
 
 # ------------------------------
 # PAGE CONFIG
@@ -130,6 +131,74 @@ else:
 
 st.markdown("---")
 
+# ------------------------------
+# 4. Violation Hotspots
+# ------------------------------
+st.markdown("<h2 style='text-align: center; '>Violation Hotspots</h3>", unsafe_allow_html=True)
+if hotspots.can_detect(df):
+    c1, c2 = st.columns([3, 1])
+    with c1:
+        if min_year == max_year:
+            sel_years_hotspot = (min_year, max_year)
+        else:
+            sel_years_hotspot = st.slider("Filter by Year", min_year, max_year, (min_year, max_year), key="hotspot_slider")
+    with c2:
+        hotspot_freq = st.selectbox("Detection Period", options=list(hotspots.HOTSPOT_FREQ_OPTIONS), index=1, format_func=hotspots.HOTSPOT_FREQ_OPTIONS.get, key="hotspot_freq")
+
+    try:
+        # Detector runs over the full history (cached); the slider only filters the alerts
+        alerts = hotspots.detect_hotspots(df, freq=hotspot_freq)
+        alerts = alerts[(alerts['Date'].dt.year >= sel_years_hotspot[0]) & (alerts['Date'].dt.year <= sel_years_hotspot[1])]
+        hotspot_map_data = hotspots.hotspot_summary(alerts)
+        if hotspot_map_data.empty:
+            st.info("No anomalous spikes detected for the selected years.")
+        else:
+            render_choropleth_map_on_page(hotspot_map_data[['Location', 'Hotspot_Alerts']].copy(), geojson_data, 'Location', 'Hotspot_Alerts', state_prop_name, color_theme="OrRd", title="Hotspot Alerts")
+            with st.expander("View Hotspot Alerts", expanded=False):
+                st.dataframe(alerts.round(2), width='stretch', hide_index=True)
+    except Exception as e:
+        st.error(f"Could not generate Hotspot map: {e}")
+else:
+    st.warning("Columns 'Date', 'Location' and 'Violation_Type' are required for hotspot detection.")
+
+st.markdown("---")
+
+# ------------------------------
+# 5. Location Clusters
+# ------------------------------
+st.markdown("<h2 style='text-align: center; '>Locations with Similar Violation Profiles</h3>", unsafe_allow_html=True)
+profile_dimensions = clustering.available_dimensions(df)
+n_locations = df[default_loc_col].nunique()
+if profile_dimensions and n_locations >= 2:
+    c1, c2, c3 = st.columns([2, 1, 2])
+    with c1:
+        if min_year == max_year:
+            sel_years_cluster = (min_year, max_year)
+        else:
+            sel_years_cluster = st.slider("Filter by Year", min_year, max_year, (min_year, max_year), key="cluster_slider")
+    with c2:
+        n_clusters = st.slider("Number of Clusters", 2, max(2, min(8, n_locations - 1)), min(clustering.DEFAULT_CLUSTERS, max(2, n_locations - 1)), key="cluster_k")
+    with c3:
+        cluster_dimensions = st.multiselect("Profile", options=profile_dimensions, default=profile_dimensions, key="cluster_dims")
+
+    if not cluster_dimensions:
+        st.info("Select at least one profile dimension.")
+    else:
+        try:
+            mask_cluster = (df['Date'].dt.year >= sel_years_cluster[0]) & (df['Date'].dt.year <= sel_years_cluster[1])
+            clusters = clustering.cluster_locations(df[mask_cluster], default_loc_col, n_clusters, cluster_dimensions)
+            cluster_map_data = clusters['assignments'][[default_loc_col, 'Cluster']].copy()
+            render_choropleth_map_on_page(cluster_map_data, geojson_data, default_loc_col, 'Cluster', state_prop_name, color_theme="Set2", title="Profile Clusters", categorical=True)
+            with st.expander("View Cluster Members & Traits", expanded=False):
+                st.dataframe(clusters['assignments'], width='stretch', hide_index=True)
+                st.dataframe(clustering.describe_clusters(clusters['centers']), width='stretch', hide_index=True)
+        except Exception as e:
+            st.error(f"Could not generate Cluster map: {e}")
+else:
+    st.warning("Violation, vehicle or time columns are required to build location profiles.")
+
+st.markdown("---")
+
 # ------------------------------
 # CUSTOM VISUALIZATION
 # ------------------------------
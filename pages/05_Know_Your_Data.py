@@ -1,7 +1,8 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 import seaborn as sns
+from core import patterns, sketches, plot_data, figure_cache, cache, plot_style
 
 st.set_page_config(
     page_title="Auto Data Analyzer", 
@@ -9,6 +10,11 @@ st.set_page_config(
     layout="wide"
 )
 
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_moment_sketch(file_id, columns, _clean_df):
+    # Moments of every numeric column, gathered once per upload; any pair is then a lookup
+    return sketches.MomentSketch(columns).update(_clean_df)
+
 st.title("Auto Data Analyzer - Upload your data CSV file")
 st.markdown("Want to know more about your data? This page helps you understand your data better.")
 
@@ -45,6 +51,9 @@ if uploaded:
         )
         clean_df[col] = pd.to_numeric(clean_df[col], errors="ignore")
 
+    # Memoized helpers below key the cleaned frame on the upload instead of hashing its rows
+    cache.tag_dataset(clean_df, f"upload:{uploaded.file_id}")
+
     # Ensure numeric columns are actually numeric
     numeric_cols = clean_df.select_dtypes(include=["number"]).columns.tolist()
     categorical_cols = [c for c in df.columns if c not in numeric_cols]
@@ -92,8 +101,7 @@ if uploaded:
 
     st.write(f"Visualization for field *{selected_col}*")
 
-    # Clear all plt and sns plots
-    plt.close('all')
+    # Figures below are plain Figure objects (no pyplot state); only reset seaborn's styling
     sns.reset_orig()
     
     # single col analysis
@@ -109,7 +117,7 @@ if uploaded:
         # Histogram
         with plot_col1:
             st.markdown(f"### {hist_title}")
-            fig, ax = plt.subplots(figsize=(4.5, 3.2))
+            fig, ax = plot_style.new_figure(figsize=(4.5, 3.2))
 
             ax.grid(True, color="#CCCCCC", linestyle="--", linewidth=0.6)
             ax.set_facecolor("#F9F9F9")
@@ -120,12 +128,12 @@ if uploaded:
             ax.set_xlabel(selected_col, fontweight="bold")
             ax.set_ylabel("Frequency", fontweight="bold")
             ax.tick_params(axis='both', labelsize=8)
-            st.pyplot(fig)
+            figure_cache.show_pyplot(fig, context='column')
 
         # Boxplot
         with plot_col2:
             st.markdown(f"### {box_title}")
-            fig2, ax2 = plt.subplots(figsize=(4.5, 3.2))
+            fig2, ax2 = plot_style.new_figure(figsize=(4.5, 3.2))
 
             ax2.set_facecolor("#F9F9F9")
             fig2.patch.set_facecolor('#FFFFFF')
@@ -139,7 +147,7 @@ if uploaded:
 
             ax2.set_ylabel(selected_col, fontweight="bold")
             ax2.tick_params(axis='y', labelsize=8)
-            st.pyplot(fig2)
+            figure_cache.show_pyplot(fig2, context='column')
 
     else:
         # categorical
@@ -152,7 +160,7 @@ if uploaded:
         with center_col:
             st.markdown(f"### {cat_title}")
 
-            fig3, ax3 = plt.subplots(figsize=(5.5, 3.5))
+            fig3, ax3 = plot_style.new_figure(figsize=(5.5, 3.5))
 
             ax3.set_facecolor("#F9F9F9")
             fig3.patch.set_facecolor("#FFFFFF")
@@ -173,7 +181,7 @@ if uploaded:
             ax3.tick_params(axis='y', labelsize=8)
             ax3.legend()
 
-            st.pyplot(fig3)
+            figure_cache.show_pyplot(fig3, context='column')
 
 
     # 2 columns comparing
@@ -200,28 +208,37 @@ if uploaded:
         # numeric vs numeric
         if type1 == "numeric" and type2 == "numeric":
 
-            x = clean_df[col1_select].dropna()
-            y = clean_df[col2_select].dropna()
+            # Rows missing either value are dropped together so the points stay paired
+            pairs = plot_data.numeric_pairs(clean_df, col1_select, col2_select)
 
             st.markdown("#### Numeric Relationship Analysis")
 
-            fig_scatter, ax_scatter = plt.subplots(figsize=(5, 3))
-            ax_scatter.scatter(x, y, alpha=0.7, edgecolors="black")
-
+            fig_scatter, ax_scatter = plot_style.new_figure(figsize=(5, 3))
             ax_scatter.set_facecolor("#F9F9F9")
             fig_scatter.patch.set_facecolor("white")
 
+            if len(pairs) > plot_data.DENSITY_MIN_ROWS:
+                # Too many points to draw one by one: shade a 2-D histogram of the pairs instead
+                grid = plot_data.density_grid(clean_df, col1_select, col2_select)
+                counts = np.ma.masked_equal(grid['counts'].T, 0)
+                mesh = ax_scatter.pcolormesh(grid['x_edges'], grid['y_edges'], counts, cmap="viridis")
+                fig_scatter.colorbar(mesh, ax=ax_scatter, label="Rows per bin")
+                plot_kind = "Density Plot"
+            else:
+                ax_scatter.scatter(pairs['x'], pairs['y'], alpha=0.7, edgecolors="black")
+                plot_kind = "Scatter Plot"
+
             ax_scatter.set_title(
-                f"Scatter Plot: {col1_select} vs {col2_select}",
+                f"{plot_kind}: {col1_select} vs {col2_select}",
                 fontsize=11,
                 fontweight="bold",
             )
             ax_scatter.set_xlabel(col1_select, fontweight="bold")
             ax_scatter.set_ylabel(col2_select, fontweight="bold")
 
-            st.pyplot(fig_scatter)
+            figure_cache.show_pyplot(fig_scatter, context='column')
 
-            corr = clean_df[[col1_select, col2_select]].corr().iloc[0, 1]
+            corr = load_moment_sketch(uploaded.file_id, tuple(numeric_cols), clean_df).corr([col1_select, col2_select]).iloc[0, 1]
             st.info(f"Correlation Score: {corr:.4f}")
 
         # numeric vs categorical
@@ -234,7 +251,7 @@ if uploaded:
 
             grouped = clean_df.groupby(cat_col)[num_col].mean().sort_values()
 
-            fig_bar, ax_bar = plt.subplots(figsize=(5.2, 3))
+            fig_bar, ax_bar = plot_style.new_figure(figsize=(5.2, 3))
             ax_bar.bar(
                 grouped.index.astype(str),
                 grouped.values,
@@ -248,9 +265,9 @@ if uploaded:
                 fontweight="bold",
             )
             ax_bar.set_ylabel(f"Mean of {num_col}", fontweight="bold")
-            plt.xticks(rotation=35)
+            ax_bar.tick_params(axis='x', labelrotation=35)
 
-            st.pyplot(fig_bar)
+            figure_cache.show_pyplot(fig_bar, context='column')
 
         # categorical vs categorical
         else:
@@ -258,7 +275,7 @@ if uploaded:
             st.markdown("#### Category vs Category Comparison")
             cross = pd.crosstab(df[col1_select], df[col2_select])
 
-            fig_cross, ax_cross = plt.subplots(figsize=(5.5, 3.2))
+            fig_cross, ax_cross = plot_style.new_figure(figsize=(5.5, 3.2))
             cross.plot(kind="bar", ax=ax_cross, width=0.85)
 
             ax_cross.set_title(
@@ -269,7 +286,7 @@ if uploaded:
             ax_cross.set_xlabel(col1_select, fontweight="bold")
             ax_cross.set_ylabel("Count", fontweight="bold")
 
-            plt.xticks(rotation=30)
+            ax_cross.tick_params(axis='x', labelrotation=30)
             ax_cross.legend(
                 title=col2_select,
                 fontsize=8,
@@ -277,4 +294,45 @@ if uploaded:
                 loc="upper right"
             )
 
-            st.pyplot(fig_cross)
\ No newline at end of file
+            figure_cache.show_pyplot(fig_cross, context='column')
+
+
+    # frequent pattern mining -> which attribute values co-occur (Eclat on packed bitsets)
+
+    st.subheader("Frequent Pattern Mining")
+    st.markdown("Find combinations of categorical values that occur together and the rules linking them.")
+
+    mineable_cols = patterns.mineable_columns(df)
+
+    if not mineable_cols:
+        st.info("No categorical columns with a manageable number of categories to mine.")
+    else:
+        with st.form("pattern_mining_form"):
+            selected_pattern_cols = st.multiselect(
+                "Columns to mine",
+                mineable_cols,
+                default=mineable_cols[:8],
+                key="pattern_cols"
+            )
+            pm1, pm2, pm3, pm4 = st.columns(4)
+            min_support = pm1.slider("Min Support", 0.01, 0.5, patterns.DEFAULT_MIN_SUPPORT, 0.01, key="pattern_support")
+            min_confidence = pm2.slider("Min Confidence", 0.0, 1.0, patterns.DEFAULT_MIN_CONFIDENCE, 0.05, key="pattern_confidence")
+            min_lift = pm3.slider("Min Lift", 0.5, 5.0, patterns.DEFAULT_MIN_LIFT, 0.05, key="pattern_lift")
+            max_len = pm4.slider("Max Itemset Size", 2, 5, patterns.DEFAULT_MAX_LEN, key="pattern_max_len")
+            mine_button = st.form_submit_button("Mine Patterns", type="primary")
+
+        if mine_button and selected_pattern_cols:
+            itemsets = patterns.mine_frequent_itemsets(df, selected_pattern_cols, min_support, max_len)
+            rules = patterns.association_rules(itemsets, min_confidence, min_lift)
+
+            pattern_col1, pattern_col2 = st.columns(2)
+            with pattern_col1:
+                st.markdown(f"#### Frequent Itemsets ({len(itemsets)})")
+                itemsets_view = itemsets[itemsets['Length'] > 1].copy()
+                itemsets_view['Itemset'] = itemsets_view['Itemset'].map(' & '.join)
+                st.dataframe(itemsets_view.round(4), width='stretch', hide_index=True)
+            with pattern_col2:
+                st.markdown(f"#### Association Rules ({len(rules)})")
+                st.dataframe(rules.round(4), width='stretch', hide_index=True)
+        elif mine_button:
+            st.warning("Select at least one column to mine.")
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+from core import cache
+
+
+def _dataset(n: int = 5000) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'State': rng.choice(['Goa', 'Punjab', 'Kerala'], n),
+        'Fine_Amount': rng.integers(100, 5000, n),
+    })
+
+
+def _counting(calls: list):
+    @cache.memoize()
+    def total_fines(df: pd.DataFrame) -> pd.DataFrame:
+        calls.append(len(df))
+        return df.groupby('State')['Fine_Amount'].sum().to_frame()
+    return total_fines
+
+
+def test_equal_frames_share_an_entry():
+    calls = []
+    total_fines = _counting(calls)
+    df = _dataset()
+    first = total_fines(df)
+    second = total_fines(df.copy())
+    pd.testing.assert_frame_equal(first, second)
+    assert len(calls) == 1
+    assert total_fines.cache_info()['hits'] == 1
+
+
+def test_results_are_copies():
+    total_fines = _counting([])
+    df = _dataset()
+    total_fines(df)['Fine_Amount'] = 0
+    assert (total_fines(df)['Fine_Amount'] > 0).all()
+
+
+def test_tagged_slices_are_told_apart():
+    df = cache.tag_dataset(_dataset(), 'test:dataset')
+    goa, punjab = df[df['State'] == 'Goa'], df[df['State'] == 'Punjab']
+    assert cache.dataset_token(goa) == 'test:dataset'
+    assert cache.dataset_fingerprint(goa) != cache.dataset_fingerprint(punjab)
+    assert cache.dataset_fingerprint(goa) == cache.dataset_fingerprint(goa.copy())
+
+
+def test_tagged_column_rewrite_changes_fingerprint():
+    df = cache.tag_dataset(_dataset(), 'test:dataset')
+    edited = df.copy()
+    edited['Fine_Amount'] = edited['Fine_Amount'] * 2
+    assert cache.dataset_fingerprint(df) != cache.dataset_fingerprint(edited)
+
+
+def test_clear_all_caches_empties_every_function():
+    total_fines = _counting([])
+    total_fines(_dataset())
+    assert total_fines.cache_info()['entries'] == 1
+    cache.clear_all_caches()
+    assert total_fines.cache_info()['entries'] == 0
+    assert cache.cache_stats()['entries'].sum() == 0
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.changepoint import binary_segmentation, detect_change_points, change_point_dates
+
+
+def _daily(columns: dict) -> pd.DataFrame:
+    length = len(next(iter(columns.values())))
+    return pd.DataFrame(columns, index=pd.date_range('2023-01-01', periods=length, freq='D', name='Date'))
+
+
+def test_finds_level_shifts_of_each_series():
+    rng = np.random.default_rng(0)
+    one_shift = np.concatenate([rng.poisson(20, 150), rng.poisson(40, 150)]).astype(float)
+    two_shifts = np.concatenate([rng.poisson(30, 100), rng.poisson(10, 100), rng.poisson(30, 100)]).astype(float)
+    breaks = binary_segmentation(np.column_stack([one_shift, two_shifts]))
+    assert breaks.shape == (301, 2)
+    assert np.abs(np.flatnonzero(breaks[1:-1, 0]) + 1 - 150).max() <= 3
+    found = np.flatnonzero(breaks[1:-1, 1]) + 1
+    assert len(found) == 2
+    assert np.abs(found - [100, 200]).max() <= 3
+
+
+def test_flat_series_has_no_change_points():
+    rng = np.random.default_rng(1)
+    daily = _daily({'Overspeeding': rng.poisson(25, 365).astype(float)})
+    assert detect_change_points(daily).empty
+
+
+def test_reports_segment_means():
+    daily = _daily({'Overspeeding': np.r_[np.full(60, 10.0), np.full(60, 15.0)] + np.tile([0.0, 1.0], 60)})
+    result = detect_change_points(daily)
+    assert list(result['Date']) == [pd.Timestamp('2023-03-02')]
+    row = result.iloc[0]
+    assert row['Mean_Before'] == 10.5 and row['Mean_After'] == 15.5
+    assert row['Change_Pct'] == pytest.approx((15.5 - 10.5) / 10.5 * 100)
+    assert change_point_dates(result) == {'Overspeeding': [pd.Timestamp('2023-03-02')]}
+
+
+def test_short_series_are_left_alone():
+    breaks = binary_segmentation(np.arange(40, dtype=float)[:, None], min_size=30)
+    assert breaks[1:-1].sum() == 0
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+from core.clustering import kmeans, build_profiles, cluster_locations
+
+
+def _blobs(seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centers = np.array([[0.0, 0.0], [10.0, 0.0], [0.0, 10.0]])
+    truth = np.repeat(np.arange(3), [200, 120, 80])
+    return centers[truth] + rng.normal(0, 0.5, (len(truth), 2)), truth
+
+
+def _same_partition(labels: np.ndarray, truth: np.ndarray) -> bool:
+    # Equal up to renumbering: every true group maps to exactly one label and vice versa
+    pairs = set(zip(truth.tolist(), labels.tolist()))
+    return len(pairs) == len(set(truth.tolist())) == len(set(labels.tolist()))
+
+
+def test_separates_well_separated_blobs():
+    points, truth = _blobs()
+    labels, centers, inertia = kmeans(points, 3)
+    assert _same_partition(labels, truth)
+    expected_centers = np.array([points[labels == c].mean(axis=0) for c in range(3)])
+    np.testing.assert_allclose(centers, expected_centers)
+    assert np.isclose(inertia, ((points - centers[labels]) ** 2).sum())
+
+
+def test_is_deterministic_for_a_seed():
+    points, _ = _blobs(1)
+    first, second = kmeans(points, 3, seed=7), kmeans(points, 3, seed=7)
+    np.testing.assert_array_equal(first[0], second[0])
+    assert first[2] == second[2]
+
+
+def test_caps_k_at_number_of_points():
+    labels, centers, inertia = kmeans(np.array([[0.0], [1.0]]), 5)
+    assert len(centers) == 2 and sorted(labels.tolist()) == [0, 1] and inertia == 0.0
+
+
+def test_locations_with_the_same_profile_cluster_together():
+    rows = []
+    for location, violation in [('A', 'Overspeeding'), ('B', 'Overspeeding'), ('C', 'No Helmet'), ('D', 'No Helmet')]:
+        rows += [(location, violation, 'Car')] * 30 + [(location, 'Signal Jumping', 'Bike')] * 5
+    df = pd.DataFrame(rows, columns=['Location', 'Violation_Type', 'Vehicle_Type'])
+
+    profiles = build_profiles(df, dimensions=['Violation_Type', 'Vehicle_Type'])
+    np.testing.assert_allclose(profiles.T.groupby(level='Dimension').sum().to_numpy(), 1.0)
+
+    result = cluster_locations(df, k=2, dimensions=['Violation_Type', 'Vehicle_Type'])
+    clusters = result['assignments'].set_index('Location')['Cluster']
+    assert clusters['A'] == clusters['B'] != clusters['C'] == clusters['D']
+    assert result['assignments']['Violations'].sum() == len(df)
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.crosstab import crosstab
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 2000
+    df = pd.DataFrame({
+        'Violation_Type': rng.choice(['Overspeeding', 'No Helmet', 'Signal Jumping', None], n),
+        'Vehicle_Type': rng.choice(['Car', 'Bike', 'Truck'], n),
+        'Fine_Amount': rng.integers(100, 5000, n).astype(float),
+    })
+    df.loc[rng.choice(n, 100, replace=False), 'Fine_Amount'] = np.nan
+    return df
+
+
+def test_counts_match_pandas(frame):
+    expected = pd.crosstab(frame['Violation_Type'], frame['Vehicle_Type'])
+    pd.testing.assert_frame_equal(crosstab(frame['Violation_Type'], frame['Vehicle_Type']), expected, check_dtype=False)
+
+
+@pytest.mark.parametrize('aggfunc', ['sum', 'mean'])
+def test_aggregates_match_pandas(frame, aggfunc):
+    expected = pd.crosstab(frame['Violation_Type'], frame['Vehicle_Type'], values=frame['Fine_Amount'], aggfunc=aggfunc)
+    result = crosstab(frame['Violation_Type'], frame['Vehicle_Type'], values=frame['Fine_Amount'], aggfunc=aggfunc)
+    pd.testing.assert_frame_equal(result, expected.fillna(0) if aggfunc == 'sum' else expected, check_dtype=False)
+
+
+def test_categorical_keys_keep_unused_categories(frame):
+    vehicles = frame['Vehicle_Type'].astype(pd.CategoricalDtype(['Bike', 'Bus', 'Car', 'Truck']))
+    result = crosstab(frame['Violation_Type'], vehicles)
+    assert list(result.columns) == ['Bike', 'Bus', 'Car', 'Truck']
+    assert (result['Bus'] == 0).all()
+    observed = crosstab(frame['Violation_Type'], vehicles, observed=True)
+    pd.testing.assert_frame_equal(observed, pd.crosstab(frame['Violation_Type'], frame['Vehicle_Type']),
+                                  check_dtype=False, check_column_type=False)
+
+
+def test_rejects_unknown_aggfunc(frame):
+    with pytest.raises(ValueError):
+        crosstab(frame['Violation_Type'], frame['Vehicle_Type'], values=frame['Fine_Amount'], aggfunc='median')
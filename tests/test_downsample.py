@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.downsample import lttb_indices, minmax_indices, select_indices, downsample_columns
+
+
+@pytest.fixture
+def series() -> pd.Series:
+    rng = np.random.default_rng(0)
+    values = rng.normal(100, 5, 5000)
+    values[1234] = 400.0    # A single-day spike
+    return pd.Series(values, index=pd.date_range('2010-01-01', periods=5000, freq='D'))
+
+
+def test_lttb_keeps_endpoints_and_spike(series):
+    keep = lttb_indices(np.arange(len(series)), series.to_numpy(), 200)
+    assert len(keep) == 200
+    assert keep[0] == 0 and keep[-1] == len(series) - 1
+    assert np.all(np.diff(keep) > 0)
+    assert 1234 in keep
+
+
+def test_minmax_keeps_every_bucket_extreme(series):
+    keep = minmax_indices(series.to_numpy(), 200)
+    assert keep[0] == 0 and keep[-1] == len(series) - 1
+    assert series.iloc[keep].max() == series.max() and series.iloc[keep].min() == series.min()
+
+
+def test_short_series_are_untouched(series):
+    np.testing.assert_array_equal(lttb_indices(np.arange(50), series.to_numpy()[:50], 200), np.arange(50))
+
+
+def test_select_indices_skips_nulls(series):
+    series = series.copy()
+    series.iloc[::3] = np.nan
+    keep = select_indices(series, 100)
+    assert series.iloc[keep].notna().all()
+    assert keep[0] == 1 and keep[-1] == len(series) - 1
+
+
+def test_label_index_columns_share_positions():
+    wide = pd.DataFrame({'A': np.arange(500.0), 'B': np.arange(500.0)[::-1] ** 2},
+                        index=[f"label{i}" for i in range(500)])
+    thinned = downsample_columns(wide, 50)
+    assert thinned['A'].index.equals(thinned['B'].index)
+    assert len(thinned['A']) < len(wide)
@@ -0,0 +1,52 @@
+import itertools
+import numpy as np
+import pandas as pd
+import pytest
+from core.patterns import mine_frequent_itemsets, association_rules
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 1500
+    weather = rng.choice(['Rainy', 'Clear', 'Foggy'], n, p=[0.3, 0.5, 0.2])
+    # Wet roads mostly on rainy days, so the pair is frequent and has lift
+    road = np.where((weather == 'Rainy') & (rng.random(n) < 0.8), 'Wet', rng.choice(['Dry', 'Potholes'], n))
+    return pd.DataFrame({
+        'Weather_Condition': weather,
+        'Road_Condition': road,
+        'Vehicle_Type': rng.choice(['Car', 'Bike', 'Truck'], n),
+    })
+
+
+def _brute_force(df: pd.DataFrame, min_support: float, max_len: int) -> dict:
+    items = df.astype(str).apply(lambda col: col.name + '=' + col)
+    found = {}
+    for size in range(1, max_len + 1):
+        for columns in itertools.combinations(df.columns, size):
+            counts = items[list(columns)].value_counts()
+            for values, count in counts.items():
+                if count >= np.ceil(min_support * len(df)):
+                    found[frozenset(values)] = count
+    return found
+
+
+@pytest.mark.parametrize('min_support', [0.02, 0.1])
+def test_itemsets_match_brute_force(frame, min_support):
+    result = mine_frequent_itemsets(frame, list(frame.columns), min_support=min_support, max_len=3)
+    mined = {frozenset(itemset): count for itemset, count in zip(result['Itemset'], result['Count'])}
+    assert mined == _brute_force(frame, min_support, 3)
+    np.testing.assert_allclose(result['Support'], result['Count'] / len(frame))
+
+
+def test_rules_report_confidence_and_lift(frame):
+    itemsets = mine_frequent_itemsets(frame, list(frame.columns), min_support=0.05, max_len=2)
+    rules = association_rules(itemsets, min_confidence=0.5, min_lift=1.0)
+    rule = rules[(rules['Antecedent'] == 'Road_Condition=Wet') & (rules['Consequent'] == 'Weather_Condition=Rainy')]
+    assert len(rule) == 1
+
+    wet = frame['Road_Condition'] == 'Wet'
+    rainy = frame['Weather_Condition'] == 'Rainy'
+    confidence = (wet & rainy).sum() / wet.sum()
+    assert rule['Confidence'].iloc[0] == pytest.approx(confidence)
+    assert rule['Lift'].iloc[0] == pytest.approx(confidence / rainy.mean())
@@ -0,0 +1,31 @@
+import pandas as pd
+import pytest
+from core.report import resolve_values
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        'Location': ['Goa', 'Punjab', 'Goa', None],
+        'Year': [2019, 2020, 2019, 2021],
+        'Helmet_Worn': [True, False, True, True],
+    })
+
+
+def test_text_values_match_as_given(frame):
+    assert resolve_values(frame, 'Location', [' Goa', 'Punjab', 'Goa']) == ['Goa', 'Punjab']
+
+
+def test_numeric_columns_accept_cli_strings(frame):
+    resolved = resolve_values(frame, 'Year', ['2019', '2021.0', 2020])
+    assert resolved == [2019, 2021, 2020]
+    assert frame['Year'].isin(resolved).all()
+
+
+def test_boolean_columns_match_by_text(frame):
+    assert resolve_values(frame, 'Helmet_Worn', ['False']) == [False]
+
+
+def test_unknown_values_are_reported(frame):
+    with pytest.raises(ValueError, match="Kerala, 1999"):
+        resolve_values(frame, 'Location', ['Goa', 'Kerala', '1999'])
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.rolling import daily_rollup, rolling_metrics
+
+
+@pytest.fixture
+def rows() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 3000
+    return pd.DataFrame({
+        'Date': pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 200, n), unit='D'),
+        'Violation_Type': rng.choice(['Overspeeding', 'No Helmet', 'Signal Jumping'], n),
+        'Fine_Amount': rng.integers(100, 5000, n),
+    })
+
+
+def test_daily_rollup_matches_groupby(rows):
+    daily = daily_rollup(rows, 'Violation_Type')
+    expected = (rows.groupby(['Date', 'Violation_Type']).size().unstack(fill_value=0)
+                .asfreq('D', fill_value=0))
+    pd.testing.assert_frame_equal(daily, expected, check_dtype=False, check_freq=False, check_names=False)
+
+
+def test_daily_rollup_sums_values(rows):
+    daily = daily_rollup(rows, value_col='Fine_Amount')
+    expected = rows.groupby('Date')['Fine_Amount'].sum().asfreq('D', fill_value=0)
+    np.testing.assert_allclose(daily['Total'].to_numpy(), expected.to_numpy())
+
+
+@pytest.mark.parametrize('stat', ['mean', 'sum'])
+@pytest.mark.parametrize('min_periods', [None, 1])
+def test_rolling_matches_series_rolling(rows, stat, min_periods):
+    daily = daily_rollup(rows, 'Violation_Type')
+    result = rolling_metrics(daily, windows=(7, 30), stat=stat, min_periods=min_periods)
+    for window in (7, 30):
+        rolled = daily.rolling(window, min_periods=window if min_periods is None else min_periods)
+        expected = getattr(rolled, stat)()
+        np.testing.assert_allclose(result[f"{window}D"].to_numpy(), expected.to_numpy(), equal_nan=True)
+
+
+def test_rolling_rate_is_share_of_window_total(rows):
+    daily = daily_rollup(rows, 'Violation_Type')
+    result = rolling_metrics(daily, windows=(30,), stat='rate')['30D']
+    sums = daily.rolling(30).sum()
+    expected = sums.div(sums.sum(axis=1), axis=0) * 100
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), equal_nan=True)
+    np.testing.assert_allclose(result.dropna().sum(axis=1), 100)
@@ -0,0 +1,57 @@
+import pickle
+import numpy as np
+import pandas as pd
+from core.sketches import KLLSketch, SpaceSaving, build_sketch_store, approx_quantiles
+
+QS = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+RANK_ERROR = 0.01
+
+
+def _rank_errors(values: np.ndarray, estimates: np.ndarray) -> np.ndarray:
+    # Distance between the requested quantile and the true rank of the estimate
+    ordered = np.sort(values)
+    ranks = np.searchsorted(ordered, estimates, side='right') / len(ordered)
+    return np.abs(ranks - np.asarray(QS))
+
+
+def test_kll_quantiles_within_rank_error():
+    values = np.random.default_rng(1).lognormal(7, 1, 200_000)
+    sketch = KLLSketch().update(values)
+    assert len(sketch) == len(values)
+    assert _rank_errors(values, sketch.quantile(QS)).max() < RANK_ERROR
+
+
+def test_kll_merge_matches_single_sketch_bounds():
+    rng = np.random.default_rng(2)
+    parts = [rng.normal(loc, 1, 50_000) for loc in (0, 5, 10)]
+    merged = KLLSketch(seed=0)
+    for i, part in enumerate(parts):
+        merged.merge(KLLSketch(seed=i).update(part))
+    values = np.concatenate(parts)
+    assert merged.n == len(values)
+    assert merged.quantile(0) == values.min() and merged.quantile(1) == values.max()
+    assert _rank_errors(values, merged.quantile(QS)).max() < RANK_ERROR
+
+
+def test_kll_ignores_nulls_and_survives_pickle():
+    sketch = KLLSketch().update([1.0, np.nan, 2.0, 3.0])
+    restored = pickle.loads(pickle.dumps(sketch))
+    assert restored.n == 3
+    assert restored.quantile(0.5) == sketch.quantile(0.5) == 2.0
+    assert np.isnan(KLLSketch().quantile(0.5))
+
+
+def test_space_saving_finds_heavy_hitters():
+    values = ['a'] * 500 + ['b'] * 300 + [f"rare{i}" for i in range(400)]
+    top = SpaceSaving(capacity=16).update(pd.Series(values)).top(2)
+    assert [row[0] for row in top] == ['a', 'b']
+
+
+def test_store_quantiles_follow_date_range():
+    dates = pd.date_range('2023-01-01', '2023-06-30', freq='h')
+    df = pd.DataFrame({'Date': dates, 'Fine_Amount': np.where(dates.month <= 3, 100.0, 1000.0)})
+    store = build_sketch_store(df, numeric_cols=['Fine_Amount'])
+    first_quarter = approx_quantiles(store, 'Fine_Amount', [0.5], end='2023-03-31')
+    second_quarter = approx_quantiles(store, 'Fine_Amount', [0.5], start='2023-04-01')
+    assert np.ravel(first_quarter)[0] == 100.0
+    assert np.ravel(second_quarter)[0] == 1000.0